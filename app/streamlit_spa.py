@@ -4,7 +4,6 @@ import sys
 import datetime
 from datetime import date, timedelta
 from pathlib import Path
-import tempfile
 import json
 
 import pandas as pd
@@ -15,8 +14,15 @@ ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
-from src.report.charts import plot_price_with_runs_and_events  # noqa: E402
-from src.ui.spa_runner import run_spa_for_single_ticker  # noqa: E402
+from src.cache import MemoryLRUCache, set_cache_backend  # noqa: E402
+from src.explain.executor import stream_in_order  # noqa: E402
+from src.explain.explain_run import stream_run_explanation  # noqa: E402
+from src.explain.llm_client import LLMQuotaExceededError, TokenUsage  # noqa: E402
+from src.ui.spa_runner import (  # noqa: E402
+    explanation_entry,
+    iter_spa_for_single_ticker,
+    select_runs_to_explain,
+)
 from src.config_spa import SPA_MAX_EXPLAINED_RUNS_DEFAULT  # noqa: E402
 
 
@@ -29,28 +35,13 @@ st.caption(
 st.markdown("---")
 
 
-@st.cache_data(show_spinner=False)
-def cached_run_spa_for_single_ticker(
-    ticker: str,
-    start: str,
-    end: str,
-    window_days: int,
-    max_news_items: int,
-    fetch_events: bool,
-    generate_explanations: bool,
-    max_explained_runs: int,
-):
-    """Cached wrapper around run_spa_for_single_ticker."""
-    return run_spa_for_single_ticker(
-        ticker=ticker,
-        start=start,
-        end=end,
-        window_days=window_days,
-        max_news_items=max_news_items,
-        fetch_events=fetch_events,
-        generate_explanations=generate_explanations,
-        max_explained_runs=max_explained_runs,
-    )
+@st.cache_resource(show_spinner=False)
+def _spa_cache_backend() -> MemoryLRUCache:
+    """Process-wide LRU for src-layer memoization, shared across reruns and sessions."""
+    return MemoryLRUCache()
+
+
+set_cache_backend(_spa_cache_backend())
 
 
 def main() -> None:
@@ -104,113 +95,184 @@ def main() -> None:
         tabs = st.tabs(tickers)
         for tab, tk in zip(tabs, tickers):
             with tab:
-                with st.spinner("Analyzing runs..."):
-                    result = cached_run_spa_for_single_ticker(
-                        ticker=tk,
-                        start=str(start_date),
-                        end=str(end_date),
-                        window_days=int(window_days),
-                        max_news_items=50,
-                        fetch_events=fetch_events,
-                        generate_explanations=generate_explanations,
-                        max_explained_runs=int(max_explained_runs),
-                    )
-                render_results_for_ticker(
+                render_ticker_progressively(
                     ticker=tk,
-                    result=result,
                     start_date=start_date,
                     end_date=end_date,
+                    window_days=int(window_days),
                     fetch_events=fetch_events,
                     generate_explanations=generate_explanations,
+                    max_explained_runs=int(max_explained_runs),
                 )
 
 
-def render_results_for_ticker(
+def render_ticker_progressively(
     ticker: str,
-    result: dict,
     start_date: date,
     end_date: date,
+    window_days: int,
     fetch_events: bool,
     generate_explanations: bool,
+    max_explained_runs: int,
 ) -> None:
-    """Render summary, runs, chart, events, and explanations for a single ticker."""
-    if result.get("error"):
-        st.error(result["error"])
-        return
+    """
+    Render each section as soon as its pipeline stage finishes, then stream explanations.
+
+    Prices/runs/news lookups are memoized in the src layer and explanations in the
+    explanation cache, so repeating an analysis renders from cache without a page-level cache.
+    """
+    summary = st.empty()
+    runs_section = st.container()
+    chart_section = st.empty()
+    events_section = st.container()
+
+    result: dict = {}
+    with st.spinner("Analyzing runs..."):
+        for stage, result in iter_spa_for_single_ticker(
+            ticker=ticker,
+            start=str(start_date),
+            end=str(end_date),
+            window_days=window_days,
+            max_news_items=50,
+            fetch_events=fetch_events,
+            generate_explanations=False,
+            render_chart=True,
+        ):
+            if result.get("error"):
+                st.error(result["error"])
+                return
+            with summary.container():
+                _render_summary(ticker, result, start_date, end_date, stage)
+            if stage == "prices" and result["prices"] is not None and not result["prices"].empty:
+                # Quick close-price preview until runs and events are ready for the annotated chart.
+                with chart_section.container():
+                    st.subheader("Price")
+                    st.line_chart(result["prices"]["close"])
+            elif stage == "runs":
+                with runs_section:
+                    _render_runs(result["runs"])
+            elif stage == "correlations" and fetch_events:
+                with events_section:
+                    _render_events(result["events"])
+            elif stage == "chart":
+                with chart_section.container():
+                    if result["chart_png"]:
+                        _render_chart(ticker, result["chart_png"])
+                    else:
+                        st.warning("Could not render chart.")
 
-    prices: pd.DataFrame = result["prices"]
     runs: pd.DataFrame = result["runs"]
-    events = result["events"]
-    correlations = result["correlations"]
-    explanations = result["explanations"]
-    if result.get("explanation_error"):
-        if "429" in result["explanation_error"] or "quota" in result["explanation_error"].lower():
-            st.warning("LLM returned 429: insufficient quota. Explanations are skipped.")
-        else:
-            st.warning(result["explanation_error"])
-    elif generate_explanations and not explanations:
-        st.warning("No explanations generated for the selected runs.")
+    if runs is None or runs.empty:
+        return
 
+    _render_stage_timings(result.get("stages") or {})
+    if generate_explanations:
+        result["explanations"] = _stream_explanations(ticker, result, max_explained_runs)
+    _render_exports(ticker, result, fetch_events, generate_explanations)
+
+
+def _render_summary(ticker: str, result: dict, start_date: date, end_date: date, stage: str) -> None:
     st.subheader("Summary")
+    prices = result.get("prices")
+    bars = 0 if prices is None else len(prices)
+    runs_text = "…" if stage == "prices" else str(len(result["runs"]))
     st.write(
-        f"**Ticker:** {ticker}  |  **Date range:** {start_date} → {end_date}  |  "
-        f"**Runs detected:** {len(runs)}  |  **Events fetched:** {len(events)}"
+        f"**Ticker:** {ticker}  |  **Date range:** {start_date} → {end_date}  |  **Price bars:** {bars}  |  "
+        f"**Runs detected:** {runs_text}  |  **Events fetched:** {len(result['events'])}"
     )
 
+
+def _render_stage_timings(stages: dict) -> None:
+    parts = [
+        f"{name} {record['seconds'] * 1000:.0f} ms{' (cached)' if record['cache_hit'] else ''}"
+        for name, record in stages.items()
+    ]
+    if parts:
+        st.caption("Stages: " + " · ".join(parts))
+
+
+def _render_runs(runs: pd.DataFrame) -> None:
     if runs is None or runs.empty:
         st.info("No runs detected for the selected window.")
         return
-
     st.subheader("Detected Runs")
     st.dataframe(runs)
 
-    if prices is not None and not prices.empty:
-        st.subheader("Price with Runs and Events")
-        try:
-            with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmpfile:
-                plot_price_with_runs_and_events(
-                    df=prices,
-                    runs_df=runs,
-                    events_by_run=correlations if fetch_events else {},
-                    output_path=tmpfile.name,
-                )
-                st.image(tmpfile.name, width="stretch", caption="Price with runs and events")
-                st.markdown("🟢 = Upward run  🔴 = Downward run")
-                with open(tmpfile.name, "rb") as f:
-                    st.download_button(
-                        label="Download chart as PNG",
-                        data=f.read(),
-                        file_name=f"{ticker}_price_with_runs.png",
-                        mime="image/png",
-                    )
-        except Exception as exc:
-            st.warning(f"Could not render chart: {exc}")
-
-    if fetch_events:
-        if events:
-            st.subheader("Events (normalized)")
-            events_df = pd.DataFrame(events)
-            st.dataframe(events_df)
-        else:
-            st.info("No events found in the selected window.")
 
-    if generate_explanations and explanations:
-        st.subheader("Run Explanations (historical analysis only)")
-        for entry in explanations:
-            header = f"Run {entry.get('run_id')} ({entry.get('start')} → {entry.get('end')})"
-            with st.expander(header, expanded=False):
-                st.markdown(
-                    f"- Direction: {entry.get('direction')}\n"
-                    f"- Duration (bars): {entry.get('duration_bars')}\n"
-                    f"- Pct change: {entry.get('pct_change')}\n"
-                    f"- Max drawdown: {entry.get('max_drawdown_pct')}"
-                )
-                st.markdown(entry.get("explanation") or "_No explanation generated_")
-        st.caption(
-            "SPA explains historical patterns only — not signals or financial advice."
-        )
+def _render_chart(ticker: str, chart_png: bytes) -> None:
+    st.subheader("Price with Runs and Events")
+    st.image(chart_png, width="stretch", caption="Price with runs and events")
+    st.markdown("🟢 = Upward run  🔴 = Downward run")
+    st.download_button(
+        label="Download chart as PNG",
+        data=chart_png,
+        file_name=f"{ticker}_price_with_runs.png",
+        mime="image/png",
+    )
+
+
+def _render_events(events: list) -> None:
+    if events:
+        st.subheader("Events (normalized)")
+        events_df = pd.DataFrame(events)
+        st.dataframe(events_df)
+    else:
+        st.info("No events found in the selected window.")
+
+
+def _stream_explanations(ticker: str, result: dict, max_explained_runs: int) -> list:
+    """
+    Stream each selected run's explanation into its expander as the model writes it.
+
+    All requests start at once (bounded by SPA_LLM_MAX_CONCURRENCY); later runs' text is
+    buffered while earlier expanders are still being written.
+    """
+    selected = select_runs_to_explain(result["runs"], max_explained_runs)
+    if not selected:
+        return []
+
+    st.subheader("Run Explanations (historical analysis only)")
+    streams = [
+        stream_run_explanation(ticker, run_row, result["correlations"].get(int(run_row.get("run_id")), []))
+        for run_row in selected
+    ]
+    explanations = []
+    for run_row, stream, chunks in zip(selected, streams, stream_in_order(streams)):
+        entry = explanation_entry(run_row, "", TokenUsage())
+        header = f"Run {entry.get('run_id')} ({entry.get('start')} → {entry.get('end')})"
+        with st.expander(header, expanded=True):
+            st.markdown(
+                f"- Direction: {entry.get('direction')}\n"
+                f"- Duration (bars): {entry.get('duration_bars')}\n"
+                f"- Pct change: {entry.get('pct_change')}\n"
+                f"- Max drawdown: {entry.get('max_drawdown_pct')}"
+            )
+            try:
+                st.write_stream(chunks)
+            except LLMQuotaExceededError:
+                st.warning("LLM returned 429: insufficient quota. Explanations are skipped.")
+                break
+            except Exception as exc:
+                st.warning(f"Explanation skipped: {exc}")
+                continue
+            if not stream.text:
+                st.markdown("_No explanation generated_")
+            usage = stream.usage
+            cached = " (cached)" if usage.cached else ""
+            st.caption(f"Tokens: {usage.input_tokens} in / {usage.output_tokens} out{cached}")
+        explanations.append(explanation_entry(run_row, stream.text, stream.usage))
+    st.caption(
+        "SPA explains historical patterns only — not signals or financial advice."
+    )
+    return explanations
+
+
+def _render_exports(ticker: str, result: dict, fetch_events: bool, generate_explanations: bool) -> None:
+    runs: pd.DataFrame = result["runs"]
+    events = result["events"]
+    correlations = result["correlations"]
+    explanations = result["explanations"]
 
-    # Downloads
     st.subheader("Export")
     st.download_button(
         label="Download runs as CSV",
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+# Ensure the repository root is available on sys.path for `src` imports.
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+SCRIPTS = Path(__file__).resolve().parent
+if str(SCRIPTS) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS))
+
+from fake_llm_server import start_fake_llm_server  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare one explanation request per run with batched JSON requests on a local fake LLM server."
+    )
+    parser.add_argument("--runs", type=int, default=24)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--events-per-run", type=int, default=3)
+    parser.add_argument("--latency-ms", type=float, default=150.0)
+    parser.add_argument("--bad-json-rate", type=float, default=0.1, help="Share of batch replies that are unusable")
+    args = parser.parse_args()
+
+    server = start_fake_llm_server(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.latency_ms / 2,
+        bad_json_rate=args.bad_json_rate,
+        seed=1,
+    )
+    # The client reads these at import time, so configure them before importing src.explain.
+    os.environ.update(
+        {
+            "OPENAI_API_KEY": "fake-key",
+            "OPENAI_BASE_URL": server.base_url,
+            "SPA_EXPLANATION_CACHE_MODE": "off",
+            "SPA_LLM_BACKOFF_BASE_MS": "50",
+        }
+    )
+
+    import pandas as pd
+
+    from src.explain.explain_run import BatchExplanationStats, explain_runs_batched
+
+    dates = pd.bdate_range("2024-01-01", periods=args.runs * 3)
+    runs = [
+        {
+            "run_id": i,
+            "direction": "up" if i % 2 == 0 else "down",
+            "start": dates[3 * i],
+            "end": dates[3 * i + 2],
+            "duration_bars": 3,
+            "pct_change": 0.5 * i,
+            "max_drawdown_pct": -0.25 * i,
+        }
+        for i in range(args.runs)
+    ]
+    events_by_run = {
+        run["run_id"]: [
+            {"date": run["start"], "headline": f"Synthetic headline {j} for run {run['run_id']}", "source": "Wire"}
+            for j in range(args.events_per_run)
+        ]
+        for run in runs
+    }
+
+    print(f"{'batch':>6} {'seconds':>8} {'requests':>9} {'fallbacks':>10} {'in_tokens':>10} {'out_tokens':>11} "
+          f"{'complete':>9}")
+    try:
+        for batch_size in args.batch_sizes:
+            before = dict(server.stats)
+            stats = BatchExplanationStats()
+            texts = {}
+            t0 = time.perf_counter()
+            for lo in range(0, len(runs), batch_size):
+                batch_texts, _, batch_stats = explain_runs_batched("SYN", runs[lo:lo + batch_size], events_by_run)
+                texts.update(batch_texts)
+                stats.add(batch_stats)
+            elapsed = time.perf_counter() - t0
+            delta = {k: server.stats[k] - before[k] for k in before}
+            complete = len(texts) == len(runs) and all(texts.values())
+            print(
+                f"{batch_size:>6} {elapsed:>8.2f} {delta['requests']:>9} {stats.fallback_runs:>10} "
+                f"{delta['prompt_tokens']:>10} {delta['completion_tokens']:>11} {str(complete):>9}"
+            )
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
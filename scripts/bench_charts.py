@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import matplotlib
+
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt  # noqa: E402
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+# Ensure the repository root is available on sys.path for `src` imports.
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.events.correlate import correlate_runs_with_events  # noqa: E402
+from src.patterns.runs import detect_price_runs  # noqa: E402
+from src.report.charts import plot_price_with_runs_and_events  # noqa: E402
+
+
+def reference_plot(df: pd.DataFrame, runs_df: pd.DataFrame, events_by_run: dict, output_path: str) -> None:
+    """Original per-run axvspan / per-event axvline+scatter renderer, kept as the baseline."""
+    price_series = df["close"]
+    fig, ax = plt.subplots(figsize=(10, 5))
+    ax.plot(price_series.index, price_series, label="Close", color="black")
+    for _, run in runs_df.iterrows():
+        color = "#2ca02c" if str(run["direction"]).lower() == "up" else "#d62728"
+        ax.axvspan(pd.Timestamp(run["start"]), pd.Timestamp(run["end"]), color=color, alpha=0.08)
+    dates = sorted({ev["date"].normalize() for evs in events_by_run.values() for ev in evs})
+    for d in dates:
+        ax.axvline(d, color="#1f77b4", linestyle="--", alpha=0.15, linewidth=0.75)
+    for d in dates:
+        if d in price_series.index:
+            ax.scatter(d, price_series.loc[d], color="#1f77b4", s=18, zorder=3, label="_nolegend_")
+    ax.legend(loc="upper left")
+    fig.tight_layout()
+    fig.savefig(output_path, dpi=200)
+    plt.close(fig)
+
+
+def synthetic_inputs(n_bars: int, n_events: int, seed: int = 5):
+    rng = np.random.default_rng(seed)
+    close = 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.01, n_bars)))
+    prices = pd.DataFrame({"close": close}, index=pd.bdate_range("2000-01-03", periods=n_bars, name="date"))
+    runs_df = detect_price_runs(prices)
+    event_dates = prices.index[rng.integers(0, n_bars, n_events)]
+    events = [{"date": d, "headline": f"Event {i}"} for i, d in enumerate(event_dates)]
+    return prices, runs_df, correlate_runs_with_events(runs_df, events)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark chart rendering time by series length.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[250, 1_260, 5_040, 20_000])
+    parser.add_argument("--events-per-year", type=int, default=40)
+    args = parser.parse_args()
+
+    print(f"{'bars':>7} {'runs':>6} {'reference_s':>12} {'collections_s':>14} {'+lttb_s':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_bars in args.sizes:
+            prices, runs_df, correlations = synthetic_inputs(n_bars, max(1, n_bars * args.events_per_year // 252))
+            out = str(Path(tmp) / "chart.png")
+
+            t0 = time.perf_counter()
+            reference_plot(prices, runs_df, correlations, out)
+            ref_s = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            plot_price_with_runs_and_events(prices, runs_df, correlations, out)
+            new_s = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            plot_price_with_runs_and_events(prices, runs_df, correlations, out, downsample=True)
+            lttb_s = time.perf_counter() - t0
+
+            print(f"{n_bars:>7} {len(runs_df):>6} {ref_s:>12.2f} {new_s:>14.2f} {lttb_s:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import List, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Modules the CLI must never pull in; they belong to the Streamlit app layer only.
+FORBIDDEN_MODULES = ("streamlit",)
+
+
+def _run(args: List[str]) -> Tuple[float, subprocess.CompletedProcess]:
+    t0 = time.perf_counter()
+    proc = subprocess.run([sys.executable, *args], cwd=ROOT, capture_output=True, text=True)
+    return time.perf_counter() - t0, proc
+
+
+def measure_cold_start(repeats: int) -> List[float]:
+    """Wall time of `python -m src.ui.cli --help` in fresh interpreters."""
+    timings = []
+    for _ in range(repeats):
+        elapsed, proc = _run(["-m", "src.ui.cli", "--help"])
+        if proc.returncode != 0:
+            raise RuntimeError(f"CLI failed to start:\n{proc.stderr}")
+        timings.append(elapsed)
+    return timings
+
+
+def top_imports(limit: int) -> List[Tuple[int, str]]:
+    """Cumulative import time per package loaded by `import src.ui.cli`, slowest first."""
+    _, proc = _run(["-X", "importtime", "-c", "import src.ui.cli"])
+    rows: List[Tuple[int, str]] = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        # Report whole packages (e.g. pandas, yfinance) rather than their submodules.
+        if "." not in name and name != "src":
+            rows.append((int(cumulative), name))
+    return sorted(rows, reverse=True)[:limit]
+
+
+def loaded_forbidden_modules() -> List[str]:
+    """Return forbidden modules that end up in sys.modules after importing the CLI."""
+    check = (
+        "import sys, src.ui.cli; "
+        f"print(','.join(m for m in {FORBIDDEN_MODULES!r} if m in sys.modules))"
+    )
+    _, proc = _run(["-c", check])
+    return [name for name in proc.stdout.strip().split(",") if name]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark CLI import time and cold start.")
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="Number of slowest imports to list")
+    parser.add_argument("--max-cold-start-ms", type=float, default=None, help="Fail if the median exceeds this")
+    args = parser.parse_args()
+
+    timings = measure_cold_start(args.repeats)
+    median_ms = statistics.median(timings) * 1000.0
+    print(f"Cold start (python -m src.ui.cli --help): median {median_ms:.0f} ms, min {min(timings) * 1000.0:.0f} ms")
+
+    print("Slowest package imports (cumulative):")
+    for micros, name in top_imports(args.top):
+        print(f"  {micros / 1000.0:8.1f} ms  {name}")
+
+    failures = []
+    forbidden = loaded_forbidden_modules()
+    if forbidden:
+        failures.append(f"CLI imports app-only modules: {', '.join(forbidden)}")
+    if args.max_cold_start_ms is not None and median_ms > args.max_cold_start_ms:
+        failures.append(f"median cold start {median_ms:.0f} ms exceeds {args.max_cold_start_ms:.0f} ms")
+
+    for failure in failures:
+        print(f"[SPA] Regression: {failure}")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
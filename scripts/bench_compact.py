@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Ensure the repository root is available on sys.path for `src` imports.
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.patterns.compact import compact_price_frame, memory_report  # noqa: E402
+from src.patterns.runs import detect_price_runs, detect_price_runs_panel  # noqa: E402
+
+
+def synthetic_panel(n_tickers: int, n_bars: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = np.round(100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.015, size=(n_bars, n_tickers)), axis=0)), 2)
+    index = pd.bdate_range("1994-01-03", periods=n_bars, name="date")
+    return pd.DataFrame(close, index=index, columns=[f"T{i:04d}" for i in range(n_tickers)])
+
+
+def _mb(n_bytes: int) -> str:
+    return f"{n_bytes / 1e6:10.1f} MB"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Report memory used by standard vs compact price and run tables.")
+    parser.add_argument("--tickers", type=int, default=500)
+    parser.add_argument("--bars", type=int, default=7_560)
+    args = parser.parse_args()
+
+    panel = synthetic_panel(args.tickers, args.bars)
+    engine = detect_price_runs_panel
+
+    t0 = time.perf_counter()
+    standard = engine(panel)
+    standard_s = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    compact = engine(panel, compact=True)
+    compact_s = time.perf_counter() - t0
+
+    report = memory_report(standard)
+    print(f"Universe runs table: {len(standard):,} runs over {args.tickers} tickers x {args.bars:,} bars")
+    print(f"  standard DataFrame: {_mb(report['standard_frame'])}  (detect {standard_s:.2f}s)")
+    print(f"  compact DataFrame:  {_mb(int(compact.memory_usage(deep=True).sum()))}  (detect {compact_s:.2f}s)")
+    print(f"  saved:              {report['standard_frame'] / report['compact_frame']:10.1f}x")
+
+    first_ticker = panel[[panel.columns[0]]].set_axis(["close"], axis=1)
+    single = getattr(detect_price_runs, "__wrapped__", detect_price_runs)(first_ticker)
+    single_report = memory_report(single)
+    print(f"One ticker: {len(single):,} runs")
+    for name, n_bytes in single_report.items():
+        print(f"  {name:<20}{_mb(n_bytes)}")
+
+    ohlcv = pd.DataFrame({col: panel.iloc[:, 0] for col in ("open", "high", "low", "close")})
+    ohlcv["volume"] = 1_000_000.0
+    print("One ticker OHLCV bars:")
+    print(f"  float64 frame:      {_mb(int(ohlcv.memory_usage(deep=True).sum()))}")
+    print(f"  compact frame:      {_mb(int(compact_price_frame(ohlcv).memory_usage(deep=True).sum()))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+# Ensure the repository root is available on sys.path for `src` imports.
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.events.correlate import (  # noqa: E402
+    ensure_timestamp_event,
+    _score_and_sort_events,
+    correlate_runs_with_events,
+    match_runs_to_events,
+)
+
+
+def reference_correlate(runs_df: pd.DataFrame, events: List[dict], window_days: int = 2) -> Dict[int, List[dict]]:
+    """Original runs x events nested loop, kept as the correctness and speed baseline."""
+    if runs_df is None or runs_df.empty:
+        return {}
+    correlations: Dict[int, List[dict]] = {}
+    normalized_events = [ensure_timestamp_event(e) for e in events or []]
+    for _, run in runs_df.iterrows():
+        run_id = int(run.get("run_id"))
+        run_start = pd.Timestamp(run["start"]).tz_localize(None)
+        window_start = (run_start - pd.Timedelta(days=window_days)).normalize()
+        window_end = (run_start + pd.Timedelta(days=window_days)).normalize()
+        matched: List[dict] = []
+        for event in normalized_events:
+            event_date = event.get("date")
+            if isinstance(event_date, pd.Timestamp) and window_start <= event_date.normalize() <= window_end:
+                enriched = dict(event)
+                enriched["days_from_run_start"] = int((event_date.normalize() - run_start.normalize()).days)
+                matched.append(enriched)
+        correlations[run_id] = _score_and_sort_events(matched, run_start)
+    return correlations
+
+
+def synthetic_inputs(n_runs: int, n_events: int, span_days: int, seed: int = 11):
+    """Runs with random start days and intraday-stamped events over the same span."""
+    rng = np.random.default_rng(seed)
+    base = pd.Timestamp("1990-01-01")
+    starts = base + pd.to_timedelta(np.sort(rng.integers(0, span_days, n_runs)), unit="D")
+    runs_df = pd.DataFrame({"run_id": np.arange(1, n_runs + 1), "start": starts, "end": starts})
+    event_offsets = rng.integers(0, span_days * 24, n_events)
+    event_dates = base + pd.to_timedelta(event_offsets, unit="h")
+    events = [
+        {
+            "date": d,
+            "headline": f"Headline {i % 97}",
+            "source": "Newswire",
+            "url": None,
+            "summary": None,
+            "ticker": "SYN",
+        }
+        for i, d in enumerate(event_dates)
+    ]
+    return runs_df, events
+
+
+def _timed(func, *args):
+    t0 = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - t0, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark interval-join event correlation.")
+    parser.add_argument("--window-days", type=int, default=2)
+    parser.add_argument(
+        "--span-days", type=int, default=365_000, help="Day span of the synthetic day numbers in the scaling table"
+    )
+    args = parser.parse_args()
+
+    print("Full correlate_runs_with_events vs nested-loop reference")
+    print(f"{'runs':>8} {'events':>9} {'reference_s':>12} {'correlate_s':>12}")
+    for n_runs, n_events in [(100, 1_000), (300, 3_000), (1_000, 10_000)]:
+        runs_df, events = synthetic_inputs(n_runs, n_events, span_days=n_runs * 3)
+        ref_s, expected = _timed(reference_correlate, runs_df, events, args.window_days)
+        new_s, actual = _timed(correlate_runs_with_events, runs_df, events, args.window_days)
+        assert actual == expected, "interval join diverged from the reference ordering"
+        print(f"{n_runs:>8} {n_events:>9} {ref_s:>12.3f} {new_s:>12.3f}")
+
+    # Only the core join: event dicts, day-number conversion and per-run sorting are not timed here.
+    print("\nCore join only: match_runs_to_events scaling (sorted int64 day numbers, no event dicts)")
+    print(f"{'runs':>8} {'events':>9} {'matches':>10} {'join_s':>9}")
+    rng = np.random.default_rng(3)
+    for n_runs, n_events in [(1_000, 10_000), (10_000, 100_000), (100_000, 1_000_000)]:
+        start_days = np.sort(rng.integers(0, args.span_days, n_runs)).astype(np.int64)
+        event_days = np.sort(rng.integers(0, args.span_days, n_events)).astype(np.int64)
+        t0 = time.perf_counter()
+        run_idx, _, _ = match_runs_to_events(start_days, event_days, args.window_days)
+        elapsed = time.perf_counter() - t0
+        print(f"{n_runs:>8} {n_events:>9} {run_idx.shape[0]:>10} {elapsed:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Ensure the repository root is available on sys.path for `src` imports.
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.events.dedupe import DedupParams, cluster_near_duplicates, collapse_near_duplicate_events  # noqa: E402
+
+_WORDS = (
+    "shares rally slump earnings beat miss guidance raises cuts outlook revenue quarter record deal merger "
+    "acquire stake chip demand cloud sales profit margin rates inflation jobs report upgrade downgrade "
+    "analyst target launch product recall probe lawsuit settlement dividend buyback ceo resigns names"
+).split()
+_PREFIXES = ("", "UPDATE 1-", "BREAKING: ", "EXCLUSIVE-", "")
+_SUFFIXES = ("", " - sources", " -report", "!", " (Reuters)")
+
+# Pairs that differ in the one word that matters; collapsing them would misreport the news.
+_CONTRADICTIONS = (
+    ("Apple Q3 revenue beats estimates", "Apple Q3 revenue misses estimates"),
+    ("Apple unveils new iPhone", "Apple unveils new iPad"),
+    ("Fed raises rates by 25 basis points", "Fed cuts rates by 25 basis points"),
+    ("Nvidia shares rise after earnings", "Nvidia shares fall after earnings"),
+)
+
+
+def synthetic_feed(n_stories: int, copies: int, seed: int = 0):
+    """Headlines for n_stories, each repeated up to `copies` times with wire-style rewording."""
+    rng = np.random.default_rng(seed)
+    headlines, truth = [], []
+    for story in range(n_stories):
+        words = [f"Company{story}"] + list(rng.choice(_WORDS, size=9))
+        for _ in range(int(rng.integers(1, copies + 1))):
+            variant = list(words)
+            if rng.random() < 0.5:
+                # Trimmed rewrite; swapping a word is treated as a different story (see _CONTRADICTIONS).
+                del variant[int(rng.integers(1, len(variant)))]
+            headlines.append(str(rng.choice(_PREFIXES)) + " ".join(variant) + str(rng.choice(_SUFFIXES)))
+            truth.append(story)
+    return headlines, np.asarray(truth)
+
+
+def check_contradictions() -> bool:
+    """Each contradictory pair (plus a wire copy of its first headline) must stay two events."""
+    ok = True
+    for first, second in _CONTRADICTIONS:
+        events = [
+            {"ticker": "T", "date": "2024-08-01", "headline": first, "source": "A"},
+            {"ticker": "T", "date": "2024-08-01", "headline": second, "source": "B"},
+            {"ticker": "T", "date": "2024-08-01", "headline": f"UPDATE 2-{first}", "source": "C"},
+        ]
+        counts = sorted(ev["duplicate_count"] for ev in collapse_near_duplicate_events(events))
+        if counts != [1, 2]:
+            print(f"FAIL: '{first}' / '{second}' collapsed to duplicate counts {counts}")
+            ok = False
+    print(f"Contradictory headline pairs kept apart: {ok}")
+    return ok
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark MinHash/LSH near-duplicate headline clustering.")
+    parser.add_argument("--stories", type=int, default=100_000)
+    parser.add_argument("--copies", type=int, default=10)
+    args = parser.parse_args()
+
+    if not check_contradictions():
+        sys.exit(1)
+
+    headlines, truth = synthetic_feed(args.stories, args.copies)
+    params = DedupParams()
+    t0 = time.perf_counter()
+    labels = cluster_near_duplicates(headlines, params=params)
+    elapsed = time.perf_counter() - t0
+
+    clusters = len(np.unique(labels))
+    merged_across = int((truth[labels] != truth).sum())
+    split_stories = len(np.unique(truth)) - len(np.unique(truth[labels]))
+    recall_loss = clusters - len(np.unique(truth))
+    print(f"{len(headlines):,} headlines ({args.stories:,} stories) clustered in {elapsed:.2f}s "
+          f"({len(headlines) / elapsed:,.0f} headlines/s)")
+    print(f"Clusters: {clusters:,} (ideal {args.stories:,}; {recall_loss:+,} from unmerged rewrites)")
+    print(f"Headlines merged into another story's cluster: {merged_across:,}; stories absorbed: {split_stories:,}")
+
+
+if __name__ == "__main__":
+    main()
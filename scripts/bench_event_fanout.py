@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+# Ensure the repository root is available on sys.path for `src` imports.
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.events.correlate import correlate_runs_with_events  # noqa: E402
+from src.events.fanout import MARKET_TAG, EventIndex, match_universe, sector_tag, ticker_tags  # noqa: E402
+
+
+def synthetic_universe(n_tickers: int, n_sectors: int, days: int, seed: int = 0):
+    """Runs for every ticker plus ticker, sector and market-wide events over `days` business days."""
+    rng = np.random.default_rng(seed)
+    calendar = pd.bdate_range("2014-01-01", periods=days).as_unit("ns")
+    tickers = [f"T{i:04d}" for i in range(n_tickers)]
+    sectors = {t: f"S{i % n_sectors:02d}" for i, t in enumerate(tickers)}
+
+    frames = []
+    for ticker in tickers:
+        bounds = np.unique(np.r_[0, np.cumsum(rng.integers(1, 4, size=days // 2)), days - 1])
+        bounds = bounds[bounds < days]
+        frames.append(
+            pd.DataFrame(
+                {
+                    "ticker": ticker,
+                    "run_id": np.arange(len(bounds) - 1),
+                    "start": calendar[bounds[:-1]],
+                    "end": calendar[bounds[1:]],
+                }
+            )
+        )
+    runs = pd.concat(frames, ignore_index=True)
+
+    events: List[dict] = []
+    for i, day in enumerate(calendar):
+        events.append({"date": day, "headline": f"Macro release {i}", "source": "Wire", "tags": [MARKET_TAG]})
+    for s in sorted(set(sectors.values())):
+        for i, day in enumerate(calendar[rng.random(days) < 0.3]):
+            events.append({"date": day, "headline": f"{s} sector note {i}", "source": "Wire", "tags": [sector_tag(s)]})
+    for ticker in tickers:
+        for i, day in enumerate(calendar[rng.random(days) < 0.2]):
+            events.append({"date": day, "headline": f"{ticker} company news {i}", "source": "Wire", "ticker": ticker})
+    return runs, events, sectors
+
+
+def naive(runs: pd.DataFrame, events: List[dict], sectors: Dict[str, str], window_days: int):
+    """Copy every relevant market/sector event into each ticker's list, then correlate per ticker."""
+    by_tag: Dict[str, List[dict]] = {}
+    for ev in events:
+        for tag in ev.get("tags") or [ev["ticker"]]:
+            by_tag.setdefault(tag, []).append(ev)
+    out = {}
+    for ticker, group in runs.groupby("ticker", sort=False):
+        ticker_events = [dict(ev) for tag in ticker_tags(ticker, sectors) for ev in by_tag.get(tag, [])]
+        out[ticker] = correlate_runs_with_events(group, ticker_events, window_days=window_days)
+    return out
+
+
+def indexed(runs: pd.DataFrame, events: List[dict], sectors: Dict[str, str], window_days: int):
+    return match_universe(runs, EventIndex(events), sectors, window_days=window_days)
+
+
+def _measure(func, *args):
+    t0 = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - t0
+    del result
+    tracemalloc.start()
+    result = func(*args)
+    peak = tracemalloc.get_traced_memory()[1] / 1e6
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare inverted-index event fan-out with per-ticker duplication.")
+    parser.add_argument("--tickers", type=int, default=200)
+    parser.add_argument("--sectors", type=int, default=11)
+    parser.add_argument("--days", type=int, default=1250)
+    parser.add_argument("--window-days", type=int, default=2)
+    args = parser.parse_args()
+
+    runs, events, sectors = synthetic_universe(args.tickers, args.sectors, args.days)
+    print(f"{len(runs):,} runs across {args.tickers} tickers; {len(events):,} distinct events")
+
+    naive_result, naive_s, naive_mb = _measure(naive, runs, events, sectors, args.window_days)
+    matches, index_s, index_mb = _measure(indexed, runs, events, sectors, args.window_days)
+    print(f"Naive duplication: {naive_s:.2f}s, peak {naive_mb:.0f} MB "
+          f"({sum(len(v) for c in naive_result.values() for v in c.values()):,} matched event copies)")
+    print(f"Inverted index:    {index_s:.2f}s, peak {index_mb:.0f} MB ({len(matches):,} columnar matches)")
+
+    def _key(correlations):
+        return {
+            run_id: [(e["date"], e["headline"], e["days_from_run_start"]) for e in matched]
+            for run_id, matched in correlations.items()
+        }
+
+    sample = list(naive_result)[:: max(1, len(naive_result) // 20)]
+    same = all(_key(matches.correlations_for_ticker(t)) == _key(naive_result[t]) for t in sample)
+    print(f"Per-ticker correlations identical on {len(sample)} sampled tickers: {same}")
+
+
+if __name__ == "__main__":
+    main()
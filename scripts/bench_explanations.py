@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+# Ensure the repository root is available on sys.path for `src` imports.
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+SCRIPTS = Path(__file__).resolve().parent
+if str(SCRIPTS) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS))
+
+from fake_llm_server import fake_completion_text, start_fake_llm_server  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Exercise concurrent, rate-limited explanation generation against a local fake LLM server."
+    )
+    parser.add_argument("--runs", type=int, default=24)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--latency-ms", type=float, default=150.0)
+    parser.add_argument("--error-rate", type=float, default=0.2)
+    parser.add_argument("--error-status", type=int, default=429)
+    args = parser.parse_args()
+
+    server = start_fake_llm_server(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.latency_ms / 2,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        seed=1,
+    )
+    # The client reads these at import time, so configure them before importing src.explain.
+    os.environ.update(
+        {
+            "OPENAI_API_KEY": "fake-key",
+            "OPENAI_BASE_URL": server.base_url,
+            "SPA_EXPLANATION_CACHE_MODE": "off",
+            "SPA_LLM_BACKOFF_BASE_MS": "50",
+        }
+    )
+
+    import pandas as pd
+
+    from src.explain.executor import run_in_order
+    from src.explain.explain_run import explain_run_with_events
+    from src.explain.prompt_builder import build_run_explanation_prompt
+
+    dates = pd.bdate_range("2024-01-01", periods=args.runs)
+    runs = [
+        pd.Series(
+            {
+                "run_id": i,
+                "direction": "up",
+                "start": d,
+                "end": d,
+                "duration_bars": 1,
+                "pct_change": 0.5 * i,
+                "max_drawdown_pct": 0.0,
+            }
+        )
+        for i, d in enumerate(dates)
+    ]
+    expected = [
+        fake_completion_text(build_run_explanation_prompt({**run.to_dict(), "ticker": "SYN"}, [])) for run in runs
+    ]
+
+    print(f"{'workers':>8} {'seconds':>8} {'requests':>9} {'errors':>7} {'in_order':>9}")
+    try:
+        for workers in args.workers:
+            before = dict(server.stats)
+            tasks = [lambda run=run: explain_run_with_events("SYN", run, []) for run in runs]
+            t0 = time.perf_counter()
+            texts = run_in_order(tasks, max_workers=workers)
+            elapsed = time.perf_counter() - t0
+            requests = server.stats["requests"] - before["requests"]
+            errors = server.stats["errors"] - before["errors"]
+            print(f"{workers:>8} {elapsed:>8.2f} {requests:>9} {errors:>7} {str(texts == expected):>9}")
+    finally:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
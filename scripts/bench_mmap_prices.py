@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Ensure the repository root is available on sys.path for `src` imports.
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.data.mmap_store import MmapPriceStore  # noqa: E402
+from src.data.price_store import PRICE_COLUMNS, FixturePriceProvider, PriceStore  # noqa: E402
+
+
+def synthetic_bars(n_bars: int, freq: str, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = np.round(100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.001, size=n_bars))), 2)
+    index = pd.date_range("2010-01-04", periods=n_bars, freq=freq, name="date")
+    frame = pd.DataFrame({col: close for col in PRICE_COLUMNS}, index=index)
+    frame["volume"] = rng.integers(100, 10_000, size=n_bars).astype(float)
+    return frame
+
+
+def _median_ms(func, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - t0)
+    return float(np.median(timings)) * 1000.0
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare memory-mapped window slicing with the Parquet store.")
+    parser.add_argument("--bars", type=int, default=2_000_000)
+    parser.add_argument("--freq", default="min")
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    frame = synthetic_bars(args.bars, args.freq)
+    first, last = frame.index[0], frame.index[-1]
+    end = last + pd.Timedelta(days=1)
+    window_start = first + (last - first) * 0.4
+    window_end = first + (last - first) * 0.6
+
+    with tempfile.TemporaryDirectory() as tmp:
+        fixture_dir = Path(tmp) / "fixtures"
+        fixture_dir.mkdir()
+        frame.to_parquet(fixture_dir / "SYN_1m.parquet")
+        parquet_store = PriceStore(Path(tmp) / "parquet", FixturePriceProvider(fixture_dir))
+        parquet_store.get("SYN", first.normalize(), end.normalize(), interval="1m")
+
+        mmap_store = MmapPriceStore(Path(tmp) / "mmap")
+        mmap_store.write("SYN", frame, first.normalize(), end.normalize(), interval="1m")
+
+        parquet_ms = _median_ms(
+            lambda: parquet_store.get("SYN", window_start.normalize(), window_end.normalize(), interval="1m"),
+            args.repeats,
+        )
+        mmap_ms = _median_ms(
+            lambda: mmap_store.window("SYN", window_start.normalize(), window_end.normalize(), interval="1m"),
+            args.repeats,
+        )
+        window = mmap_store.window("SYN", window_start.normalize(), window_end.normalize(), interval="1m")
+        mapped = mmap_store.open("SYN", interval="1m")
+        shared = np.shares_memory(window["close"].to_numpy(), mapped.columns["close"])
+
+    print(f"{args.bars:,} bars; 20% window = {len(window):,} bars")
+    print(f"  Parquet store window: {parquet_ms:9.2f} ms")
+    print(f"  mmap window (frame):  {mmap_ms:9.3f} ms (zero-copy view: {shared})")
+    print(f"  speedup:              {parquet_ms / mmap_ms:9.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import argparse
+import json
+import resource
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+# Ensure the repository root is available on sys.path for `src` imports.
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.data.news_store import NewsStore, iter_providers_for_paths  # noqa: E402
+
+
+def write_archive(path: Path, n_items: int, n_tickers: int, seed: int = 0) -> None:
+    """Write a synthetic JSONL archive in chunks so the generator itself stays small."""
+    rng = np.random.default_rng(seed)
+    base = pd.Timestamp("2015-01-01").value
+    span = pd.Timedelta(days=3650).value
+    with path.open("w") as handle:
+        for lo in range(0, n_items, 100_000):
+            size = min(100_000, n_items - lo)
+            tickers = rng.integers(0, n_tickers, size=size)
+            stamps = pd.to_datetime(base + rng.integers(0, span, size=size)).strftime("%Y-%m-%dT%H:%M:%S")
+            for i in range(size):
+                handle.write(
+                    json.dumps(
+                        {
+                            "ticker": f"T{tickers[i]:04d}",
+                            "date": stamps[i],
+                            "headline": f"Headline {lo + i}",
+                            "source": "Synthetic",
+                        }
+                    )
+                )
+                handle.write("\n")
+
+
+def legacy_query(items: List[Dict], start: pd.Timestamp, end: pd.Timestamp, max_items: int) -> List[Dict]:
+    """The previous approach: re-parse and filter every item of the ticker on each call."""
+    selected = []
+    for item in items:
+        ts = pd.Timestamp(item["date"])
+        if start <= ts <= end:
+            selected.append(dict(item, date=ts))
+    selected.sort(key=lambda x: (x["date"], x["headline"]))
+    return selected[:max_items]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the indexed news store against linear filtering.")
+    parser.add_argument("--items", type=int, default=1_000_000)
+    parser.add_argument("--tickers", type=int, default=500)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = Path(tmp) / "news.jsonl"
+        write_archive(archive, args.items, args.tickers)
+        size_mb = archive.stat().st_size / 1e6
+        rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+        store = NewsStore(Path(tmp) / "store")
+        t0 = time.perf_counter()
+        counts = store.ingest(iter_providers_for_paths([archive]))
+        ingest_s = time.perf_counter() - t0
+        rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+        print(f"Ingest: {args.items:,} items ({size_mb:.0f} MB JSONL) for {len(counts)} tickers in {ingest_s:.2f}s")
+        print(f"Peak RSS: {rss_before:.0f} MB before ingest, {rss_after:.0f} MB after")
+
+        rng = np.random.default_rng(1)
+        tickers = [f"T{i:04d}" for i in rng.integers(0, args.tickers, size=args.queries)]
+        starts = pd.Timestamp("2015-01-01") + pd.to_timedelta(rng.integers(0, 3500, size=args.queries), unit="D")
+        windows = [(t, s, s + pd.Timedelta(days=90)) for t, s in zip(tickers, starts)]
+
+        for ticker, _, _ in windows:  # warm per-ticker column loads
+            store.query(ticker, pd.Timestamp("2015-01-01"), pd.Timestamp("2015-01-02"))
+        t0 = time.perf_counter()
+        indexed = [store.query(t, s, e, 100) for t, s, e in windows]
+        indexed_ms = (time.perf_counter() - t0) * 1000 / len(windows)
+
+        by_ticker = {t: pd.read_parquet(store.root / f"{t}.parquet") for t in set(tickers)}
+        raw = {
+            t: [
+                {"date": str(pd.Timestamp(d)), "headline": h, "source": s, "url": None, "summary": None}
+                for d, h, s in zip(f["date"].astype("datetime64[ns]"), f["headline"], f["source"])
+            ]
+            for t, f in by_ticker.items()
+        }
+        t0 = time.perf_counter()
+        linear = [legacy_query(raw[t], s, e, 100) for t, s, e in windows]
+        linear_ms = (time.perf_counter() - t0) * 1000 / len(windows)
+
+        same = all(
+            [(r["date"], r["headline"]) for r in a] == [(r["date"], r["headline"]) for r in b]
+            for a, b in zip(indexed, linear)
+        )
+        print(f"Query (90-day window, {args.items // args.tickers:,} items/ticker): "
+              f"indexed {indexed_ms:.3f} ms, linear {linear_ms:.3f} ms ({linear_ms / indexed_ms:.0f}x)")
+        print(f"Results identical: {same}")
+
+
+if __name__ == "__main__":
+    main()
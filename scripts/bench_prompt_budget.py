@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+# Ensure the repository root is available on sys.path for `src` imports.
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.explain.prompt_budget import PromptBudget, estimate_tokens  # noqa: E402
+from src.explain.prompt_builder import build_run_explanation_prompt  # noqa: E402
+
+
+def legacy_prompt(run: Dict, events: List[Dict]) -> str:
+    """The previous prompt: repeated instructions, full-precision numbers, every event with its URL."""
+    event_lines = [f"- {e['date']}: {e['headline']} ({e['url']})" for e in events] or [
+        "- No public events were linked to this run."
+    ]
+    return (
+        "Summarize the following historical price run:\n\n"
+        "You are a neutral financial historian. Summarize the historical run in 2-3 sentences.\n"
+        "Mention public events only as possible context, not guaranteed causes.\n"
+        "Do not provide predictions, outlook statements, or buy/sell/hold language.\n"
+        "Use phrases like 'during this period', 'historically', or 'the stock experienced...'.\n\n"
+        "Run details:\n"
+        f"Run direction: {run['direction']}\n"
+        f"Start date: {run['start']}\n"
+        f"End date: {run['end']}\n"
+        f"Duration (bars): {run['duration_bars']}\n"
+        f"Percent change: {run['pct_change']}%\n"
+        f"Max adverse move: {run['max_drawdown_pct']}%\n\n"
+        "Relevant public events:\n" + "\n".join(event_lines) + "\n"
+    )
+
+
+def synthetic_run(rng: np.random.Generator, run_id: int, n_events: int) -> tuple:
+    start = pd.Timestamp("2024-01-01") + pd.Timedelta(days=int(rng.integers(0, 300)))
+    run = {
+        "run_id": run_id,
+        "ticker": "SYN",
+        "direction": "up",
+        "start": start,
+        "end": start + pd.Timedelta(days=6),
+        "duration_bars": 5,
+        "pct_change": float(rng.normal(0, 5)),
+        "max_drawdown_pct": float(-abs(rng.normal(0, 1))),
+    }
+    words = "shares rally after quarterly earnings beat estimates as guidance raised analysts upgrade".split()
+    events = [
+        {
+            "date": start + pd.Timedelta(hours=int(rng.integers(-48, 200))),
+            "headline": "Synthetic Corp " + " ".join(rng.choice(words, size=int(rng.integers(6, 30)))),
+            "url": f"https://news.example.com/markets/2024/{run_id}/{i}-synthetic-corp-story",
+            "relevance": float(rng.random()),
+        }
+        for i in range(n_events)
+    ]
+    return run, events
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare explanation prompt sizes before and after budgeting.")
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--events", type=int, nargs="+", default=[0, 3, 5, 20, 60])
+    parser.add_argument("--budgets", type=int, nargs="+", default=[300, 600])
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    header = f"{'events':>7} {'legacy':>8}" + "".join(f" {'budget ' + str(b):>11}" for b in args.budgets)
+    print("Mean estimated input tokens per prompt")
+    print(header)
+    for n_events in args.events:
+        samples = [synthetic_run(rng, i, n_events) for i in range(args.runs)]
+        legacy = np.mean([estimate_tokens(legacy_prompt(run, events)) for run, events in samples])
+        row = f"{n_events:>7} {legacy:>8.0f}"
+        for budget in args.budgets:
+            limits = PromptBudget(max_input_tokens=budget)
+            compact = np.mean([estimate_tokens(build_run_explanation_prompt(r, e, limits)) for r, e in samples])
+            row += f" {compact:>11.0f}"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import argparse
+import math
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+# Ensure the repository root is available on sys.path for `src` imports.
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.events.correlate import correlate_runs_with_events  # noqa: E402
+from src.events.relevance import (  # noqa: E402
+    _STOPWORDS,
+    _UNKNOWN_SOURCE_WEIGHT,
+    DEFAULT_SOURCE_WEIGHTS,
+    RelevanceWeights,
+    correlate_runs_by_relevance,
+)
+
+_WORDS = "shares rally slump earnings guidance outlook revenue deal chip demand cloud rates inflation jobs".split()
+_SOURCES = ["Newswire", "Analyst", "Blog", "Press release", "Forum"]
+
+
+def synthetic_ticker(ticker: str, days: int, events_per_day: float, seed: int):
+    rng = np.random.default_rng(seed)
+    calendar = pd.bdate_range("2020-01-01", periods=days).as_unit("ns")
+    bounds = np.unique(np.r_[0, np.cumsum(rng.integers(1, 4, size=days // 2)), days - 1])
+    bounds = bounds[bounds < days]
+    runs = pd.DataFrame(
+        {"run_id": np.arange(len(bounds) - 1), "start": calendar[bounds[:-1]], "end": calendar[bounds[1:]]}
+    )
+    n_events = int(days * events_per_day)
+    events = [
+        {
+            "date": calendar[int(rng.integers(0, days))],
+            "headline": " ".join([ticker if rng.random() < 0.5 else "Market"] + list(rng.choice(_WORDS, size=7)))
+            + f" {i}",
+            "source": str(rng.choice(_SOURCES)),
+            "ticker": ticker,
+        }
+        for i in range(n_events)
+    ]
+    return runs, events
+
+
+def per_pair_loop(runs: pd.DataFrame, events: List[dict], ticker: str, window_days: int, top_k: int):
+    """Reference: dict-based TF-IDF and one Python scoring call per (run, event) pair."""
+    weights = RelevanceWeights()
+    docs = [[w for w in ev["headline"].lower().split() if w not in _STOPWORDS] for ev in events]
+    df = Counter(term for doc in docs for term in set(doc))
+    idf = {t: math.log((1 + len(docs)) / (1 + c)) + 1 for t, c in df.items()}
+    vectors = []
+    for doc in docs:
+        vec = {t: c * idf[t] for t, c in Counter(doc).items()}
+        norm = math.sqrt(sum(v * v for v in vec.values())) or 1.0
+        vectors.append({t: v / norm for t, v in vec.items()})
+    profile: Dict[str, float] = Counter({ticker.lower(): idf.get(ticker.lower(), 0.0)})
+    for vec in vectors:
+        for t, v in vec.items():
+            profile[t] += v
+    norm = math.sqrt(sum(v * v for v in profile.values())) or 1.0
+    table = {k.lower(): v for k, v in DEFAULT_SOURCE_WEIGHTS.items()}
+
+    out = {}
+    for run in runs.itertuples(index=False):
+        scored = []
+        for i, ev in enumerate(events):
+            offset = int((ev["date"].normalize() - run.start.normalize()).days)
+            if abs(offset) > window_days:
+                continue
+            sim = sum(v * profile.get(t, 0.0) for t, v in vectors[i].items()) / norm
+            src = table.get(ev["source"].lower(), _UNKNOWN_SOURCE_WEIGHT)
+            prox = 1.0 - abs(offset) / (window_days + 1.0)
+            scored.append((weights.proximity * prox + weights.source * src + weights.text * sim, i))
+        scored.sort(key=lambda x: -x[0])
+        out[run.run_id] = scored[:top_k]
+    return out
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark batch relevance scoring of run/event matches.")
+    parser.add_argument("--tickers", type=int, default=20)
+    parser.add_argument("--days", type=int, default=750)
+    parser.add_argument("--events-per-day", type=float, default=8.0)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--window-days", type=int, default=2)
+    args = parser.parse_args()
+
+    data = [synthetic_ticker(f"T{i:03d}", args.days, args.events_per_day, seed=i) for i in range(args.tickers)]
+    n_runs = sum(len(r) for r, _ in data)
+
+    t0 = time.perf_counter()
+    uncapped = [correlate_runs_with_events(r, e, window_days=args.window_days) for r, e in data]
+    proximity_s = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    ranked = [
+        correlate_runs_by_relevance(r, e, f"T{i:03d}", window_days=args.window_days, top_k=args.top_k)
+        for i, (r, e) in enumerate(data)
+    ]
+    batch_s = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    per_pair_loop(*data[0], "T000", args.window_days, args.top_k)
+    loop_s = (time.perf_counter() - t0) * args.tickers
+
+    before = sum(len(v) for c in uncapped for v in c.values()) / n_runs
+    after = sum(len(v) for c in ranked for v in c.values()) / n_runs
+    print(f"{n_runs:,} runs, {sum(len(e) for _, e in data):,} events across {args.tickers} tickers")
+    print(f"Proximity-only correlation: {proximity_s:.2f}s")
+    print(f"Batch relevance scoring:    {batch_s:.2f}s")
+    print(f"Per-pair Python loop:       {loop_s:.2f}s (extrapolated from one ticker)")
+    print(f"Events per run: {before:.1f} -> {after:.1f} (top-{args.top_k})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Ensure the repository root is available on sys.path for `src` imports.
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.patterns.runs import detect_price_runs  # noqa: E402
+from src.patterns.tracker import RunTracker  # noqa: E402
+
+
+def synthetic_history(n_bars: int, seed: int) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    steps = rng.normal(0.0, 0.012, size=n_bars)
+    steps[rng.random(n_bars) < 0.03] = 0.0
+    close = np.round(100.0 * np.exp(np.cumsum(steps)), 2)
+    return pd.DataFrame({"close": close}, index=pd.bdate_range("1994-01-03", periods=n_bars, name="date"))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare incremental RunTracker refresh with full recompute.")
+    parser.add_argument("--tickers", type=int, default=500)
+    parser.add_argument("--history-bars", type=int, default=7_560)
+    parser.add_argument("--new-bars", type=int, default=1, help="Bars appended per ticker per refresh")
+    parser.add_argument("--refreshes", type=int, default=5)
+    args = parser.parse_args()
+
+    engine = getattr(detect_price_runs, "__wrapped__", detect_price_runs)
+    total_bars = args.history_bars + args.new_bars * args.refreshes
+    universe = {f"T{i:04d}": synthetic_history(total_bars, seed=i) for i in range(args.tickers)}
+
+    t0 = time.perf_counter()
+    trackers = {
+        ticker: RunTracker.from_history(frame.iloc[: args.history_bars]) for ticker, frame in universe.items()
+    }
+    seed_s = time.perf_counter() - t0
+    print(f"Seeded {args.tickers} trackers from {args.history_bars} bars each in {seed_s:.2f}s")
+
+    incremental_s = 0.0
+    recompute_s = 0.0
+    for refresh in range(args.refreshes):
+        lo = args.history_bars + refresh * args.new_bars
+        hi = lo + args.new_bars
+        for ticker, frame in universe.items():
+            new_bars = frame.iloc[lo:hi]
+            t0 = time.perf_counter()
+            trackers[ticker].update(new_bars)
+            incremental_s += time.perf_counter() - t0
+
+            history = frame.iloc[:hi]
+            t0 = time.perf_counter()
+            expected = engine(history)
+            recompute_s += time.perf_counter() - t0
+
+            pd.testing.assert_frame_equal(trackers[ticker].runs_frame(), expected, check_exact=True)
+
+    print(f"{'refreshes':>9} {'incremental_s':>14} {'full_recompute_s':>17} {'speedup':>8}")
+    print(f"{args.refreshes:>9} {incremental_s:>14.3f} {recompute_s:>17.3f} {recompute_s / incremental_s:>7.1f}x")
+    print("Tracker output matched full recompute after every refresh.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+# Ensure the repository root is available on sys.path for `src` imports.
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.patterns.runs import PriceRun, detect_price_runs, detect_price_runs_panel  # noqa: E402
+
+
+def reference_detect_price_runs(df: pd.DataFrame, price_col: str = "close") -> pd.DataFrame:
+    """Original groupby-per-run implementation, kept as the correctness and speed baseline."""
+    price_series = df[price_col].astype(float)
+    returns = price_series.pct_change()
+    direction = returns.fillna(0.0)
+    direction_flags = direction.gt(0).astype(int) - direction.lt(0).astype(int)
+
+    nonzero_mask = direction_flags != 0
+    if not nonzero_mask.any():
+        return pd.DataFrame(columns=[field for field in PriceRun.__dataclass_fields__])
+
+    label_source = direction_flags.where(nonzero_mask, 0)
+    run_labels = label_source.ne(label_source.shift()).cumsum()
+
+    run_rows = df.loc[nonzero_mask].copy()
+    run_rows["direction_flag"] = direction_flags[nonzero_mask].astype(int)
+    run_rows["run_id"] = run_labels[nonzero_mask].astype(int)
+
+    runs: List[PriceRun] = []
+    for run_id, slice_df in run_rows.groupby("run_id"):
+        dir_flag = int(slice_df["direction_flag"].iat[0])
+        segment_index = slice_df.index
+        start_ts = segment_index[0]
+        end_ts = segment_index[-1]
+        start_price = price_series.loc[start_ts]
+        end_price = price_series.loc[end_ts]
+        segment_prices = price_series.loc[segment_index]
+        if dir_flag > 0:
+            adverse = float((segment_prices / segment_prices.cummax() - 1.0).min() * 100.0)
+        else:
+            adverse = float((segment_prices / segment_prices.cummin() - 1.0).max() * 100.0)
+        runs.append(
+            PriceRun(
+                run_id=int(run_id),
+                direction="up" if dir_flag > 0 else "down",
+                start=start_ts,
+                end=end_ts,
+                duration_bars=len(slice_df),
+                pct_change=((end_price / start_price) - 1.0) * 100.0,
+                max_drawdown_pct=adverse,
+            )
+        )
+
+    return pd.DataFrame([run.__dict__ for run in runs])
+
+
+def synthetic_prices(n_bars: int, seed: int = 7) -> pd.DataFrame:
+    """Random-walk closes with occasional flat bars, on a business-day index."""
+    rng = np.random.default_rng(seed)
+    steps = rng.normal(0.0, 0.012, size=n_bars)
+    steps[rng.random(n_bars) < 0.03] = 0.0
+    close = np.round(100.0 * np.exp(np.cumsum(steps)), 2)
+    index = pd.bdate_range("1990-01-01", periods=n_bars, name="date")
+    return pd.DataFrame({"close": close}, index=index)
+
+
+def _time_call(func, *args, repeats: int = 3) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark vectorized run detection against the per-run loop.")
+    parser.add_argument("--sizes", nargs="+", type=int, default=[1_000, 7_560, 75_600])
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--panel-tickers", type=int, default=500, help="Tickers in the panel comparison (0 skips it)")
+    parser.add_argument("--panel-bars", type=int, default=2_520)
+    args = parser.parse_args()
+
+    engine = getattr(detect_price_runs, "__wrapped__", detect_price_runs)
+
+    print(f"{'bars':>10} {'runs':>8} {'reference_s':>12} {'vectorized_s':>13} {'speedup':>8}")
+    for n_bars in args.sizes:
+        prices = synthetic_prices(n_bars)
+        expected = reference_detect_price_runs(prices)
+        actual = engine(prices)
+        pd.testing.assert_frame_equal(actual, expected, check_exact=True)
+
+        ref_s = _time_call(reference_detect_price_runs, prices, repeats=args.repeats)
+        vec_s = _time_call(engine, prices, repeats=args.repeats)
+        print(f"{n_bars:>10} {len(expected):>8} {ref_s:>12.4f} {vec_s:>13.4f} {ref_s / vec_s:>7.1f}x")
+
+    if args.panel_tickers > 0:
+        bench_panel(args.panel_tickers, args.panel_bars, args.repeats)
+
+
+def bench_panel(n_tickers: int, n_bars: int, repeats: int) -> None:
+    """Compare one panel call with a per-ticker loop over a wide frame with listing/delisting gaps."""
+    frames = [synthetic_prices(n_bars, seed=i)["close"].rename(f"T{i:04d}") for i in range(n_tickers)]
+    wide = pd.concat(frames, axis=1)
+    rng = np.random.default_rng(0)
+    for col in wide.columns[::7]:
+        wide.loc[wide.index[: rng.integers(1, n_bars // 2)], col] = np.nan
+    single = getattr(detect_price_runs, "__wrapped__", detect_price_runs)
+    panel = detect_price_runs_panel
+
+    def per_ticker_loop() -> pd.DataFrame:
+        parts = []
+        for ticker in wide.columns:
+            runs = single(wide[[ticker]].dropna().rename(columns={ticker: "close"}))
+            runs.insert(0, "ticker", ticker)
+            parts.append(runs)
+        return pd.concat(parts, ignore_index=True)
+
+    pd.testing.assert_frame_equal(panel(wide), per_ticker_loop(), check_exact=True)
+    loop_s = _time_call(per_ticker_loop, repeats=repeats)
+    panel_s = _time_call(panel, wide, repeats=repeats)
+    print(f"\nPanel of {n_tickers} tickers x {n_bars} bars: per-ticker loop {loop_s:.3f}s, "
+          f"panel {panel_s:.3f}s ({loop_s / panel_s:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
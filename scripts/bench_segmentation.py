@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import argparse
+import itertools
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Ensure the repository root is available on sys.path for `src` imports.
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.patterns.segmentation import (  # noqa: E402
+    SegmentationParams,
+    detect_price_runs_with_params,
+    sweep_segmentation,
+)
+
+
+def synthetic_ohlcv(n_bars: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    close = np.round(100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.012, size=n_bars))), 2)
+    volume = rng.lognormal(13.0, 0.4, size=n_bars).round()
+    index = pd.bdate_range("1994-01-03", periods=n_bars, name="date")
+    return pd.DataFrame({"close": close, "volume": volume}, index=index)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare a one-call parameter sweep with per-set segmentation.")
+    parser.add_argument("--bars", type=int, default=7_560)
+    parser.add_argument("--loop-sets", type=int, default=20, help="Parameter sets timed one call at a time")
+    args = parser.parse_args()
+
+    df = synthetic_ohlcv(args.bars)
+    grid = [
+        SegmentationParams(min_move_bps=bps, min_bars=bars, max_counter_bars=counter, min_volume_ratio=ratio)
+        for bps, bars, counter, ratio in itertools.product(
+            (0.0, 5.0, 10.0, 25.0, 50.0), (1, 2, 3, 5), (0, 1, 2), (0.0, 1.0, 1.5)
+        )
+    ]
+    single = getattr(detect_price_runs_with_params, "__wrapped__", detect_price_runs_with_params)
+
+    t0 = time.perf_counter()
+    swept = sweep_segmentation(df, grid)
+    sweep_s = time.perf_counter() - t0
+
+    sample = grid[: args.loop_sets]
+    t0 = time.perf_counter()
+    for params in sample:
+        single(df, params)
+    per_set_s = (time.perf_counter() - t0) / len(sample)
+
+    print(f"{len(grid)} parameter sets over {args.bars:,} bars -> {len(swept):,} runs")
+    print(f"  one sweep call:       {sweep_s:8.3f}s")
+    print(f"  one call per set:     {per_set_s * len(grid):8.3f}s (extrapolated from {len(sample)} sets)")
+    print(f"  speedup:              {per_set_s * len(grid) / sweep_s:8.1f}x")
+
+    counts = swept.groupby("param_set").size().reindex(range(len(grid)), fill_value=0)
+    baseline = counts.iloc[0]
+    print(f"  runs with defaults:   {baseline:,}; fewest with any set: {counts.min():,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Ensure the repository root is available on sys.path for `src` imports.
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.patterns.similarity import RunShapeIndex  # noqa: E402
+
+
+def synthetic_panel(n_tickers: int, n_bars: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    steps = rng.normal(0.0, 0.015, size=(n_bars, n_tickers))
+    close = 100.0 * np.exp(np.cumsum(steps, axis=0))
+    index = pd.bdate_range("1994-01-03", periods=n_bars, name="date")
+    return pd.DataFrame(close, index=index, columns=[f"T{i:04d}" for i in range(n_tickers)])
+
+
+def tiled_index(base: RunShapeIndex, n_runs: int, directory: Path) -> None:
+    """Write an index of ``n_runs`` rows by repeating ``base`` directly into .npy memmaps."""
+    reps = -(-n_runs // len(base))
+    for name in ("vectors", "sq_norms", "ticker_codes", "run_ids", "starts"):
+        source = np.asarray(getattr(base, name))
+        out = np.lib.format.open_memmap(
+            directory / f"{name}.npy", mode="w+", dtype=source.dtype, shape=(n_runs, *source.shape[1:])
+        )
+        for rep in range(reps):
+            lo = rep * len(base)
+            hi = min(lo + len(base), n_runs)
+            out[lo:hi] = source[: hi - lo]
+        out.flush()
+        del out
+    base_dir = directory / "_base"
+    base.save(base_dir)
+    (directory / "meta.json").write_text((base_dir / "meta.json").read_text())
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark shape-similarity kNN over a memory-mapped run index.")
+    parser.add_argument("--tickers", type=int, default=200)
+    parser.add_argument("--bars", type=int, default=5_000)
+    parser.add_argument("--runs", type=int, default=10_000_000, help="Index size to query (tiled from the built runs)")
+    parser.add_argument("--k", type=int, default=20)
+    parser.add_argument("--queries", type=int, default=5)
+    args = parser.parse_args()
+
+    panel = synthetic_panel(args.tickers, args.bars)
+    t0 = time.perf_counter()
+    base = RunShapeIndex.from_panel(panel)
+    build_s = time.perf_counter() - t0
+    print(f"Built {len(base):,} run vectors ({base.n_points} points) from {panel.size:,} bars in {build_s:.2f}s")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        tiled_index(base, args.runs, directory)
+
+        t0 = time.perf_counter()
+        index = RunShapeIndex.load(directory)
+        load_ms = (time.perf_counter() - t0) * 1000.0
+        size_mb = index.vectors.nbytes / 1e6
+        print(f"Loaded {len(index):,}-run index ({size_mb:,.0f} MB of vectors) via mmap in {load_ms:.1f} ms")
+
+        rng = np.random.default_rng(1)
+        timings = []
+        for i, row in enumerate(rng.integers(0, len(base), size=args.queries)):
+            t0 = time.perf_counter()
+            result = index.query(np.asarray(base.vectors[row]), k=args.k)
+            timings.append(time.perf_counter() - t0)
+            label = "cold" if i == 0 else "warm"
+            print(f"  query {i} ({label}): {timings[-1] * 1000.0:8.1f} ms, {len(result)} neighbours")
+        print(f"Median query time: {np.median(timings) * 1000.0:.1f} ms for k={args.k}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+from __future__ import annotations
+
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+# Ensure the repository root is available on sys.path for `src` imports.
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.patterns.runs import detect_price_runs  # noqa: E402
+from src.patterns.streaming import iter_parquet_bars, iter_price_runs  # noqa: E402
+
+
+def write_minute_bars(path: Path, n_bars: int, row_group: int, seed: int = 0) -> None:
+    """Write a synthetic minute-bar close series to Parquet, one row group at a time."""
+    rng = np.random.default_rng(seed)
+    start = np.datetime64("2000-01-03T09:30", "ns")
+    last_log_price = np.log(100.0)
+    schema = pa.schema([("date", pa.timestamp("ns")), ("close", pa.float64())])
+    with pq.ParquetWriter(path, schema) as writer:
+        for lo in range(0, n_bars, row_group):
+            size = min(row_group, n_bars - lo)
+            log_prices = last_log_price + np.cumsum(rng.normal(0.0, 0.0008, size=size))
+            last_log_price = log_prices[-1]
+            dates = start + np.arange(lo, lo + size).astype("timedelta64[m]")
+            close = np.round(np.exp(log_prices), 2)
+            writer.write_table(pa.table({"date": dates, "close": close}, schema=schema), row_group_size=row_group)
+
+
+def measure(mode: str, path: str) -> dict:
+    """Run one detection mode and report runs, time and peak RSS of this process."""
+    t0 = time.perf_counter()
+    if mode == "stream":
+        n_runs = 0
+        checksum = 0.0
+        for runs in iter_price_runs(iter_parquet_bars(path)):
+            n_runs += len(runs)
+            checksum += float(runs["pct_change"].sum())
+    else:
+        frame = pd.read_parquet(path).set_index("date")
+        runs = detect_price_runs(frame)
+        n_runs = len(runs)
+        checksum = float(runs["pct_change"].sum())
+    elapsed = time.perf_counter() - t0
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+    return {"runs": n_runs, "checksum": checksum, "seconds": elapsed, "peak_rss_mb": peak_mb}
+
+
+def _measure_in_subprocess(mode: str, path: Path) -> dict:
+    output = subprocess.run(
+        [sys.executable, __file__, "--measure", mode, str(path)],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare streaming and in-memory run detection on minute bars.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[2_000_000, 8_000_000, 32_000_000])
+    parser.add_argument("--full-max", type=int, default=8_000_000, help="Largest size also run fully in memory")
+    parser.add_argument("--row-group", type=int, default=500_000)
+    parser.add_argument("--measure", nargs=2, metavar=("MODE", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(measure(*args.measure)))
+        return
+
+    print(f"{'bars':>12} {'mode':>7} {'runs':>10} {'seconds':>8} {'peak RSS MB':>12}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_bars in args.sizes:
+            path = Path(tmp) / f"bars_{n_bars}.parquet"
+            write_minute_bars(path, n_bars, args.row_group)
+            modes = ["stream", "full"] if n_bars <= args.full_max else ["stream"]
+            results = {mode: _measure_in_subprocess(mode, path) for mode in modes}
+            for mode, result in results.items():
+                print(
+                    f"{n_bars:>12,} {mode:>7} {result['runs']:>10,} {result['seconds']:>8.2f} "
+                    f"{result['peak_rss_mb']:>12.0f}"
+                )
+            if "full" in results:
+                same = results["full"]["runs"] == results["stream"]["runs"] and np.isclose(
+                    results["full"]["checksum"], results["stream"]["checksum"], rtol=0, atol=1e-6
+                )
+                print(f"{'':>12} streaming output matches full run: {same}")
+            path.unlink()
+
+
+if __name__ == "__main__":
+    main()
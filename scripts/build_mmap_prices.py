@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Ensure the repository root is available on sys.path for `src` imports.
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from src.config_spa import SPA_PRICE_MMAP_DIR_DEFAULT  # noqa: E402
+from src.data.fetch_prices import _parse_date, fetch_prices  # noqa: E402
+from src.data.mmap_store import MmapPriceStore  # noqa: E402
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Write tickers' bars into the memory-mapped price layout.")
+    parser.add_argument("--tickers", nargs="+", required=True)
+    parser.add_argument("--start", required=True, help="Start date (YYYY-MM-DD)")
+    parser.add_argument("--end", required=True, help="End date (YYYY-MM-DD), exclusive")
+    parser.add_argument("--interval", default="1d")
+    parser.add_argument("--raw", action="store_true", help="Store unadjusted prices")
+    parser.add_argument("--root", default=SPA_PRICE_MMAP_DIR_DEFAULT or "data/mmap_prices")
+    args = parser.parse_args()
+
+    store = MmapPriceStore(args.root)
+    for ticker in dict.fromkeys(t.upper() for t in args.tickers):
+        t0 = time.perf_counter()
+        try:
+            frame = fetch_prices(ticker, args.start, args.end, auto_adjust=not args.raw, interval=args.interval)
+        except ValueError as exc:
+            print(f"[SPA] Warning: skipping {ticker}: {exc}")
+            continue
+        target = store.write(
+            ticker,
+            frame,
+            _parse_date(args.start),
+            _parse_date(args.end),
+            auto_adjust=not args.raw,
+            interval=args.interval,
+        )
+        print(f"[SPA] Wrote {len(frame):,} bars for {ticker} to {target} in {time.perf_counter() - t0:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
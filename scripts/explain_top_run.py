@@ -3,15 +3,14 @@ from __future__ import annotations
 import sys
 from pathlib import Path
 
-# Ensure the project root is on sys.path so `src` imports resolve.
+# Ensure the repository root is available on sys.path for `src` imports.
 ROOT = Path(__file__).resolve().parents[1]
-SRC_PATH = ROOT / "src"
-if str(SRC_PATH) not in sys.path:
-    sys.path.insert(0, str(SRC_PATH))
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
 
-from data.fetch_prices import fetch_daily_prices  # noqa: E402
-from patterns.runs import detect_price_runs  # noqa: E402
-from explain.explain_run import explain_single_run  # noqa: E402
+from src.data.fetch_prices import fetch_daily_prices  # noqa: E402
+from src.patterns.runs import detect_price_runs  # noqa: E402
+from src.explain.explain_run import explain_single_run  # noqa: E402
 
 
 def main() -> None:
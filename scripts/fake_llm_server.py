@@ -0,0 +1,244 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+
+
+class FakeChatCompletionsServer(ThreadingHTTPServer):
+    """
+    Local stand-in for an OpenAI-compatible chat-completions endpoint.
+
+    Each request sleeps for latency_ms (plus up to jitter_ms), then fails with
+    error_status at error_rate probability or returns a deterministic completion that
+    echoes a digest of the user prompt, so callers can check result ordering.
+    JSON-mode requests for a batch of runs get {"explanations": {run_id: text}}; with
+    probability bad_json_rate one entry is dropped or the body is not JSON at all.
+    stream=True requests get the completion as server-sent events, one word every stream_chunk_ms.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: Tuple[str, int],
+        latency_ms: float = 200.0,
+        jitter_ms: float = 100.0,
+        error_rate: float = 0.0,
+        error_status: int = 429,
+        retry_after: Optional[float] = None,
+        quota_exhausted: bool = False,
+        bad_json_rate: float = 0.0,
+        stream_chunk_ms: float = 20.0,
+        seed: int = 0,
+    ) -> None:
+        super().__init__(address, _ChatCompletionsHandler)
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.retry_after = retry_after
+        self.quota_exhausted = quota_exhausted
+        self.bad_json_rate = bad_json_rate
+        self.stream_chunk_ms = stream_chunk_ms
+        self.stats: Dict[str, int] = {
+            "requests": 0,
+            "errors": 0,
+            "completions": 0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+        }
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def draw(self) -> Tuple[float, bool]:
+        """Return (delay seconds, should_fail) for the next request under a lock."""
+        with self._lock:
+            self.stats["requests"] += 1
+            delay = (self.latency_ms + self._rng.random() * self.jitter_ms) / 1000.0
+            fail = self.quota_exhausted or self._rng.random() < self.error_rate
+            self.stats["errors" if fail else "completions"] += 1
+        return delay, fail
+
+    def record_usage(self, prompt_tokens: int, completion_tokens: int) -> None:
+        with self._lock:
+            self.stats["prompt_tokens"] += prompt_tokens
+            self.stats["completion_tokens"] += completion_tokens
+
+    def draw_bad_json(self) -> Optional[str]:
+        """None for a well-formed batch reply, else "drop" or "garbage"."""
+        with self._lock:
+            if self._rng.random() >= self.bad_json_rate:
+                return None
+            return self._rng.choice(("drop", "garbage"))
+
+
+_BATCH_IDS = re.compile(r"run_id keys: ([0-9, ]+)\.")
+
+
+def fake_completion_text(prompt: str) -> str:
+    """Deterministic completion text the fake server returns for a user prompt."""
+    digest = hashlib.sha1(prompt.encode("utf-8")).hexdigest()[:12]
+    return f"During this period the stock experienced a historical move (fake completion {digest})."
+
+
+class _ChatCompletionsHandler(BaseHTTPRequestHandler):
+    server: FakeChatCompletionsServer
+
+    def do_POST(self) -> None:  # noqa: N802 - http.server naming
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self._send_json(404, {"error": {"message": f"Unknown path {self.path}", "type": "invalid_request_error"}})
+            return
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length) or b"{}")
+
+        delay, fail = self.server.draw()
+        time.sleep(delay)
+
+        if fail:
+            self._send_error()
+            return
+
+        messages = body.get("messages", [])
+        prompt = next((m.get("content", "") for m in reversed(messages) if m.get("role") == "user"), "")
+        if (body.get("response_format") or {}).get("type") == "json_object":
+            text = self._batch_reply(prompt)
+        else:
+            text = fake_completion_text(prompt)
+        prompt_tokens = sum(len(str(m.get("content", ""))) for m in messages) // 4
+        completion_tokens = len(text) // 4
+        self.server.record_usage(prompt_tokens, completion_tokens)
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+        if body.get("stream"):
+            include_usage = bool((body.get("stream_options") or {}).get("include_usage"))
+            self._send_stream(body.get("model", "fake-model"), text, usage if include_usage else None)
+            return
+        self._send_json(
+            200,
+            {
+                "id": "chatcmpl-fake",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": body.get("model", "fake-model"),
+                "choices": [
+                    {"index": 0, "message": {"role": "assistant", "content": text}, "finish_reason": "stop"}
+                ],
+                "usage": usage,
+            },
+        )
+
+    def _send_stream(self, model: str, text: str, usage: Optional[Dict[str, int]]) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+
+        def _event(choices: list, extra: Optional[Dict] = None) -> None:
+            payload = {"id": "chatcmpl-fake", "object": "chat.completion.chunk", "created": int(time.time()),
+                       "model": model, "choices": choices, **(extra or {})}
+            self.wfile.write(f"data: {json.dumps(payload)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+
+        _event([{"index": 0, "delta": {"role": "assistant", "content": ""}, "finish_reason": None}])
+        for word in re.findall(r"\S+\s*", text):
+            time.sleep(self.server.stream_chunk_ms / 1000.0)
+            _event([{"index": 0, "delta": {"content": word}, "finish_reason": None}])
+        _event([{"index": 0, "delta": {}, "finish_reason": "stop"}])
+        if usage is not None:
+            _event([], {"usage": usage})
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.wfile.flush()
+
+    def _batch_reply(self, prompt: str) -> str:
+        match = _BATCH_IDS.search(prompt)
+        run_ids = [r.strip() for r in match.group(1).split(",")] if match else []
+        entries = {run_id: fake_completion_text(f"{prompt}#{run_id}") for run_id in run_ids}
+        fault = self.server.draw_bad_json()
+        if fault == "garbage":
+            return "Sorry, here are the summaries: " + " ".join(entries.values())
+        if fault == "drop" and entries:
+            entries.pop(run_ids[-1])
+        return json.dumps({"explanations": entries})
+
+    def _send_error(self) -> None:
+        if self.server.quota_exhausted:
+            status, code = 429, "insufficient_quota"
+        else:
+            status = self.server.error_status
+            code = "rate_limit_exceeded" if status == 429 else "server_error"
+        headers = {}
+        if status == 429 and self.server.retry_after is not None:
+            headers["Retry-After"] = str(self.server.retry_after)
+        self._send_json(status, {"error": {"message": f"Injected {code}", "type": code, "code": code}}, headers)
+
+    def _send_json(self, status: int, payload: Dict, headers: Optional[Dict[str, str]] = None) -> None:
+        data = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args) -> None:  # noqa: A002 - http.server signature
+        return None
+
+
+def start_fake_llm_server(port: int = 0, **options) -> FakeChatCompletionsServer:
+    """Start the fake server on a background thread and return it; call .shutdown() when done."""
+    server = FakeChatCompletionsServer(("127.0.0.1", port), **options)
+    threading.Thread(target=server.serve_forever, name="fake-llm-server", daemon=True).start()
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Run a fake OpenAI chat-completions server for local testing.")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency-ms", type=float, default=200.0)
+    parser.add_argument("--jitter-ms", type=float, default=100.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probability of an injected error per request")
+    parser.add_argument("--error-status", type=int, default=429, help="HTTP status used for injected errors")
+    parser.add_argument("--retry-after", type=float, default=None, help="Retry-After seconds sent with 429s")
+    parser.add_argument("--quota-exhausted", action="store_true", help="Answer every request with insufficient_quota")
+    parser.add_argument("--stream-chunk-ms", type=float, default=20.0, help="Delay between streamed words")
+    parser.add_argument("--bad-json-rate", type=float, default=0.0, help="Chance a batch reply is unusable")
+    args = parser.parse_args()
+
+    server = FakeChatCompletionsServer(
+        ("127.0.0.1", args.port),
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        retry_after=args.retry_after,
+        quota_exhausted=args.quota_exhausted,
+        bad_json_rate=args.bad_json_rate,
+        stream_chunk_ms=args.stream_chunk_ms,
+    )
+    print(f"Fake chat-completions server listening; set OPENAI_BASE_URL={server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
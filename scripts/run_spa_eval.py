@@ -2,7 +2,10 @@ from __future__ import annotations
 
 import argparse
 import json
+import os
 import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
 from typing import Dict, List
 
@@ -13,9 +16,14 @@ ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
+from src.cache import fingerprint  # noqa: E402
+from src.catalog.run_catalog import RunCatalog  # noqa: E402
 from src.report.charts import plot_price_with_runs, plot_price_with_runs_and_events  # noqa: E402
 from src.ui.spa_runner import run_spa_for_single_ticker  # noqa: E402
-from src.config_spa import SPA_MAX_EXPLAINED_RUNS_DEFAULT  # noqa: E402
+from src.config_spa import SPA_MAX_EVENTS_PER_RUN_DEFAULT, SPA_MAX_EXPLAINED_RUNS_DEFAULT  # noqa: E402
+
+
+MANIFEST_FILENAME = "_manifest.json"
 
 
 def run_spa_evaluation(
@@ -25,76 +33,243 @@ def run_spa_evaluation(
     output_root: str = "artifacts/eval",
     window_days: int = 2,
     max_news_items: int = 50,
+    max_events_per_run: int = SPA_MAX_EVENTS_PER_RUN_DEFAULT,
     generate_charts: bool = True,
     generate_explanations: bool = False,
     max_explained_runs: int = 3,
-) -> None:
+    workers: int = 1,
+    resume: bool = True,
+    catalog_path: str | None = None,
+) -> Dict[str, Dict]:
     """
     Run the SPA pipeline for multiple tickers and save artifacts for analysis.
 
     This is the evaluation harness referenced in the SPA abstract for AAPL, NVDA, SCHW, and PGR.
+    With workers > 1 tickers are evaluated in a process pool. Completed tickers are recorded in
+    a manifest keyed by a hash of their inputs, so reruns skip finished work and resume after a
+    crash. Returns the per-ticker status and timings.
     """
     output_root_path = Path(output_root)
     output_root_path.mkdir(parents=True, exist_ok=True)
+    manifest_path = output_root_path / MANIFEST_FILENAME
+    manifest = _read_manifest(manifest_path) if resume else {}
+
+    settings = {
+        "start": start,
+        "end": end,
+        "output_root": str(output_root_path),
+        "window_days": window_days,
+        "max_news_items": max_news_items,
+        "max_events_per_run": max_events_per_run,
+        "generate_charts": generate_charts,
+        "generate_explanations": generate_explanations,
+        "max_explained_runs": max_explained_runs,
+    }
+    inputs_settings = dict(settings)
+    settings["catalog_path"] = catalog_path
+
+    pending: List[str] = []
+    input_hashes: Dict[str, str] = {}
+    skipped_runs: Dict[str, pd.DataFrame] = {}
+    for ticker in dict.fromkeys(t.upper() for t in tickers):
+        input_hashes[ticker] = fingerprint(ticker, inputs_settings)
+        entry = manifest.get(ticker, {})
+        saved_runs = _read_saved_runs(output_root_path / ticker) if catalog_path else None
+        if (
+            entry.get("status") == "completed"
+            and entry.get("inputs_hash") == input_hashes[ticker]
+            and (not catalog_path or saved_runs is not None)
+        ):
+            print(f"[SPA] Skipping {ticker}: already completed with identical inputs.")
+            if saved_runs is not None:
+                skipped_runs[ticker] = saved_runs
+            continue
+        pending.append(ticker)
+
+    # The catalog is not part of the inputs hash, so a resumed run still loads skipped tickers' saved runs.
+    if skipped_runs:
+        RunCatalog(catalog_path).ingest_many(skipped_runs)
+
+    reports: Dict[str, Dict] = {}
+
+    def _record(report: Dict) -> None:
+        ticker_upper = report["ticker"]
+        report["inputs_hash"] = input_hashes[ticker_upper]
+        reports[ticker_upper] = report
+        manifest[ticker_upper] = report
+        _write_manifest(manifest_path, manifest)
+
+    if workers <= 1 or len(pending) <= 1:
+        for ticker_upper in pending:
+            _record(_evaluate_ticker_safely(ticker_upper, settings))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(_evaluate_ticker_safely, t, settings): t for t in pending}
+            for future in as_completed(futures):
+                _record(future.result())
+
+    _print_timings(reports)
+    return reports
+
+
+def _evaluate_ticker_safely(ticker_upper: str, settings: Dict) -> Dict:
+    """Evaluate one ticker, converting unexpected exceptions into a failed report."""
+    t0 = time.perf_counter()
+    try:
+        return _evaluate_ticker(ticker_upper, settings)
+    except Exception as exc:
+        print(f"[SPA] Warning: evaluation of {ticker_upper} failed: {exc}")
+        return {
+            "ticker": ticker_upper,
+            "status": "failed",
+            "error": str(exc),
+            "timings": {"total_s": round(time.perf_counter() - t0, 3)},
+        }
+
+
+def _evaluate_ticker(ticker_upper: str, settings: Dict) -> Dict:
+    """Run the pipeline for one ticker and write its artifacts; safe to call from a worker process."""
+    t0 = time.perf_counter()
+    timings: Dict[str, float] = {}
+    start = settings["start"]
+    end = settings["end"]
+    generate_explanations = settings["generate_explanations"]
+
+    ticker_dir = Path(settings["output_root"]) / ticker_upper
+    ticker_dir.mkdir(parents=True, exist_ok=True)
+    print(f"[SPA] Evaluating {ticker_upper} from {start} to {end}...")
+
+    result = run_spa_for_single_ticker(
+        ticker=ticker_upper,
+        start=start,
+        end=end,
+        window_days=settings["window_days"],
+        max_news_items=settings["max_news_items"],
+        max_events_per_run=settings["max_events_per_run"],
+        fetch_events=True,
+        generate_explanations=generate_explanations,
+        max_explained_runs=settings["max_explained_runs"],
+    )
+    timings["pipeline_s"] = time.perf_counter() - t0
+
+    if result.get("error"):
+        print(f"[SPA] Warning: {result['error']}")
+        timings["total_s"] = time.perf_counter() - t0
+        return {
+            "ticker": ticker_upper,
+            "status": "failed",
+            "error": result["error"],
+            "timings": _rounded(timings),
+            "stages": result.get("stages"),
+        }
+
+    prices = result.get("prices")
+    prices = prices if prices is not None else pd.DataFrame()
+    runs_df = result.get("runs")
+    runs_df = runs_df if runs_df is not None else pd.DataFrame()
+    events = result.get("events") or []
+    correlations = result.get("correlations") or {}
+    explanations = result.get("explanations") or []
+
+    t_write = time.perf_counter()
+    _write_runs(runs_df, ticker_dir)
+    if settings.get("catalog_path"):
+        RunCatalog(settings["catalog_path"]).ingest(ticker_upper, runs_df)
+    _write_events(events, ticker_dir)
+    _write_correlations(correlations, ticker_dir)
+    timings["write_s"] = time.perf_counter() - t_write
+
+    if settings["generate_charts"] and not prices.empty:
+        t_charts = time.perf_counter()
+        try:
+            plot_price_with_runs(prices, runs_df, output_path=ticker_dir / "price_with_runs.png")
+            plot_price_with_runs_and_events(
+                prices,
+                runs_df,
+                correlations,
+                output_path=ticker_dir / "price_with_runs_and_events.png",
+            )
+        except Exception as exc:
+            print(f"[SPA] Warning: failed to generate charts for {ticker_upper}: {exc}")
+        timings["charts_s"] = time.perf_counter() - t_charts
+
+    if generate_explanations and explanations:
+        try:
+            _write_explanations_md(
+                explanations=explanations,
+                ticker=ticker_upper,
+                start=start,
+                end=end,
+                output_path=ticker_dir / "explanations.md",
+            )
+        except Exception as exc:
+            print(f"[SPA] Warning: failed to write explanations for {ticker_upper}: {exc}")
+    if result.get("explanation_error"):
+        print(f"[SPA] Warning: {result['explanation_error']}")
+
+    timings["total_s"] = time.perf_counter() - t0
+    print(f"[SPA] Completed {ticker_upper}. Artifacts in {ticker_dir}")
+    return {
+        "ticker": ticker_upper,
+        "status": "completed",
+        "error": None,
+        "timings": _rounded(timings),
+        "stages": result.get("stages"),
+    }
+
+
+def _rounded(timings: Dict[str, float]) -> Dict[str, float]:
+    return {name: round(seconds, 3) for name, seconds in timings.items()}
+
 
-    for ticker in tickers:
-        ticker_upper = ticker.upper()
-        ticker_dir = output_root_path / ticker_upper
-        ticker_dir.mkdir(parents=True, exist_ok=True)
-        print(f"[SPA] Evaluating {ticker_upper} from {start} to {end}...")
-
-        result = run_spa_for_single_ticker(
-            ticker=ticker_upper,
-            start=start,
-            end=end,
-            window_days=window_days,
-            max_news_items=max_news_items,
-            fetch_events=True,
-            generate_explanations=generate_explanations,
-            max_explained_runs=max_explained_runs,
+def _read_manifest(manifest_path: Path) -> Dict[str, Dict]:
+    """Load the completion manifest, treating a missing or corrupt file as empty."""
+    try:
+        return json.loads(manifest_path.read_text())
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _write_manifest(manifest_path: Path, manifest: Dict[str, Dict]) -> None:
+    """Atomically rewrite the manifest so an interrupted run never leaves it half-written."""
+    tmp_path = manifest_path.with_suffix(".tmp")
+    tmp_path.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+    os.replace(tmp_path, manifest_path)
+
+
+def _print_timings(reports: Dict[str, Dict]) -> None:
+    """Print a per-ticker timing table for this invocation."""
+    if not reports:
+        print("[SPA] Nothing to evaluate; all tickers are up to date.")
+        return
+    print("[SPA] Per-ticker timings (seconds):")
+    print(f"  {'ticker':<8} {'status':<10} {'pipeline':>9} {'write':>7} {'charts':>7} {'total':>7}")
+    for ticker_upper in sorted(reports):
+        report = reports[ticker_upper]
+        timings = report.get("timings", {})
+        print(
+            f"  {ticker_upper:<8} {report['status']:<10} "
+            f"{_fmt_seconds(timings.get('pipeline_s')):>9} {_fmt_seconds(timings.get('write_s')):>7} "
+            f"{_fmt_seconds(timings.get('charts_s')):>7} {_fmt_seconds(timings.get('total_s')):>7}"
         )
 
-        if result.get("error"):
-            print(f"[SPA] Warning: {result['error']}")
-            continue
 
-        prices: pd.DataFrame = result.get("prices") or pd.DataFrame()
-        runs_df: pd.DataFrame = result.get("runs") or pd.DataFrame()
-        events = result.get("events") or []
-        correlations = result.get("correlations") or {}
-        explanations = result.get("explanations") or []
-
-        _write_runs(runs_df, ticker_dir)
-        _write_events(events, ticker_dir)
-        _write_correlations(correlations, ticker_dir)
-
-        if generate_charts and not prices.empty:
-            try:
-                plot_price_with_runs(prices, runs_df, output_path=ticker_dir / "price_with_runs.png")
-                plot_price_with_runs_and_events(
-                    prices,
-                    runs_df,
-                    correlations,
-                    output_path=ticker_dir / "price_with_runs_and_events.png",
-                )
-            except Exception as exc:
-                print(f"[SPA] Warning: failed to generate charts for {ticker_upper}: {exc}")
-
-        if generate_explanations and explanations:
-            try:
-                _write_explanations_md(
-                    explanations=explanations,
-                    ticker=ticker_upper,
-                    start=start,
-                    end=end,
-                    output_path=ticker_dir / "explanations.md",
-                )
-            except Exception as exc:
-                print(f"[SPA] Warning: failed to write explanations for {ticker_upper}: {exc}")
-        if result.get("explanation_error"):
-            print(f"[SPA] Warning: {result['explanation_error']}")
-
-        print(f"[SPA] Completed {ticker_upper}. Artifacts in {ticker_dir}")
+def _fmt_seconds(value: float | None) -> str:
+    return f"{value:.2f}" if value is not None else "-"
+
+
+def _read_saved_runs(ticker_dir: Path) -> pd.DataFrame | None:
+    """Load the runs a previous evaluation wrote for one ticker, or None if there are none."""
+    parquet_path = ticker_dir / "runs.parquet"
+    csv_path = ticker_dir / "runs.csv"
+    try:
+        if parquet_path.exists():
+            return pd.read_parquet(parquet_path)
+        if csv_path.exists():
+            return pd.read_csv(csv_path)
+    except Exception as exc:
+        print(f"[SPA] Warning: could not read saved runs in {ticker_dir}: {exc}")
+    return None
 
 
 def _write_runs(runs_df: pd.DataFrame, ticker_dir: Path) -> None:
@@ -134,8 +309,13 @@ def _serialize_event(event: Dict, include_days: bool = False) -> Dict:
         "summary": event.get("summary"),
         "ticker": event.get("ticker"),
     }
+    if "duplicate_count" in event:
+        out["duplicate_count"] = event.get("duplicate_count")
+        out["sources"] = event.get("sources")
     if include_days:
         out["days_from_run_start"] = event.get("days_from_run_start")
+        if "relevance" in event:
+            out["relevance"] = event.get("relevance")
     return out
 
 
@@ -173,6 +353,10 @@ def _write_explanations_md(
             f"Duration: {entry.get('duration_bars')} bars | Pct change: {entry.get('pct_change')} | "
             f"Max drawdown: {entry.get('max_drawdown_pct')}"
         )
+        usage = entry.get("token_usage")
+        if usage:
+            cached = " (cached)" if usage.get("cached") else ""
+            lines.append(f"- Tokens: {usage.get('input_tokens')} in / {usage.get('output_tokens')} out{cached}")
         expl = entry.get("explanation") or "(No explanation generated)"
         lines.append("")
         lines.append(expl)
@@ -189,6 +373,12 @@ if __name__ == "__main__":
     parser.add_argument("--output-root", default="artifacts/eval")
     parser.add_argument("--window-days", type=int, default=2)
     parser.add_argument("--max-news-items", type=int, default=50)
+    parser.add_argument(
+        "--max-events-per-run",
+        type=int,
+        default=SPA_MAX_EVENTS_PER_RUN_DEFAULT,
+        help="Most relevant events kept per run (default 0 keeps every event in the window, nearest first)",
+    )
     parser.add_argument("--no-charts", action="store_true", help="Skip chart generation")
     parser.add_argument("--with-explanations", action="store_true", help="Generate LLM-based historical explanations")
     parser.add_argument(
@@ -197,6 +387,9 @@ if __name__ == "__main__":
         default=SPA_MAX_EXPLAINED_RUNS_DEFAULT,
         help=f"Requested runs per ticker to explain (effective cap: {SPA_MAX_EXPLAINED_RUNS_DEFAULT})",
     )
+    parser.add_argument("--workers", type=int, default=1, help="Number of worker processes")
+    parser.add_argument("--no-resume", action="store_true", help="Ignore the manifest and re-evaluate every ticker")
+    parser.add_argument("--catalog", default=None, help="SQLite run catalog to update with each ticker's runs")
     args = parser.parse_args()
 
     run_spa_evaluation(
@@ -206,7 +399,11 @@ if __name__ == "__main__":
         output_root=args.output_root,
         window_days=args.window_days,
         max_news_items=args.max_news_items,
+        max_events_per_run=args.max_events_per_run,
         generate_charts=not args.no_charts,
         generate_explanations=args.with_explanations,
         max_explained_runs=args.max_explained_runs,
+        workers=args.workers,
+        resume=not args.no_resume,
+        catalog_path=args.catalog,
     )
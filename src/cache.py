@@ -0,0 +1,279 @@
+from __future__ import annotations
+
+import copy
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Callable, Iterator, List, Optional, Protocol, Tuple, TypeVar
+
+import numpy as np
+import pandas as pd
+
+from src.config_spa import (
+    SPA_CACHE_BACKEND_DEFAULT,
+    SPA_CACHE_DIR_DEFAULT,
+    SPA_CACHE_MAX_ENTRIES_DEFAULT,
+)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+_MISSING = object()
+
+_tracking = threading.local()
+
+
+class CacheBackend(Protocol):
+    """Key/value store used by `cached`; keys are hex fingerprints."""
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Return (hit, value); value is meaningless on a miss."""
+        ...
+
+    def set(self, key: str, value: Any) -> None:
+        ...
+
+    def clear(self) -> None:
+        ...
+
+
+class NullCache:
+    """Backend that never stores anything, for callers that want every call recomputed."""
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        return False, None
+
+    def set(self, key: str, value: Any) -> None:
+        return None
+
+    def clear(self) -> None:
+        return None
+
+
+class MemoryLRUCache:
+    """
+    In-process LRU backend bounded by entry count; values are copied on the way in and out.
+
+    Safe to share between threads (Streamlit sessions, worker threads): the entry
+    order is only touched under a lock, while the copies are made outside it.
+    """
+
+    def __init__(self, max_entries: int = SPA_CACHE_MAX_ENTRIES_DEFAULT) -> None:
+        self.max_entries = max(1, int(max_entries))
+        self._entries: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        with self._lock:
+            value = self._entries.get(key, _MISSING)
+            if value is _MISSING:
+                return False, None
+            self._entries.move_to_end(key)
+        return True, copy.deepcopy(value)
+
+    def set(self, key: str, value: Any) -> None:
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class DiskCache:
+    """Pickle-per-entry backend that survives restarts; oldest files are evicted past max_entries."""
+
+    def __init__(self, root: str | Path = SPA_CACHE_DIR_DEFAULT, max_entries: int = SPA_CACHE_MAX_ENTRIES_DEFAULT) -> None:
+        self.root = Path(root)
+        self.max_entries = max(1, int(max_entries))
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        path = self.root / f"{key}.pkl"
+        try:
+            with path.open("rb") as handle:
+                value = pickle.load(handle)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return False, None
+        os.utime(path)
+        return True, value
+
+    def set(self, key: str, value: Any) -> None:
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self.root / f"{key}.pkl"
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        with tmp_path.open("wb") as handle:
+            pickle.dump(value, handle, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+        self._evict()
+
+    def clear(self) -> None:
+        for path in self.root.glob("*.pkl"):
+            path.unlink(missing_ok=True)
+
+    def _evict(self) -> None:
+        entries = sorted(self.root.glob("*.pkl"), key=lambda p: p.stat().st_mtime)
+        for path in entries[: max(0, len(entries) - self.max_entries)]:
+            path.unlink(missing_ok=True)
+
+
+_backend: Optional[CacheBackend] = None
+
+
+def get_cache_backend() -> CacheBackend:
+    """Return the process-wide backend, building it from SPA_CACHE_* settings on first use."""
+    global _backend
+
+    if _backend is None:
+        _backend = make_cache_backend(SPA_CACHE_BACKEND_DEFAULT)
+    return _backend
+
+
+def set_cache_backend(backend: CacheBackend) -> None:
+    """Install the backend used by every `cached` function (e.g. from an app entry point)."""
+    global _backend
+
+    _backend = backend
+
+
+def make_cache_backend(kind: str) -> CacheBackend:
+    """Build a backend by name: 'memory', 'disk', or 'none'."""
+    kind = (kind or "memory").lower()
+    if kind == "memory":
+        return MemoryLRUCache(SPA_CACHE_MAX_ENTRIES_DEFAULT)
+    if kind == "disk":
+        return DiskCache(SPA_CACHE_DIR_DEFAULT, SPA_CACHE_MAX_ENTRIES_DEFAULT)
+    if kind == "none":
+        return NullCache()
+    raise ValueError(f"Unknown cache backend '{kind}'; expected 'memory', 'disk', or 'none'.")
+
+
+def cached(namespace: str) -> Callable[[F], F]:
+    """Memoize a function in the active backend, keyed by a fingerprint of its bound arguments."""
+
+    def decorator(func: F) -> F:
+        signature = inspect.signature(func)
+        qualified = f"{namespace}:{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = fingerprint(qualified, tuple(bound.arguments.items()))
+
+            backend = get_cache_backend()
+            hit, value = backend.get(key)
+            for tracker in getattr(_tracking, "stack", ()):
+                tracker.record(hit)
+            if hit:
+                return value
+            value = func(*args, **kwargs)
+            backend.set(key, value)
+            return value
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorator
+
+
+@dataclass
+class CachedCallTracker:
+    """Hits and misses of the `cached` calls made inside a track_cached_calls block."""
+
+    hits: int = 0
+    misses: int = 0
+
+    def record(self, hit: bool) -> None:
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+
+    @property
+    def all_hits(self) -> bool:
+        """True when at least one cached call was made and every one was served from the cache."""
+        return self.hits > 0 and self.misses == 0
+
+
+@contextmanager
+def track_cached_calls() -> Iterator[CachedCallTracker]:
+    """Count the `cached` calls this thread makes inside the block (nested blocks all count them)."""
+    stack: List[CachedCallTracker] = _tracking.__dict__.setdefault("stack", [])
+    tracker = CachedCallTracker()
+    stack.append(tracker)
+    try:
+        yield tracker
+    finally:
+        stack.remove(tracker)
+
+
+def fingerprint(*values: Any) -> str:
+    """Return a stable hex digest for arguments without pickling or hashing them row by row."""
+    hasher = hashlib.blake2b(digest_size=16)
+    for value in values:
+        _feed(hasher, value)
+    return hasher.hexdigest()
+
+
+def _feed(hasher: "hashlib._Hash", value: Any) -> None:
+    """Update the hasher with a type-tagged, order-sensitive encoding of value."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        hasher.update(f"{type(value).__name__}:{value!r};".encode())
+    elif isinstance(value, (pd.Timestamp, datetime, date)):
+        hasher.update(f"ts:{pd.Timestamp(value).isoformat()};".encode())
+    elif isinstance(value, pd.DataFrame):
+        hasher.update(f"df:{value.shape};".encode())
+        _feed(hasher, list(map(str, value.columns)))
+        _feed_index(hasher, value.index)
+        for _, column in value.items():
+            _feed_array(hasher, column.to_numpy())
+    elif isinstance(value, pd.Series):
+        hasher.update(f"series:{value.name!r};".encode())
+        _feed_index(hasher, value.index)
+        _feed_array(hasher, value.to_numpy())
+    elif isinstance(value, np.ndarray):
+        _feed_array(hasher, value)
+    elif isinstance(value, (list, tuple)):
+        hasher.update(f"{type(value).__name__}[{len(value)}];".encode())
+        for item in value:
+            _feed(hasher, item)
+    elif isinstance(value, dict):
+        hasher.update(f"dict[{len(value)}];".encode())
+        for item_key in sorted(value, key=repr):
+            _feed(hasher, item_key)
+            _feed(hasher, value[item_key])
+    else:
+        hasher.update(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def _feed_index(hasher: "hashlib._Hash", index: pd.Index) -> None:
+    if isinstance(index, pd.DatetimeIndex):
+        hasher.update(f"dtindex:{index.tz};".encode())
+        _feed_array(hasher, index.asi8)
+    else:
+        _feed_array(hasher, index.to_numpy())
+
+
+def _feed_array(hasher: "hashlib._Hash", array: np.ndarray) -> None:
+    hasher.update(f"arr:{array.dtype.str}:{array.shape};".encode())
+    if array.dtype.kind in "biufcmM":
+        hasher.update(np.ascontiguousarray(array).tobytes())
+        return
+    try:
+        hasher.update(pd.util.hash_array(array.ravel().astype(object)).tobytes())
+    except TypeError:
+        for item in array.ravel():
+            _feed(hasher, item)
@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import sqlite3
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.config_spa import SPA_RUN_CATALOG_PATH_DEFAULT
+
+_TS_FORMAT = "%Y-%m-%dT%H:%M:%S"
+
+_TABLES = """
+CREATE TABLE IF NOT EXISTS runs (
+    ticker TEXT NOT NULL,
+    run_id INTEGER NOT NULL,
+    direction TEXT NOT NULL,
+    start TEXT NOT NULL,
+    "end" TEXT NOT NULL,
+    duration_bars INTEGER NOT NULL,
+    pct_change REAL,
+    max_drawdown_pct REAL,
+    PRIMARY KEY (ticker, run_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS ingests (
+    ticker TEXT PRIMARY KEY,
+    run_count INTEGER NOT NULL,
+    ingested_at REAL NOT NULL
+);
+"""
+
+# The direction index covers every filter column so the common screen is index-only.
+_INDEXES: Dict[str, str] = {
+    "idx_runs_start": "runs (start)",
+    "idx_runs_end": 'runs ("end")',
+    "idx_runs_direction_pct": 'runs (direction, pct_change, duration_bars, start, "end", max_drawdown_pct)',
+    "idx_runs_pct_change": "runs (pct_change)",
+    "idx_runs_duration": "runs (duration_bars)",
+}
+
+# Batches larger than this drop and rebuild the secondary indexes instead of updating them row by row.
+_BULK_REBUILD_ROWS = 100_000
+
+_COLUMNS = ("ticker", "run_id", "direction", "start", "end", "duration_bars", "pct_change", "max_drawdown_pct")
+
+
+class RunCatalog:
+    """
+    Indexed SQLite catalog of detected runs across the whole universe.
+
+    Runs are keyed by (ticker, run_id) with secondary indexes on start/end date,
+    direction + pct_change, pct_change and duration_bars, so cross-ticker filters are
+    answered from indexes instead of loading per-ticker files. Ingesting a ticker
+    replaces only that ticker's rows.
+    """
+
+    def __init__(self, path: str | Path = SPA_RUN_CATALOG_PATH_DEFAULT) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.executescript(_TABLES)
+            _create_indexes(conn)
+
+    def ingest(self, ticker: str, runs_df: pd.DataFrame) -> int:
+        """Replace one ticker's runs; returns the number of rows written."""
+        return self.ingest_many({ticker: runs_df})[ticker.upper()]
+
+    def ingest_many(self, runs_by_ticker: Dict[str, pd.DataFrame]) -> Dict[str, int]:
+        """Replace the runs of several tickers in a single transaction."""
+        rows_by_ticker = {t.upper(): list(_rows_for_ticker(t.upper(), df)) for t, df in runs_by_ticker.items()}
+        rebuild = sum(len(rows) for rows in rows_by_ticker.values()) > _BULK_REBUILD_ROWS
+        written: Dict[str, int] = {}
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            if rebuild:
+                for name in _INDEXES:
+                    conn.execute(f"DROP INDEX IF EXISTS {name}")
+            for ticker, rows in rows_by_ticker.items():
+                conn.execute("DELETE FROM runs WHERE ticker = ?", (ticker,))
+                conn.executemany(
+                    'INSERT INTO runs (ticker, run_id, direction, start, "end", duration_bars, pct_change, '
+                    "max_drawdown_pct) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+                conn.execute(
+                    "INSERT OR REPLACE INTO ingests (ticker, run_count, ingested_at) VALUES (?, ?, ?)",
+                    (ticker, len(rows), now),
+                )
+                written[ticker] = len(rows)
+            if rebuild:
+                _create_indexes(conn)
+        return written
+
+    def ingest_panel(self, runs_df: pd.DataFrame, ticker_col: str = "ticker") -> Dict[str, int]:
+        """Ingest a long runs table (e.g. from detect_price_runs_panel), replacing each ticker present."""
+        return self.ingest_many({str(t): g for t, g in runs_df.groupby(ticker_col, sort=False)})
+
+    def remove(self, ticker: str) -> None:
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM runs WHERE ticker = ?", (ticker.upper(),))
+            conn.execute("DELETE FROM ingests WHERE ticker = ?", (ticker.upper(),))
+
+    def tickers(self) -> List[str]:
+        with closing(self._connect()) as conn:
+            return [row[0] for row in conn.execute("SELECT ticker FROM ingests ORDER BY ticker")]
+
+    def query(
+        self,
+        tickers: Optional[Sequence[str]] = None,
+        direction: Optional[str] = None,
+        min_pct_change: Optional[float] = None,
+        max_pct_change: Optional[float] = None,
+        min_duration: Optional[int] = None,
+        max_duration: Optional[int] = None,
+        start_from: Optional[str | pd.Timestamp] = None,
+        end_to: Optional[str | pd.Timestamp] = None,
+        order_by: str = "pct_change",
+        descending: bool = True,
+        limit: Optional[int] = None,
+    ) -> pd.DataFrame:
+        """
+        Return runs matching every given filter.
+
+        start_from/end_to keep runs that start on/after and end on/before the given dates
+        (an end_to date without a time includes that whole day).
+        """
+        if order_by not in _COLUMNS:
+            raise ValueError(f"order_by must be one of {_COLUMNS}.")
+
+        clauses: List[str] = []
+        params: List[object] = []
+        if tickers:
+            upper = [t.upper() for t in tickers]
+            clauses.append(f"ticker IN ({', '.join('?' for _ in upper)})")
+            params.extend(upper)
+        if direction:
+            clauses.append("direction = ?")
+            params.append(direction.lower())
+        if min_pct_change is not None:
+            clauses.append("pct_change >= ?")
+            params.append(float(min_pct_change))
+        if max_pct_change is not None:
+            clauses.append("pct_change <= ?")
+            params.append(float(max_pct_change))
+        if min_duration is not None:
+            clauses.append("duration_bars >= ?")
+            params.append(int(min_duration))
+        if max_duration is not None:
+            clauses.append("duration_bars <= ?")
+            params.append(int(max_duration))
+        if start_from is not None:
+            clauses.append("start >= ?")
+            params.append(_format_ts(pd.Timestamp(start_from)))
+        if end_to is not None:
+            end_ts = pd.Timestamp(end_to)
+            if end_ts == end_ts.normalize():
+                end_ts = end_ts + pd.Timedelta(days=1) - pd.Timedelta(seconds=1)
+            clauses.append('"end" <= ?')
+            params.append(_format_ts(end_ts))
+
+        sql = f'SELECT {", ".join(_quoted(c) for c in _COLUMNS)} FROM runs'
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += f" ORDER BY {_quoted(order_by)} {'DESC' if descending else 'ASC'}, ticker, run_id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+
+        with closing(self._connect()) as conn:
+            rows = conn.execute(sql, params).fetchall()
+        result = pd.DataFrame(rows, columns=list(_COLUMNS))
+        result["start"] = pd.to_datetime(result["start"], format=_TS_FORMAT)
+        result["end"] = pd.to_datetime(result["end"], format=_TS_FORMAT)
+        return result
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30.0)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA cache_size=-262144")
+        return conn
+
+
+def _create_indexes(conn: sqlite3.Connection) -> None:
+    for name, target in _INDEXES.items():
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
+
+
+def _rows_for_ticker(ticker: str, runs_df: pd.DataFrame) -> Iterable[tuple]:
+    if runs_df is None or runs_df.empty:
+        return []
+    starts = _iso_seconds(runs_df["start"])
+    ends = _iso_seconds(runs_df["end"])
+    return zip(
+        [ticker] * len(runs_df),
+        runs_df["run_id"].astype(int).tolist(),
+        runs_df["direction"].astype(str).str.lower().tolist(),
+        starts,
+        ends,
+        runs_df["duration_bars"].astype(int).tolist(),
+        runs_df["pct_change"].astype(float).tolist(),
+        runs_df["max_drawdown_pct"].astype(float).tolist(),
+    )
+
+
+def _iso_seconds(values: pd.Series) -> List[str]:
+    """Format timestamps as fixed-width ISO strings (vectorized; sorts like the timestamps)."""
+    stamps = pd.DatetimeIndex(pd.to_datetime(values))
+    if stamps.tz is not None:
+        stamps = stamps.tz_localize(None)
+    return np.datetime_as_string(stamps.to_numpy().astype("datetime64[s]"), unit="s").tolist()
+
+
+def _format_ts(ts: pd.Timestamp) -> str:
+    if ts.tzinfo is not None:
+        ts = ts.tz_localize(None)
+    return ts.strftime(_TS_FORMAT)
+
+
+def _quoted(column: str) -> str:
+    return f'"{column}"'
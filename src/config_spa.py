@@ -24,3 +24,77 @@ SPA_MAX_EXPLANATION_TOKENS_DEFAULT: int = _int_env("SPA_MAX_EXPLANATION_TOKENS",
 
 # Optional override for LLM model used in SPA explanations.
 SPA_LLM_MODEL_DEFAULT: str | None = _str_env("SPA_LLM_MODEL", None)
+
+# Optional directory for the persistent on-disk price store (disabled when unset).
+SPA_PRICE_STORE_DIR_DEFAULT: str | None = _str_env("SPA_PRICE_STORE_DIR", None)
+
+# Optional directory of <TICKER>.csv/.parquet fixtures served instead of Yahoo Finance.
+SPA_PRICE_FIXTURE_DIR_DEFAULT: str | None = _str_env("SPA_PRICE_FIXTURE_DIR", None)
+
+# Cache backend for src-layer memoization: "memory" (LRU), "disk", or "none".
+SPA_CACHE_BACKEND_DEFAULT: str = _str_env("SPA_CACHE_BACKEND", "memory") or "memory"
+
+# Max entries kept by the memory/disk cache backends.
+SPA_CACHE_MAX_ENTRIES_DEFAULT: int = _int_env("SPA_CACHE_MAX_ENTRIES", 128)
+
+# Directory used by the disk cache backend.
+SPA_CACHE_DIR_DEFAULT: str = _str_env("SPA_CACHE_DIR", ".spa_cache") or ".spa_cache"
+
+# Explanation cache mode: "readwrite" (default), "cache_only" (never call the LLM), or "off".
+SPA_EXPLANATION_CACHE_MODE_DEFAULT: str = _str_env("SPA_EXPLANATION_CACHE_MODE", "readwrite") or "readwrite"
+
+# SQLite file backing the explanation cache.
+SPA_EXPLANATION_CACHE_PATH_DEFAULT: str = (
+    _str_env("SPA_EXPLANATION_CACHE_PATH", ".spa_cache/explanations.sqlite") or ".spa_cache/explanations.sqlite"
+)
+
+# Cached explanations older than this many seconds are treated as misses (default 30 days).
+SPA_EXPLANATION_CACHE_TTL_SECONDS_DEFAULT: int = _int_env("SPA_EXPLANATION_CACHE_TTL_SECONDS", 30 * 24 * 3600)
+
+# Max cached explanations; least recently used entries are evicted beyond this.
+SPA_EXPLANATION_CACHE_MAX_ENTRIES_DEFAULT: int = _int_env("SPA_EXPLANATION_CACHE_MAX_ENTRIES", 10_000)
+
+# Max explanation requests in flight at once.
+SPA_LLM_MAX_CONCURRENCY_DEFAULT: int = _int_env("SPA_LLM_MAX_CONCURRENCY", 4)
+
+# Client-side rate limits (0 disables the corresponding limit).
+SPA_LLM_REQUESTS_PER_MINUTE_DEFAULT: int = _int_env("SPA_LLM_REQUESTS_PER_MINUTE", 500)
+SPA_LLM_TOKENS_PER_MINUTE_DEFAULT: int = _int_env("SPA_LLM_TOKENS_PER_MINUTE", 200_000)
+
+# Retries for rate-limited (429) and server-error (5xx) responses, with jittered exponential backoff.
+SPA_LLM_MAX_RETRIES_DEFAULT: int = _int_env("SPA_LLM_MAX_RETRIES", 5)
+SPA_LLM_BACKOFF_BASE_MS_DEFAULT: int = _int_env("SPA_LLM_BACKOFF_BASE_MS", 500)
+SPA_LLM_BACKOFF_MAX_MS_DEFAULT: int = _int_env("SPA_LLM_BACKOFF_MAX_MS", 20_000)
+
+# SQLite file backing the universe-wide run catalog.
+SPA_RUN_CATALOG_PATH_DEFAULT: str = (
+    _str_env("SPA_RUN_CATALOG_PATH", "artifacts/run_catalog.sqlite") or "artifacts/run_catalog.sqlite"
+)
+
+# Points each run's price path is resampled to for shape-similarity search.
+SPA_SHAPE_POINTS_DEFAULT: int = _int_env("SPA_SHAPE_POINTS", 32)
+
+# Bars before a run used as its volume baseline (per-run volume z-score).
+SPA_VOLUME_BASELINE_BARS_DEFAULT: int = _int_env("SPA_VOLUME_BASELINE_BARS", 20)
+
+# Optional memory-mapped price directory served before the provider/store when it covers a window.
+SPA_PRICE_MMAP_DIR_DEFAULT: str | None = _str_env("SPA_PRICE_MMAP_DIR", None)
+
+# Optional directory of the indexed news store; unset serves the built-in sample headlines.
+SPA_NEWS_STORE_DIR_DEFAULT: str | None = _str_env("SPA_NEWS_STORE_DIR", None)
+
+# Headline similarity (percent Jaccard of word 1-2 grams) at which events are collapsed as duplicates.
+SPA_EVENT_DEDUP_SIMILARITY_PCT_DEFAULT: int = _int_env("SPA_EVENT_DEDUP_SIMILARITY_PCT", 80)
+
+# Optional ticker -> sector map (JSON object or CSV with ticker,sector) used to attach sector events.
+SPA_SECTOR_MAP_PATH_DEFAULT: str | None = _str_env("SPA_SECTOR_MAP_PATH", None)
+
+# Max correlated events kept per run, ranked by relevance; 0 keeps every event in the window, nearest first.
+SPA_MAX_EVENTS_PER_RUN_DEFAULT: int = _int_env("SPA_MAX_EVENTS_PER_RUN", 0)
+
+# Runs of one ticker explained per LLM request; above 1 a batch gets one JSON response keyed by run_id.
+# The default (1) keeps one plain-text request per run.
+SPA_EXPLANATION_BATCH_SIZE_DEFAULT: int = _int_env("SPA_EXPLANATION_BATCH_SIZE", 1)
+
+# Estimated input tokens allowed per explanation prompt; lower-ranked event lines are dropped to fit.
+SPA_MAX_PROMPT_TOKENS_DEFAULT: int = _int_env("SPA_MAX_PROMPT_TOKENS", 600)
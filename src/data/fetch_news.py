@@ -1,73 +1,64 @@
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import Dict, List
 
 import pandas as pd
-import streamlit as st
-
-# Deterministic sample headlines per ticker to avoid network dependencies.
-_SAMPLE_NEWS: Dict[str, List[Dict]] = {
-    "PGR": [
-        {"date": "2024-09-03", "headline": "Progressive announces monthly catastrophe loss estimate", "source": "Press release", "url": None, "summary": None},
-        {"date": "2024-09-12", "headline": "Analyst notes steady auto claims trends at Progressive", "source": "Analyst", "url": None, "summary": None},
-        {"date": "2024-09-24", "headline": "Progressive reports Q3 premium growth figures", "source": "Newswire", "url": None, "summary": None},
-    ],
-    "AAPL": [
-        {"date": "2024-09-10", "headline": "Apple unveils new iPhone lineup at fall event", "source": "Newswire", "url": None, "summary": None},
-        {"date": "2024-09-20", "headline": "Early reviews highlight camera upgrades", "source": "Blog", "url": None, "summary": None},
-    ],
-    "NVDA": [
-        {"date": "2024-09-05", "headline": "NVIDIA announces new data center GPU roadmap", "source": "Newswire", "url": None, "summary": None},
-        {"date": "2024-09-18", "headline": "Report: Cloud providers expand NVIDIA GPU orders", "source": "Analyst", "url": None, "summary": None},
-    ],
-    "SCHW": [
-        {"date": "2024-09-09", "headline": "Charles Schwab reports client asset flows for August", "source": "Press release", "url": None, "summary": None},
-        {"date": "2024-09-27", "headline": "Schwab completes platform migration milestone", "source": "Newswire", "url": None, "summary": None},
-    ],
-}
-
-
-@st.cache_data(show_spinner=False)
+
+from src.cache import cached
+from src.config_spa import SPA_NEWS_STORE_DIR_DEFAULT, SPA_SECTOR_MAP_PATH_DEFAULT
+from src.data.news_store import NewsIndex, NewsStore, SampleNewsProvider
+from src.events.fanout import load_sector_map, ticker_tags
+
+
+@cached("news")
 def fetch_news_for_ticker(ticker: str, start: str, end: str, max_items: int = 100) -> List[Dict]:
-    """Return deterministic public-news items for a ticker within [start, end]."""
+    """
+    Return public-news items for a ticker (or a tag such as "MARKET" or "SECTOR:ENERGY")
+    within [start, end], ordered by date then headline.
+
+    Items come from the indexed news store when SPA_NEWS_STORE_DIR is set, else from the
+    built-in sample headlines.
+    """
     start_ts = _parse_date(start)
     end_ts = _parse_date(end)
-    raw_items = _SAMPLE_NEWS.get(ticker.upper(), [])
-    return _standardize_news_items(raw_items, start_ts, end_ts, max_items, ticker=ticker.upper())
-
-
-def _standardize_news_items(
-    raw_items: List[Dict],
-    start_ts: pd.Timestamp,
-    end_ts: pd.Timestamp,
-    max_items: int,
-    ticker: str,
-) -> List[Dict]:
-    """Normalize, filter, and sort raw items to a stable schema."""
-    normalized: List[Dict] = []
-    for item in raw_items:
-        try:
-            event_ts = _parse_date(item.get("date"))
-        except Exception:
-            continue
-
-        if event_ts < start_ts or event_ts > end_ts:
-            continue
-
-        normalized.append(
-            {
-                "date": event_ts,
-                "headline": str(item.get("headline", "")).strip(),
-                "source": item.get("source"),
-                "url": item.get("url"),
-                "summary": item.get("summary"),
-                "ticker": ticker,
-            }
-        )
-
-    # Deterministic ordering: date ascending, then headline.
-    normalized.sort(key=lambda x: (x["date"], x["headline"]))
-    return normalized[:max_items]
+    if SPA_NEWS_STORE_DIR_DEFAULT:
+        return NewsStore(SPA_NEWS_STORE_DIR_DEFAULT).query(ticker, start_ts, end_ts, max_items)
+    return _sample_news_index().query(ticker, start_ts, end_ts, max_items)
+
+
+def fetch_events_for_ticker(ticker: str, start: str, end: str, max_items: int = 100) -> List[Dict]:
+    """
+    Ticker news plus market-wide and sector events (via SPA_SECTOR_MAP_PATH) within [start, end].
+
+    Each tag is fetched (and cached) once and shared by every ticker carrying it; max_items
+    applies per tag. An item stored under several of the ticker's tags is kept once, from
+    the most specific tag.
+
+    This is the per-ticker path used by the single-ticker pipeline and run_spa_eval, and the
+    returned list repeats the market and sector events for every ticker. Universe-wide
+    matching without that copy is src.events.fanout.match_universe, which is library API.
+    """
+    events: List[Dict] = []
+    seen = set()
+    for tag in ticker_tags(ticker, sector_map()):
+        for event in fetch_news_for_ticker(tag, start, end, max_items=max_items):
+            key = (event["date"], event["headline"], event.get("source"), event.get("url"))
+            if key not in seen:
+                seen.add(key)
+                events.append(event)
+    return events
+
+
+@lru_cache(maxsize=1)
+def sector_map() -> Dict[str, str]:
+    """The configured ticker -> sector map (empty when SPA_SECTOR_MAP_PATH is unset)."""
+    return load_sector_map(SPA_SECTOR_MAP_PATH_DEFAULT) if SPA_SECTOR_MAP_PATH_DEFAULT else {}
+
+
+@lru_cache(maxsize=1)
+def _sample_news_index() -> NewsIndex:
+    return NewsIndex.from_providers([SampleNewsProvider()])
 
 
 def _parse_date(value: str | pd.Timestamp) -> pd.Timestamp:
@@ -3,10 +3,73 @@ from __future__ import annotations
 from datetime import datetime
 import pandas as pd
 import yfinance as yf
-import streamlit as st
+
+from src.cache import cached
+from src.config_spa import (
+    SPA_PRICE_FIXTURE_DIR_DEFAULT,
+    SPA_PRICE_MMAP_DIR_DEFAULT,
+    SPA_PRICE_STORE_DIR_DEFAULT,
+)
+from src.data.mmap_store import MmapPriceStore
+from src.data.price_store import (
+    FixturePriceProvider,
+    PriceProvider,
+    PriceStore,
+    empty_price_frame,
+    validate_interval,
+)
+
+
+class YahooPriceProvider:
+    """Fetch OHLCV bars (daily by default, or an intraday interval) from Yahoo Finance via yfinance."""
+
+    def fetch(
+        self,
+        ticker: str,
+        start: pd.Timestamp,
+        end: pd.Timestamp,
+        auto_adjust: bool = True,
+        interval: str = "1d",
+    ) -> pd.DataFrame:
+        raw = yf.download(
+            tickers=ticker,
+            start=start.strftime("%Y-%m-%d"),
+            end=end.strftime("%Y-%m-%d"),
+            interval=interval,
+            auto_adjust=auto_adjust,
+            progress=False,
+            actions=False,
+        )
+
+        if raw.empty:
+            return empty_price_frame()
+
+        cleaned = (
+            raw.rename(
+                columns={
+                    "Open": "open",
+                    "High": "high",
+                    "Low": "low",
+                    "Close": "close",
+                    "Adj Close": "adj_close",
+                    "Volume": "volume",
+                }
+            )
+            [["open", "high", "low", "close", "volume"]]
+            .sort_index()
+        )
+
+        if isinstance(cleaned.columns, pd.MultiIndex):
+            cleaned.columns = cleaned.columns.get_level_values(0)
+
+        cleaned.index = pd.to_datetime(cleaned.index)
+        if cleaned.index.tz is not None:
+            # Intraday bars come exchange-localized; keep the exchange wall-clock time.
+            cleaned.index = cleaned.index.tz_localize(None)
+        cleaned.index.name = "date"
+        return cleaned
 
 
-@st.cache_data(show_spinner=False)
 def fetch_daily_prices(
     ticker: str,
     start: str,
@@ -14,6 +77,23 @@ def fetch_daily_prices(
     auto_adjust: bool = True,
 ) -> pd.DataFrame:
     """Fetch daily OHLCV data for the ticker between start and end."""
+    return fetch_prices(ticker, start, end, auto_adjust=auto_adjust, interval="1d")
+
+
+def fetch_prices(
+    ticker: str,
+    start: str,
+    end: str,
+    auto_adjust: bool = True,
+    interval: str = "1d",
+) -> pd.DataFrame:
+    """
+    Fetch OHLCV bars at the given interval (e.g. "1d", "5m", "1m") between start and end.
+
+    When SPA_PRICE_MMAP_DIR covers the window the bars are a read-only, zero-copy view of
+    the memory-mapped arrays; otherwise they come from the (cached) provider path.
+    """
+    validate_interval(interval)
     start_dt = _parse_date(start)
     end_dt = _parse_date(end)
 
@@ -22,44 +102,46 @@ def fetch_daily_prices(
             f"start ({start_dt.date()}) must be earlier than end ({end_dt.date()})."
         )
 
-    raw = yf.download(
-        tickers=ticker,
-        start=start_dt.strftime("%Y-%m-%d"),
-        end=end_dt.strftime("%Y-%m-%d"),
-        interval="1d",
-        auto_adjust=auto_adjust,
-        progress=False,
-        actions=False,
-    )
-
-    if raw.empty:
-        raise ValueError(
-            f"No price data returned for {ticker} between {start_dt.date()} and {end_dt.date()}."
+    if SPA_PRICE_MMAP_DIR_DEFAULT:
+        mapped = MmapPriceStore(SPA_PRICE_MMAP_DIR_DEFAULT).window(
+            ticker, start_dt, end_dt, auto_adjust=auto_adjust, interval=interval
         )
+        if mapped is not None and not mapped.empty:
+            return mapped
+    return _fetch_prices_from_provider(ticker, start_dt, end_dt, auto_adjust=auto_adjust, interval=interval)
 
-    cleaned = (
-        raw.rename(
-            columns={
-                "Open": "open",
-                "High": "high",
-                "Low": "low",
-                "Close": "close",
-                "Adj Close": "adj_close",
-                "Volume": "volume",
-            }
-        )
-        [["open", "high", "low", "close", "volume"]]
-        .sort_index()
-    )
 
-    if isinstance(cleaned.columns, pd.MultiIndex):
-        cleaned.columns = cleaned.columns.get_level_values(0)
+@cached("prices")
+def _fetch_prices_from_provider(
+    ticker: str,
+    start_dt: pd.Timestamp,
+    end_dt: pd.Timestamp,
+    auto_adjust: bool,
+    interval: str,
+) -> pd.DataFrame:
+    """Fetch bars through the Parquet store when configured, else straight from the provider."""
+    provider = default_price_provider()
+    if SPA_PRICE_STORE_DIR_DEFAULT:
+        cleaned = PriceStore(SPA_PRICE_STORE_DIR_DEFAULT, provider).get(
+            ticker, start_dt, end_dt, auto_adjust=auto_adjust, interval=interval
+        )
+    else:
+        cleaned = provider.fetch(ticker, start_dt, end_dt, auto_adjust=auto_adjust, interval=interval)
 
-    cleaned.index = pd.to_datetime(cleaned.index)
-    cleaned.index.name = "date"
+    if cleaned.empty:
+        raise ValueError(
+            f"No price data returned for {ticker} between {start_dt.date()} and {end_dt.date()}."
+        )
     return cleaned
 
 
+def default_price_provider() -> PriceProvider:
+    """Return the configured bar source: local fixtures when SPA_PRICE_FIXTURE_DIR is set, else Yahoo."""
+    if SPA_PRICE_FIXTURE_DIR_DEFAULT:
+        return FixturePriceProvider(SPA_PRICE_FIXTURE_DIR_DEFAULT)
+    return YahooPriceProvider()
+
+
 def _parse_date(value: str | datetime | pd.Timestamp) -> pd.Timestamp:
     """Parse input into a timezone-naive pandas Timestamp."""
     if isinstance(value, pd.Timestamp):
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import json
+import os
+import shutil
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.data.price_store import PRICE_COLUMNS, normalize_price_frame, validate_interval
+
+_META_FILE = "meta.json"
+# Same dtypes as the provider/Parquet path (volume included, so NaN volumes survive), so
+# downstream code sees one schema whichever path served the bars.
+_COLUMN_DTYPES: Dict[str, str] = {
+    "open": "float64",
+    "high": "float64",
+    "low": "float64",
+    "close": "float64",
+    "volume": "float64",
+}
+
+
+class MmapBars:
+    """
+    Read-only OHLCV columns over a sorted int64 (ns) date array, usually memory-mapped.
+
+    Slicing is a binary search on the dates plus array views, so windows cost no copies
+    and processes that open the same files share pages through the OS page cache.
+    """
+
+    def __init__(self, dates: np.ndarray, columns: Dict[str, np.ndarray]) -> None:
+        self.dates = dates
+        self.columns = columns
+
+    def __len__(self) -> int:
+        return int(self.dates.shape[0])
+
+    def between(
+        self,
+        start: pd.Timestamp | str | None = None,
+        end: pd.Timestamp | str | None = None,
+        end_inclusive: bool = True,
+    ) -> "MmapBars":
+        """Return a view of the bars in [start, end] (or [start, end) with end_inclusive=False)."""
+        lo = 0 if start is None else int(np.searchsorted(self.dates, _to_ns(start), side="left"))
+        if end is None:
+            hi = len(self)
+        else:
+            hi = int(np.searchsorted(self.dates, _to_ns(end), side="right" if end_inclusive else "left"))
+        return MmapBars(self.dates[lo:hi], {name: values[lo:hi] for name, values in self.columns.items()})
+
+    def to_frame(self) -> pd.DataFrame:
+        """Wrap the views in a date-indexed DataFrame without copying them."""
+        index = pd.DatetimeIndex(self.dates.view("datetime64[ns]"), copy=False, name="date")
+        return pd.DataFrame(dict(self.columns), index=index, copy=False)
+
+
+class MmapPriceStore:
+    """
+    Per-ticker binary OHLCV layout: one .npy file per column under
+    `root/TICKER/{adjusted|raw}[/interval=<x>]/`, plus a JSON header with the covered range.
+    """
+
+    def __init__(self, root: str | Path) -> None:
+        self.root = Path(root)
+
+    def write(
+        self,
+        ticker: str,
+        frame: pd.DataFrame,
+        start: pd.Timestamp,
+        end: pd.Timestamp,
+        auto_adjust: bool = True,
+        interval: str = "1d",
+    ) -> Path:
+        """Replace a ticker's arrays with ``frame``, recording [start, end) as covered."""
+        validate_interval(interval)
+        frame = normalize_price_frame(frame)
+        target = self._ticker_dir(ticker, auto_adjust, interval)
+        staging = target.with_name(f"{target.name}.tmp-{os.getpid()}")
+        shutil.rmtree(staging, ignore_errors=True)
+        staging.mkdir(parents=True)
+
+        np.save(staging / "dates.npy", frame.index.as_unit("ns").asi8)
+        for name in PRICE_COLUMNS:
+            np.save(staging / f"{name}.npy", frame[name].to_numpy(dtype=_COLUMN_DTYPES[name]))
+        meta = {
+            "rows": len(frame),
+            "start": pd.Timestamp(start).isoformat(),
+            "end": pd.Timestamp(end).isoformat(),
+        }
+        (staging / _META_FILE).write_text(json.dumps(meta))
+
+        if target.exists():
+            retired = target.with_name(f"{target.name}.old-{os.getpid()}")
+            os.replace(target, retired)
+            os.replace(staging, target)
+            shutil.rmtree(retired, ignore_errors=True)
+        else:
+            os.replace(staging, target)
+        return target
+
+    def open(self, ticker: str, auto_adjust: bool = True, interval: str = "1d") -> Optional[MmapBars]:
+        """Memory-map a ticker's arrays, or return None if it has not been written."""
+        loaded = self._load(ticker, auto_adjust, interval)
+        return loaded[0] if loaded else None
+
+    def window(
+        self,
+        ticker: str,
+        start: pd.Timestamp,
+        end: pd.Timestamp,
+        auto_adjust: bool = True,
+        interval: str = "1d",
+    ) -> Optional[pd.DataFrame]:
+        """Return bars in [start, end) as a zero-copy frame, or None when the range is not covered."""
+        loaded = self._load(ticker, auto_adjust, interval)
+        if loaded is None:
+            return None
+        bars, (covered_start, covered_end) = loaded
+        if pd.Timestamp(start) < covered_start or pd.Timestamp(end) > covered_end:
+            return None
+        frame = bars.between(start, end, end_inclusive=False).to_frame()
+        # Stores written before volume was float64 hold it as uint64; only that column is copied.
+        legacy = [name for name, dtype in _COLUMN_DTYPES.items() if frame[name].dtype != dtype]
+        return frame.astype({name: _COLUMN_DTYPES[name] for name in legacy}) if legacy else frame
+
+    def _load(self, ticker: str, auto_adjust: bool, interval: str):
+        ticker_dir = self._ticker_dir(ticker, auto_adjust, interval)
+        try:
+            stamp = (ticker_dir / _META_FILE).stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+        return _open_arrays(str(ticker_dir), stamp)
+
+    def _ticker_dir(self, ticker: str, auto_adjust: bool, interval: str) -> Path:
+        ticker_dir = self.root / ticker.upper() / ("adjusted" if auto_adjust else "raw")
+        return ticker_dir if interval == "1d" else ticker_dir / f"interval={interval}"
+
+
+@lru_cache(maxsize=256)
+def _open_arrays(ticker_dir: str, stamp: int) -> Tuple[MmapBars, Tuple[pd.Timestamp, pd.Timestamp]]:
+    """Open (and keep open) one ticker's memmaps; the meta mtime in the key picks up rewrites."""
+    directory = Path(ticker_dir)
+    meta = json.loads((directory / _META_FILE).read_text())
+    dates = np.load(directory / "dates.npy", mmap_mode="r")
+    columns = {name: np.load(directory / f"{name}.npy", mmap_mode="r") for name in PRICE_COLUMNS}
+    return MmapBars(dates, columns), (pd.Timestamp(meta["start"]), pd.Timestamp(meta["end"]))
+
+
+def _to_ns(value: pd.Timestamp | str) -> np.int64:
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is not None:
+        ts = ts.tz_localize(None)
+    return np.int64(ts.as_unit("ns").value)
@@ -0,0 +1,334 @@
+from __future__ import annotations
+
+import json
+import shutil
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Protocol, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from src.data.price_store import _atomic_write_parquet
+from src.events.fanout import event_tags
+
+NEWS_COLUMNS: Tuple[str, ...] = ("ticker", "date", "headline", "source", "url", "summary")
+
+# Common alternative column names in news archives, mapped onto NEWS_COLUMNS.
+_COLUMN_ALIASES: Dict[str, str] = {
+    "symbol": "ticker",
+    "title": "headline",
+    "published": "date",
+    "published_at": "date",
+    "datetime": "date",
+    "timestamp": "date",
+    "link": "url",
+    "description": "summary",
+}
+
+_STAGING_DIR = "_staging"
+# "SECTOR:TECH" is stored as SECTOR__TECH.parquet so keys stay valid file names everywhere.
+_TAG_SEPARATOR_ON_DISK = "__"
+_DEFAULT_CHUNK_ROWS = 100_000
+# Normalized rows buffered before they are spooled to per-ticker staging files during ingest.
+_DEFAULT_SPOOL_ROWS = 500_000
+
+# Deterministic sample headlines per ticker to avoid network dependencies.
+_SAMPLE_NEWS: Dict[str, List[Dict]] = {
+    "PGR": [
+        {"date": "2024-09-03", "headline": "Progressive announces monthly catastrophe loss estimate", "source": "Press release", "url": None, "summary": None},
+        {"date": "2024-09-12", "headline": "Analyst notes steady auto claims trends at Progressive", "source": "Analyst", "url": None, "summary": None},
+        {"date": "2024-09-24", "headline": "Progressive reports Q3 premium growth figures", "source": "Newswire", "url": None, "summary": None},
+    ],
+    "AAPL": [
+        {"date": "2024-09-10", "headline": "Apple unveils new iPhone lineup at fall event", "source": "Newswire", "url": None, "summary": None},
+        {"date": "2024-09-20", "headline": "Early reviews highlight camera upgrades", "source": "Blog", "url": None, "summary": None},
+    ],
+    "NVDA": [
+        {"date": "2024-09-05", "headline": "NVIDIA announces new data center GPU roadmap", "source": "Newswire", "url": None, "summary": None},
+        {"date": "2024-09-18", "headline": "Report: Cloud providers expand NVIDIA GPU orders", "source": "Analyst", "url": None, "summary": None},
+    ],
+    "SCHW": [
+        {"date": "2024-09-09", "headline": "Charles Schwab reports client asset flows for August", "source": "Press release", "url": None, "summary": None},
+        {"date": "2024-09-27", "headline": "Schwab completes platform migration milestone", "source": "Newswire", "url": None, "summary": None},
+    ],
+}
+
+
+class NewsProvider(Protocol):
+    """Source of news items streamed as DataFrame batches (any superset of NEWS_COLUMNS)."""
+
+    name: str
+
+    def iter_batches(self) -> Iterator[pd.DataFrame]:
+        ...
+
+
+class SampleNewsProvider:
+    """Serve the built-in sample headlines."""
+
+    name = "sample"
+
+    def iter_batches(self) -> Iterator[pd.DataFrame]:
+        rows = [dict(item, ticker=ticker) for ticker, items in _SAMPLE_NEWS.items() for item in items]
+        yield pd.DataFrame(rows)
+
+
+class FileNewsProvider:
+    """
+    Stream a JSONL, CSV or Parquet news archive in bounded batches.
+
+    JSONL and CSV are read ``chunk_rows`` lines at a time and Parquet one record batch at
+    a time, so an archive is never materialized whole.
+    """
+
+    def __init__(self, path: str | Path, chunk_rows: int = _DEFAULT_CHUNK_ROWS, name: Optional[str] = None) -> None:
+        self.path = Path(path)
+        self.chunk_rows = chunk_rows
+        self.name = name or self.path.stem
+
+    def iter_batches(self) -> Iterator[pd.DataFrame]:
+        suffix = self.path.suffix.lower()
+        if suffix in (".jsonl", ".ndjson", ".json"):
+            with pd.read_json(self.path, lines=True, chunksize=self.chunk_rows, dtype=False) as reader:
+                yield from reader
+        elif suffix == ".csv":
+            with pd.read_csv(self.path, chunksize=self.chunk_rows, dtype=str, keep_default_na=False) as reader:
+                yield from reader
+        elif suffix == ".parquet":
+            for batch in pq.ParquetFile(self.path).iter_batches(batch_size=self.chunk_rows):
+                yield batch.to_pandas()
+        else:
+            raise ValueError(f"Unsupported news archive format: {self.path}")
+
+
+class TickerNews:
+    """One ticker's news as sorted columns: int64 ns dates plus headline/source/url/summary arrays."""
+
+    def __init__(self, frame: pd.DataFrame) -> None:
+        self.dates = frame["date"].to_numpy(dtype=np.int64)
+        self.columns = {col: frame[col].to_numpy(dtype=object) for col in NEWS_COLUMNS[2:]}
+
+    def __len__(self) -> int:
+        return int(self.dates.shape[0])
+
+    def window(self, ticker: str, start: pd.Timestamp, end: pd.Timestamp, max_items: int) -> List[Dict]:
+        """Items dated within [start, end], located by binary search and returned in stored order."""
+        lo = int(np.searchsorted(self.dates, _to_ns(start), side="left"))
+        hi = int(np.searchsorted(self.dates, _to_ns(end), side="right"))
+        hi = min(hi, lo + max(max_items, 0))
+        dates = pd.DatetimeIndex(self.dates[lo:hi].astype("datetime64[ns]"))
+        columns = {col: values[lo:hi].tolist() for col, values in self.columns.items()}
+        return [
+            {
+                "date": date,
+                "headline": headline,
+                "source": _none_if_missing(source),
+                "url": _none_if_missing(url),
+                "summary": _none_if_missing(summary),
+                "ticker": ticker,
+            }
+            for date, headline, source, url, summary in zip(
+                dates, columns["headline"], columns["source"], columns["url"], columns["summary"]
+            )
+        ]
+
+
+class NewsIndex:
+    """In-memory per-ticker news index built from one or more providers."""
+
+    def __init__(self, by_ticker: Dict[str, TickerNews]) -> None:
+        self.by_ticker = by_ticker
+
+    @classmethod
+    def from_providers(cls, providers: Sequence[NewsProvider]) -> "NewsIndex":
+        frames = [batch for provider in providers for batch in iter_normalized_batches(provider)]
+        if not frames:
+            return cls({})
+        merged = _sorted_unique(pd.concat(frames, ignore_index=True))
+        return cls({str(t): TickerNews(group) for t, group in merged.groupby("ticker", sort=False)})
+
+    def tickers(self) -> List[str]:
+        return sorted(self.by_ticker)
+
+    def query(self, ticker: str, start: pd.Timestamp, end: pd.Timestamp, max_items: int = 100) -> List[Dict]:
+        news = self.by_ticker.get(ticker.upper())
+        return news.window(ticker.upper(), start, end, max_items) if news is not None else []
+
+
+class NewsStore:
+    """
+    On-disk news index: one date-sorted Parquet file per ticker under ``root``.
+
+    ``ingest`` streams every provider's batches, spools them per ticker into a staging
+    area (at most ``spool_rows`` normalized rows are held in memory), then merges each
+    ticker's parts with its existing file, dropping exact (date, headline) repeats.
+    Queries load a ticker's columns once per process and binary-search the int64 dates.
+    """
+
+    def __init__(self, root: str | Path) -> None:
+        self.root = Path(root)
+
+    def ingest(self, providers: Sequence[NewsProvider], spool_rows: int = _DEFAULT_SPOOL_ROWS) -> Dict[str, int]:
+        """Load all providers into the store; returns the item count per touched ticker."""
+        staging = self.root / _STAGING_DIR
+        shutil.rmtree(staging, ignore_errors=True)
+        pending: List[pd.DataFrame] = []
+        pending_rows = 0
+        spools = 0
+        for provider in providers:
+            for batch in iter_normalized_batches(provider):
+                pending.append(batch)
+                pending_rows += len(batch)
+                if pending_rows >= spool_rows:
+                    _spool(pending, staging, spools)
+                    pending, pending_rows, spools = [], 0, spools + 1
+        if pending:
+            _spool(pending, staging, spools)
+
+        counts: Dict[str, int] = {}
+        if staging.exists():
+            for ticker_dir in sorted(p for p in staging.iterdir() if p.is_dir()):
+                frames = [pd.read_parquet(path) for path in sorted(ticker_dir.glob("part-*.parquet"))]
+                key = ticker_dir.name.replace(_TAG_SEPARATOR_ON_DISK, ":")
+                existing = self._ticker_path(key)
+                if existing.exists():
+                    frames.insert(0, pd.read_parquet(existing))
+                merged = _sorted_unique(pd.concat(frames, ignore_index=True))
+                _atomic_write_parquet(merged.reset_index(drop=True), existing)
+                counts[key] = len(merged)
+            shutil.rmtree(staging, ignore_errors=True)
+        self._write_manifest(counts)
+        return counts
+
+    def tickers(self) -> List[str]:
+        """Stored keys: tickers plus any market/sector tags."""
+        return sorted(path.stem.replace(_TAG_SEPARATOR_ON_DISK, ":") for path in self.root.glob("*.parquet"))
+
+    def query(self, ticker: str, start: pd.Timestamp, end: pd.Timestamp, max_items: int = 100) -> List[Dict]:
+        path = self._ticker_path(ticker.upper())
+        try:
+            stamp = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return []
+        return _load_ticker_news(str(path), stamp).window(ticker.upper(), start, end, max_items)
+
+    def _ticker_path(self, ticker: str) -> Path:
+        return self.root / f"{_file_key(ticker)}.parquet"
+
+    def _write_manifest(self, counts: Dict[str, int]) -> None:
+        manifest_path = self.root / "_manifest.json"
+        manifest = json.loads(manifest_path.read_text()) if manifest_path.exists() else {}
+        manifest.update(counts)
+        self.root.mkdir(parents=True, exist_ok=True)
+        manifest_path.write_text(json.dumps(manifest, indent=2, sort_keys=True))
+
+
+def iter_normalized_batches(provider: NewsProvider) -> Iterator[pd.DataFrame]:
+    """Yield a provider's batches coerced to NEWS_COLUMNS with int64 ns dates; bad rows are dropped."""
+    for batch in provider.iter_batches():
+        normalized = normalize_news_batch(batch, default_source=provider.name)
+        if not normalized.empty:
+            yield normalized
+
+
+def normalize_news_batch(batch: pd.DataFrame, default_source: Optional[str] = None) -> pd.DataFrame:
+    """
+    Rename known aliases, parse dates once to int64 ns and drop rows without ticker/date/headline.
+
+    A ``tags`` column (list or "|"-separated tickers, "sector:<name>" or "market") fans a
+    row out to one row per tag, stored under the tag as its ticker key.
+    """
+    batch = batch.rename(columns={k: v for k, v in _COLUMN_ALIASES.items() if k in batch and v not in batch})
+    if "tags" in batch:
+        tickers = batch["ticker"] if "ticker" in batch else pd.Series(None, index=batch.index, dtype=object)
+        tags = [event_tags({"tags": value, "ticker": ticker}) for value, ticker in zip(batch["tags"], tickers)]
+        batch = batch.drop(columns=["ticker", "tags"], errors="ignore").assign(ticker=tags)
+        batch = batch.explode("ticker", ignore_index=True)
+    if "ticker" not in batch or "date" not in batch or "headline" not in batch:
+        raise ValueError("News batches need ticker, date and headline columns.")
+
+    out = pd.DataFrame(index=batch.index)
+    out["ticker"] = _clean_text(batch["ticker"]).str.upper()
+    out["date"] = _parse_dates_ns(batch["date"])
+    out["headline"] = _clean_text(batch["headline"])
+    for col in ("source", "url", "summary"):
+        out[col] = _clean_text(batch[col]) if col in batch else pd.Series(None, index=batch.index, dtype=object)
+    if default_source is not None:
+        out["source"] = out["source"].fillna(default_source)
+
+    out = out.loc[out["date"].notna() & out["ticker"].notna() & out["headline"].notna()]
+    out["date"] = out["date"].astype(np.int64)
+    return out.reset_index(drop=True)
+
+
+def _clean_text(values: pd.Series) -> pd.Series:
+    """Stripped strings as an object column, with None for missing or blank values."""
+    text = values.astype(object).where(values.notna(), "").astype(str).str.strip()
+    return text.where(text != "", None).astype(object)
+
+
+def _spool(batches: List[pd.DataFrame], staging: Path, part: int) -> None:
+    """Write buffered rows to one staging file per ticker."""
+    frame = pd.concat(batches, ignore_index=True)
+    for ticker, group in frame.groupby("ticker", sort=False):
+        ticker_dir = staging / _file_key(str(ticker))
+        ticker_dir.mkdir(parents=True, exist_ok=True)
+        group.to_parquet(ticker_dir / f"part-{part:06d}.parquet", index=False)
+
+
+def _file_key(key: str) -> str:
+    return key.replace(":", _TAG_SEPARATOR_ON_DISK)
+
+
+def _sorted_unique(frame: pd.DataFrame) -> pd.DataFrame:
+    """Order by ticker, date, headline and drop exact (ticker, date, headline) repeats."""
+    frame = frame.sort_values(["ticker", "date", "headline"], kind="stable")
+    return frame.drop_duplicates(subset=["ticker", "date", "headline"], keep="first")
+
+
+@lru_cache(maxsize=512)
+def _load_ticker_news(path: str, stamp: int) -> TickerNews:
+    return TickerNews(pd.read_parquet(path))
+
+
+def _parse_dates_ns(values: pd.Series) -> pd.Series:
+    """Vectorized date parsing to tz-naive int64 nanoseconds (NaN where unparseable)."""
+    parsed = _to_naive_datetimes(values, "ISO8601")
+    retry = parsed.isna() & values.notna()
+    if retry.any():
+        parsed[retry] = _to_naive_datetimes(values[retry], "mixed")
+    return pd.Series(np.where(parsed.isna(), np.nan, parsed.astype(np.int64)), index=values.index)
+
+
+def _to_naive_datetimes(values: pd.Series, fmt: str) -> pd.Series:
+    """Parse with the given pandas format; tz-aware stamps keep their wall-clock time."""
+    if pd.api.types.is_datetime64_any_dtype(values):
+        parsed = values
+    else:
+        try:
+            parsed = pd.to_datetime(values, errors="coerce", format=fmt)
+        except (TypeError, ValueError):
+            parsed = pd.to_datetime(values, errors="coerce", format=fmt, utc=True)
+    if getattr(parsed.dt, "tz", None) is not None:
+        parsed = parsed.dt.tz_localize(None)
+    return parsed.astype("datetime64[ns]")
+
+
+def _none_if_missing(value: object) -> object:
+    return None if value is None or (isinstance(value, float) and np.isnan(value)) else value
+
+
+def _to_ns(value: pd.Timestamp) -> np.int64:
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is not None:
+        ts = ts.tz_localize(None)
+    return np.int64(ts.as_unit("ns").value)
+
+
+def iter_providers_for_paths(
+    paths: Iterable[str | Path], chunk_rows: int = _DEFAULT_CHUNK_ROWS
+) -> List[FileNewsProvider]:
+    """Build one streaming provider per archive path."""
+    return [FileNewsProvider(path, chunk_rows=chunk_rows) for path in paths]
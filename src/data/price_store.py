@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import List, Protocol, Tuple
+
+import pandas as pd
+
+PRICE_COLUMNS: Tuple[str, ...] = ("open", "high", "low", "close", "volume")
+
+# Bar intervals understood by the providers and the store; "1d" is the default everywhere.
+SUPPORTED_INTERVALS: Tuple[str, ...] = ("1m", "2m", "5m", "15m", "30m", "60m", "90m", "1h", "1d")
+
+_COVERAGE_FILE = "_coverage.json"
+
+
+class PriceProvider(Protocol):
+    """Source of OHLCV bars for a ticker over a half-open [start, end) date range."""
+
+    def fetch(
+        self,
+        ticker: str,
+        start: pd.Timestamp,
+        end: pd.Timestamp,
+        auto_adjust: bool = True,
+        interval: str = "1d",
+    ) -> pd.DataFrame:
+        """Return bars indexed by date with PRICE_COLUMNS; empty when nothing is available."""
+        ...
+
+
+class FixturePriceProvider:
+    """
+    Serve bars from local files for tests and offline runs.
+
+    Daily bars live in `<TICKER>.csv` or `<TICKER>.parquet`; other intervals in
+    `<TICKER>_<interval>.csv` or `.parquet` (e.g. `AAPL_1m.parquet`).
+    """
+
+    def __init__(self, root: str | Path) -> None:
+        self.root = Path(root)
+        self.requests: List[Tuple[str, pd.Timestamp, pd.Timestamp]] = []
+
+    def fetch(
+        self,
+        ticker: str,
+        start: pd.Timestamp,
+        end: pd.Timestamp,
+        auto_adjust: bool = True,
+        interval: str = "1d",
+    ) -> pd.DataFrame:
+        self.requests.append((ticker.upper(), start, end))
+        frame = self._load(ticker.upper() if interval == "1d" else f"{ticker.upper()}_{interval}")
+        if frame.empty:
+            return frame
+        return frame.loc[(frame.index >= start) & (frame.index < end)]
+
+    def _load(self, stem: str) -> pd.DataFrame:
+        parquet_path = self.root / f"{stem}.parquet"
+        csv_path = self.root / f"{stem}.csv"
+        if parquet_path.exists():
+            frame = pd.read_parquet(parquet_path)
+            if "date" in frame.columns:
+                frame = frame.set_index("date")
+        elif csv_path.exists():
+            frame = pd.read_csv(csv_path, index_col="date", parse_dates=["date"])
+        else:
+            return empty_price_frame()
+        return normalize_price_frame(frame)
+
+
+class PriceStore:
+    """
+    Persistent bar store partitioned by ticker and year in Parquet.
+
+    Requested windows are checked against the ranges already fetched for the ticker;
+    only the uncovered gaps are pulled from the provider and merged into the affected
+    year partitions, and the window is then served from disk. A gap counts as covered
+    only once the provider has returned bars for it. Daily bars keep the
+    original layout; other intervals get their own `interval=<x>` subdirectory.
+    """
+
+    def __init__(self, root: str | Path, provider: PriceProvider) -> None:
+        self.root = Path(root)
+        self.provider = provider
+
+    def get(
+        self,
+        ticker: str,
+        start: pd.Timestamp,
+        end: pd.Timestamp,
+        auto_adjust: bool = True,
+        interval: str = "1d",
+    ) -> pd.DataFrame:
+        """Return bars in [start, end), fetching and persisting any missing ranges first."""
+        validate_interval(interval)
+        ticker = ticker.upper()
+        start = pd.Timestamp(start).normalize()
+        end = pd.Timestamp(end).normalize()
+        ticker_dir = self._ticker_dir(ticker, auto_adjust, interval)
+
+        coverage = self._read_coverage(ticker_dir)
+        for gap_start, gap_end in missing_ranges(coverage, start, end):
+            fetched = normalize_price_frame(
+                self.provider.fetch(ticker, gap_start, gap_end, auto_adjust=auto_adjust, interval=interval)
+            )
+            if fetched.empty:
+                # Providers return an empty frame on network or rate-limit errors too, so an
+                # empty answer is not proof the gap has no bars; leave it to be fetched again.
+                continue
+            self._merge_partitions(ticker_dir, fetched)
+            # Bars for today and later may still change, so they are never marked as covered.
+            covered_end = min(gap_end, pd.Timestamp.today().normalize())
+            if covered_end > gap_start:
+                coverage = merge_ranges(coverage + [(gap_start, covered_end)])
+                self._write_coverage(ticker_dir, coverage)
+
+        return self._read_window(ticker_dir, start, end)
+
+    def _ticker_dir(self, ticker: str, auto_adjust: bool, interval: str = "1d") -> Path:
+        ticker_dir = self.root / ticker / ("adjusted" if auto_adjust else "raw")
+        return ticker_dir if interval == "1d" else ticker_dir / f"interval={interval}"
+
+    def _read_window(self, ticker_dir: Path, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+        frames = []
+        for year in range(start.year, end.year + 1):
+            path = ticker_dir / f"year={year}.parquet"
+            if path.exists():
+                frames.append(pd.read_parquet(path))
+        if not frames:
+            return empty_price_frame()
+        window = pd.concat(frames).sort_index()
+        return window.loc[(window.index >= start) & (window.index < end)]
+
+    def _merge_partitions(self, ticker_dir: Path, fetched: pd.DataFrame) -> None:
+        ticker_dir.mkdir(parents=True, exist_ok=True)
+        for year, new_rows in fetched.groupby(fetched.index.year):
+            path = ticker_dir / f"year={year}.parquet"
+            if path.exists():
+                combined = pd.concat([pd.read_parquet(path), new_rows])
+                combined = combined[~combined.index.duplicated(keep="last")].sort_index()
+            else:
+                combined = new_rows
+            _atomic_write_parquet(combined, path)
+
+    def _read_coverage(self, ticker_dir: Path) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+        path = ticker_dir / _COVERAGE_FILE
+        if not path.exists():
+            return []
+        raw = json.loads(path.read_text())
+        return [(pd.Timestamp(s), pd.Timestamp(e)) for s, e in raw]
+
+    def _write_coverage(self, ticker_dir: Path, coverage: List[Tuple[pd.Timestamp, pd.Timestamp]]) -> None:
+        ticker_dir.mkdir(parents=True, exist_ok=True)
+        path = ticker_dir / _COVERAGE_FILE
+        tmp_path = path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps([[s.date().isoformat(), e.date().isoformat()] for s, e in coverage]))
+        os.replace(tmp_path, path)
+
+
+def validate_interval(interval: str) -> None:
+    """Raise ValueError for bar intervals the data layer does not support."""
+    if interval not in SUPPORTED_INTERVALS:
+        raise ValueError(f"Unsupported interval '{interval}'; expected one of {SUPPORTED_INTERVALS}.")
+
+
+def missing_ranges(
+    coverage: List[Tuple[pd.Timestamp, pd.Timestamp]],
+    start: pd.Timestamp,
+    end: pd.Timestamp,
+) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+    """Return the sub-ranges of [start, end) not covered by the sorted, merged coverage list."""
+    gaps: List[Tuple[pd.Timestamp, pd.Timestamp]] = []
+    cursor = start
+    for cov_start, cov_end in coverage:
+        if cov_end <= cursor:
+            continue
+        if cov_start >= end:
+            break
+        if cov_start > cursor:
+            gaps.append((cursor, cov_start))
+        cursor = max(cursor, cov_end)
+        if cursor >= end:
+            break
+    if cursor < end:
+        gaps.append((cursor, end))
+    return gaps
+
+
+def merge_ranges(ranges: List[Tuple[pd.Timestamp, pd.Timestamp]]) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+    """Sort half-open ranges and merge any that overlap or touch."""
+    merged: List[Tuple[pd.Timestamp, pd.Timestamp]] = []
+    for range_start, range_end in sorted(ranges):
+        if merged and range_start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], range_end))
+        else:
+            merged.append((range_start, range_end))
+    return merged
+
+
+def normalize_price_frame(frame: pd.DataFrame) -> pd.DataFrame:
+    """Coerce a bar frame to the canonical schema: sorted tz-naive 'date' index and PRICE_COLUMNS."""
+    if frame is None or frame.empty:
+        return empty_price_frame()
+    normalized = frame.loc[:, list(PRICE_COLUMNS)].sort_index()
+    index = pd.to_datetime(normalized.index)
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    normalized.index = index
+    normalized.index.name = "date"
+    return normalized
+
+
+def empty_price_frame() -> pd.DataFrame:
+    """Return an empty frame with the canonical price schema."""
+    return pd.DataFrame(
+        {col: pd.Series(dtype=float) for col in PRICE_COLUMNS},
+        index=pd.DatetimeIndex([], name="date"),
+    )
+
+
+def _atomic_write_parquet(frame: pd.DataFrame, path: Path) -> None:
+    """Write Parquet to a temp file and rename so readers never see a partial partition."""
+    tmp_path = path.with_suffix(".tmp")
+    frame.to_parquet(tmp_path)
+    os.replace(tmp_path, path)
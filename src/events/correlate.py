@@ -1,7 +1,8 @@
 from __future__ import annotations
 
-from typing import Dict, List
+from typing import Dict, List, Tuple
 
+import numpy as np
 import pandas as pd
 
 
@@ -14,52 +15,120 @@ def correlate_runs_with_events(
     if runs_df is None or runs_df.empty:
         return {}
 
-    correlations: Dict[int, List[dict]] = {}
-    normalized_events = [_ensure_timestamp_event(e) for e in events or []]
-
-    for _, run in runs_df.iterrows():
-        run_id = int(run.get("run_id"))
-        run_start = _get_run_ts(run, "start", "run_start")
-        run_end = _get_run_ts(run, "end", "run_end")
-
-        if run_start is None or run_end is None:
-            correlations[run_id] = []
-            continue
+    normalized_events = [ensure_timestamp_event(e) for e in events or []]
+    dated_events = [ev for ev in normalized_events if isinstance(ev.get("date"), pd.Timestamp)]
+    # Global (date, headline) order; the stable sort keeps input order for exact ties.
+    dated_events.sort(key=lambda ev: (ev["date"], ev.get("headline") or ""))
+    event_days = to_day_numbers([ev["date"] for ev in dated_events])
 
-        window_start = run_start - pd.Timedelta(days=window_days)
-        window_end = run_start + pd.Timedelta(days=window_days)
+    run_ids = [int(run_id) for run_id in runs_df["run_id"]]
+    start_days, valid_runs = run_day_numbers(runs_df)
 
-        matched: List[dict] = []
-        for event in normalized_events:
-            if _event_falls_in_window(event, window_start, window_end):
-                days_from_run_start = int((event["date"].normalize() - run_start.normalize()).days)
-                enriched = dict(event)
-                enriched["days_from_run_start"] = days_from_run_start
-                matched.append(enriched)
+    run_idx, event_idx, day_offsets = match_runs_to_events(
+        start_days[valid_runs], event_days, window_days
+    )
+    run_positions = np.flatnonzero(valid_runs)[run_idx]
 
-        correlations[run_id] = _score_and_sort_events(matched, run_start)
+    matched: Dict[int, List[dict]] = {}
+    for pos, ev_pos, offset in zip(run_positions.tolist(), event_idx.tolist(), day_offsets.tolist()):
+        enriched = dict(dated_events[ev_pos])
+        enriched["days_from_run_start"] = offset
+        matched.setdefault(pos, []).append(enriched)
 
+    correlations: Dict[int, List[dict]] = {}
+    for pos, run_id in enumerate(run_ids):
+        correlations[run_id] = matched.get(pos, [])
     return correlations
 
 
-def _event_falls_in_window(event: dict, window_start: pd.Timestamp, window_end: pd.Timestamp) -> bool:
-    """Check if an event date lies within [window_start, window_end]."""
-    event_date = event.get("date")
-    if not isinstance(event_date, pd.Timestamp):
-        return False
-    return window_start.normalize() <= event_date.normalize() <= window_end.normalize()
+def match_runs_to_events(
+    run_start_days: np.ndarray,
+    event_days: np.ndarray,
+    window_days: int,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Interval-join run start days against sorted event days.
+
+    Each run's window [start - window_days, start + window_days] is located with two
+    binary searches, so the cost is O((runs + matches) log events) rather than
+    O(runs x events). Returns flat (run_index, event_index, days_from_run_start)
+    arrays, grouped by run and ordered within each run by absolute day offset and
+    then event position, which is the `_score_and_sort_events` order when events
+    are pre-sorted by (date, headline).
+    """
+    run_start_days = np.asarray(run_start_days, dtype=np.int64)
+    event_days = np.asarray(event_days, dtype=np.int64)
+
+    lo = np.searchsorted(event_days, run_start_days - window_days, side="left")
+    hi = np.searchsorted(event_days, run_start_days + window_days, side="right")
+    counts = np.maximum(hi - lo, 0)
+    total = int(counts.sum())
+    if total == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty, empty
+
+    run_idx = np.repeat(np.arange(run_start_days.shape[0], dtype=np.int64), counts)
+    group_offsets = np.cumsum(counts) - counts
+    event_idx = np.arange(total, dtype=np.int64) - np.repeat(group_offsets - lo, counts)
+    day_offsets = event_days[event_idx] - run_start_days[run_idx]
+
+    order = np.lexsort((event_idx, np.abs(day_offsets), run_idx))
+    return run_idx[order], event_idx[order], day_offsets[order]
+
+
+def to_day_numbers(dates: List[pd.Timestamp]) -> np.ndarray:
+    """Convert timestamps to int64 days since the epoch (floor, i.e. the normalized date)."""
+    if not dates:
+        return np.empty(0, dtype=np.int64)
+    return pd.DatetimeIndex(dates).values.astype("datetime64[D]").astype(np.int64)
+
+
+def run_day_numbers(runs_df: pd.DataFrame) -> Tuple[np.ndarray, np.ndarray]:
+    """Return (start day numbers, validity mask); runs without usable start/end dates are invalid."""
+    start_col = _run_column(runs_df, "start", "run_start")
+    end_col = _run_column(runs_df, "end", "run_end")
+    n_runs = len(runs_df)
+    if start_col is None or end_col is None:
+        return np.zeros(n_runs, dtype=np.int64), np.zeros(n_runs, dtype=bool)
+
+    starts = _coerce_run_dates(runs_df[start_col])
+    ends = _coerce_run_dates(runs_df[end_col])
+    valid = ~(starts.isna() | ends.isna())
+    days = np.zeros(n_runs, dtype=np.int64)
+    if valid.any():
+        days[valid] = to_day_numbers(list(starts[valid]))
+    return days, valid
+
+
+def _run_column(runs_df: pd.DataFrame, primary_key: str, fallback_key: str) -> str | None:
+    if primary_key in runs_df.columns:
+        return primary_key
+    if fallback_key in runs_df.columns:
+        return fallback_key
+    return None
+
+
+def _coerce_run_dates(values: pd.Series) -> pd.Series:
+    """Vectorized tz-naive conversion, falling back per value for mixed inputs."""
+    try:
+        converted = pd.to_datetime(values, errors="coerce")
+        if getattr(converted.dt, "tz", None) is not None:
+            converted = converted.dt.tz_localize(None)
+        return converted
+    except (TypeError, ValueError):
+        return pd.Series([_parse_run_ts(v) for v in values], index=values.index, dtype="datetime64[ns]")
 
 
 def _score_and_sort_events(events: List[dict], run_start: pd.Timestamp) -> List[dict]:
     """Sort events deterministically by proximity to run start, then date, then headline."""
     def _key(ev: dict) -> tuple:
         delta_days = int((ev["date"].normalize() - run_start.normalize()).days)
-        return (abs(delta_days), ev["date"], ev.get("headline", ""))
+        return (abs(delta_days), ev["date"], ev.get("headline") or "")
 
     return sorted(events, key=_key)
 
 
-def _ensure_timestamp_event(event: dict) -> dict:
+def ensure_timestamp_event(event: dict) -> dict:
     """Return a shallow copy of an event with its date coerced to Timestamp if possible."""
     copied = dict(event)
     date_val = copied.get("date")
@@ -70,14 +139,8 @@ def _ensure_timestamp_event(event: dict) -> dict:
     return copied
 
 
-def _get_run_ts(run: pd.Series, primary_key: str, fallback_key: str) -> pd.Timestamp | None:
-    """Get a timezone-naive Timestamp for run start/end from possible column names."""
-    if primary_key in run:
-        raw = run[primary_key]
-    elif fallback_key in run:
-        raw = run[fallback_key]
-    else:
-        return None
+def _parse_run_ts(raw) -> pd.Timestamp | None:
+    """Get a timezone-naive Timestamp from a raw run start/end value."""
     try:
         return pd.Timestamp(raw).tz_localize(None)
     except Exception:
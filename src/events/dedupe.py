@@ -0,0 +1,232 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from itertools import chain
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.config_spa import SPA_EVENT_DEDUP_SIMILARITY_PCT_DEFAULT
+
+_WIRE_PREFIX = r"^\s*(?:update\s*\d*|breaking|exclusive|corrected|refile)\b\s*[-:|]*\s*"
+# Trailing attribution such as " (Reuters)", " - sources" or " | Bloomberg".
+_WIRE_SUFFIX = r"\s*(?:\([^)]{1,40}\)|\s[-|]\s*[a-z0-9 .&']{1,30})\s*[!.]*\s*$"
+_NON_ALNUM = r"[^0-9a-z]+"
+
+_HASH_BASE = np.uint64(1_099_511_628_211)
+_MERSENNE_61 = (1 << 61) - 1
+
+# Headlines processed per MinHash chunk; bounds the shingle-hash temporaries.
+_SIGNATURE_CHUNK = 65_536
+
+
+@dataclass(frozen=True)
+class DedupParams:
+    """
+    MinHash/LSH settings for near-duplicate headline clustering.
+
+    Signatures have bands * rows_per_band permutations; a pair becomes a candidate when
+    any band matches exactly and its estimated Jaccard similarity is within prefilter_slack
+    of similarity. Candidates are merged only if the exact Jaccard similarity of their word
+    1..max_ngram-grams is at least similarity and neither headline replaces more than
+    max_substituted_words of the other's words ("beats" vs "misses"); words that are only
+    added or dropped do not count. Events are compared within a ticker, and a cluster is
+    split wherever consecutive members are more than window_days apart.
+    """
+
+    bands: int = 21
+    rows_per_band: int = 3
+    max_ngram: int = 2
+    similarity: float = SPA_EVENT_DEDUP_SIMILARITY_PCT_DEFAULT / 100.0
+    prefilter_slack: float = 0.1
+    max_substituted_words: int = 0
+    window_days: int = 1
+    seed: int = 7
+
+    @property
+    def num_perm(self) -> int:
+        return self.bands * self.rows_per_band
+
+
+def normalize_headlines(headlines: Sequence[object]) -> List[str]:
+    """Lowercase, drop wire prefixes (UPDATE 2-), source tails (- Reuters) and punctuation, collapse spaces."""
+    text = pd.Series([str(h) if h is not None else "" for h in headlines], dtype="string[pyarrow]")
+    text = text.str.lower().str.replace(_WIRE_PREFIX, "", regex=True).str.replace(_WIRE_SUFFIX, "", regex=True)
+    text = text.str.replace(_NON_ALNUM, " ", regex=True).str.strip()
+    return text.tolist()
+
+
+def minhash_signatures(texts: Sequence[str], num_perm: int = 64, max_ngram: int = 2, seed: int = 7) -> np.ndarray:
+    """
+    (n, num_perm) uint32 MinHash signatures over the word 1..max_ngram-grams of each text.
+
+    Tokens are hashed in one vectorized pass, n-gram hashes are combined from them with
+    array arithmetic, and each permutation is a multiply-shift hash reduced per text with
+    minimum.reduceat, so no Python work is done per shingle.
+    """
+    rng = np.random.default_rng(seed)
+    mult = rng.integers(1, _MERSENNE_61, size=num_perm, dtype=np.uint64) | np.uint64(1)
+    add = rng.integers(0, _MERSENNE_61, size=num_perm, dtype=np.uint64)
+    out = np.empty((len(texts), num_perm), dtype=np.uint32)
+    for lo in range(0, len(texts), _SIGNATURE_CHUNK):
+        chunk = texts[lo : lo + _SIGNATURE_CHUNK]
+        hashes, starts = _shingle_hashes(chunk, max_ngram)
+        for p in range(num_perm):
+            permuted = ((hashes * mult[p] + add[p]) >> np.uint64(32)).astype(np.uint32)
+            out[lo : lo + len(chunk), p] = np.minimum.reduceat(permuted, starts)
+    return out
+
+
+def cluster_near_duplicates(
+    headlines: Sequence[str],
+    groups: Optional[np.ndarray] = None,
+    params: DedupParams = DedupParams(),
+) -> np.ndarray:
+    """
+    Label near-duplicate headlines; each label is the smallest index in its cluster.
+
+    groups (e.g. factorized ticker/day buckets) restricts comparisons to equal values.
+    Candidates come from LSH band buckets, so cost is linear in the number of headlines
+    rather than pairwise; only the candidates are checked exactly.
+    """
+    n = len(headlines)
+    if n == 0:
+        return np.empty(0, dtype=np.int64)
+    groups = np.zeros(n, dtype=np.int64) if groups is None else np.asarray(groups, dtype=np.int64)
+    normalized = normalize_headlines(headlines)
+    signatures = minhash_signatures(normalized, params.num_perm, params.max_ngram, params.seed)
+
+    group_salt = _mix64(groups.astype(np.uint64))
+    src_parts: List[np.ndarray] = []
+    dst_parts: List[np.ndarray] = []
+    for band in range(params.bands):
+        cols = signatures[:, band * params.rows_per_band : (band + 1) * params.rows_per_band]
+        keys = group_salt.copy()
+        for j in range(cols.shape[1]):
+            keys = _mix64(keys ^ cols[:, j].astype(np.uint64))
+        order = np.argsort(keys, kind="stable")
+        sorted_keys = keys[order]
+        bucket_start = np.r_[True, sorted_keys[1:] != sorted_keys[:-1]]
+        reps = order[np.maximum.accumulate(np.where(bucket_start, np.arange(n), 0))]
+        candidates = np.flatnonzero(reps != order)
+        src, dst = order[candidates], reps[candidates]
+        keep = groups[src] == groups[dst]
+        src, dst = src[keep], dst[keep]
+        agreement = (signatures[src] == signatures[dst]).mean(axis=1) if src.size else np.empty(0)
+        likely = agreement >= params.similarity - params.prefilter_slack
+        src_parts.append(src[likely])
+        dst_parts.append(dst[likely])
+
+    pairs = np.unique(np.stack([np.concatenate(src_parts), np.concatenate(dst_parts)], axis=1), axis=0)
+    verified = np.fromiter(
+        (_is_near_duplicate(normalized[a], normalized[b], params) for a, b in pairs.tolist()),
+        dtype=bool,
+        count=len(pairs),
+    )
+    return _connected_components(n, pairs[verified, 0], pairs[verified, 1])
+
+
+def _is_near_duplicate(left: str, right: str, params: DedupParams) -> bool:
+    """Exact check of an LSH candidate pair of normalized headlines."""
+    if left == right:
+        return True
+    left_words, right_words = left.split(), right.split()
+    only_left = set(left_words) - set(right_words)
+    only_right = set(right_words) - set(left_words)
+    if min(len(only_left), len(only_right)) > params.max_substituted_words:
+        return False
+    left_grams = _word_ngrams(left_words, params.max_ngram)
+    right_grams = _word_ngrams(right_words, params.max_ngram)
+    union = len(left_grams | right_grams)
+    return union > 0 and len(left_grams & right_grams) / union >= params.similarity
+
+
+def _word_ngrams(words: List[str], max_ngram: int) -> set:
+    return {tuple(words[i : i + n]) for n in range(1, max_ngram + 1) for i in range(len(words) - n + 1)}
+
+
+def collapse_near_duplicate_events(events: List[dict], params: DedupParams = DedupParams()) -> List[dict]:
+    """
+    Collapse near-duplicate events to one canonical event per cluster.
+
+    Events are ordered by (date, headline); the earliest member of each cluster is kept
+    and gains duplicate_count (cluster size) and sources (sorted distinct sources).
+    Events without a parseable date are kept as singletons.
+    """
+    if not events:
+        return []
+    dates = pd.to_datetime(pd.Series([ev.get("date") for ev in events], dtype=object), errors="coerce")
+    stamps = dates.fillna(pd.Timestamp.max)
+    order = sorted(range(len(events)), key=lambda i: (stamps.iat[i], str(events[i].get("headline") or "")))
+    ordered = [events[i] for i in order]
+    ordered_dates = dates.iloc[order].reset_index(drop=True)
+
+    missing = ordered_dates.isna().to_numpy()
+    groups = pd.Series([str(ev.get("ticker") or "") for ev in ordered]).factorize()[0].astype(np.int64)
+    # Undated events each get their own group so they never merge.
+    groups[missing] = groups.max() + 1 + np.arange(int(missing.sum()))
+    labels = cluster_near_duplicates([str(ev.get("headline") or "") for ev in ordered], groups, params)
+
+    days = np.where(missing, 0, ordered_dates.values.astype("datetime64[D]").astype(np.int64))
+    by_cluster = np.lexsort((np.arange(len(ordered)), labels))
+    split = np.r_[True, (labels[by_cluster][1:] != labels[by_cluster][:-1])
+                  | (np.diff(days[by_cluster]) > params.window_days)]
+    cluster_ids = np.cumsum(split) - 1
+
+    members: Dict[int, List[int]] = {}
+    for pos, cluster_id in zip(by_cluster.tolist(), cluster_ids.tolist()):
+        members.setdefault(cluster_id, []).append(pos)
+    collapsed: List[dict] = []
+    for cluster in sorted(members.values()):
+        canonical = dict(ordered[cluster[0]])
+        canonical["duplicate_count"] = len(cluster)
+        canonical["sources"] = sorted({str(ordered[i]["source"]) for i in cluster if ordered[i].get("source")})
+        collapsed.append(canonical)
+    return collapsed
+
+
+def _shingle_hashes(texts: Sequence[str], max_ngram: int) -> tuple:
+    """Hash every word n-gram (n <= max_ngram) of each text; returns (hashes grouped by text, group starts)."""
+    tokens = [text.split() or [""] for text in texts]
+    counts = np.fromiter((len(t) for t in tokens), dtype=np.int64, count=len(tokens))
+    flat = np.fromiter(chain.from_iterable(tokens), dtype=object, count=int(counts.sum()))
+    token_hashes = pd.util.hash_array(flat, categorize=False)
+    owners = np.repeat(np.arange(len(tokens), dtype=np.int64), counts)
+
+    hash_parts, owner_parts = [token_hashes], [owners]
+    gram = token_hashes
+    with np.errstate(over="ignore"):
+        for n in range(2, max_ngram + 1):
+            gram = _mix64(gram[:-1] * _HASH_BASE + token_hashes[n - 1 :])
+            within = owners[: gram.shape[0]] == owners[n - 1 :]
+            hash_parts.append(gram[within])
+            owner_parts.append(owners[: gram.shape[0]][within])
+    all_owners = np.concatenate(owner_parts)
+    order = np.argsort(all_owners, kind="stable")
+    starts = np.searchsorted(all_owners[order], np.arange(len(tokens)), side="left")
+    return _mix64(np.concatenate(hash_parts)[order]), starts
+
+
+def _mix64(values: np.ndarray) -> np.ndarray:
+    """splitmix64 finalizer (wrapping uint64 arithmetic)."""
+    with np.errstate(over="ignore"):
+        z = values + np.uint64(0x9E3779B97F4A7C15)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return z ^ (z >> np.uint64(31))
+
+
+def _connected_components(n: int, src: np.ndarray, dst: np.ndarray) -> np.ndarray:
+    """Min-index component labels via vectorized label propagation with pointer jumping."""
+    labels = np.arange(n, dtype=np.int64)
+    if src.size == 0:
+        return labels
+    while True:
+        low = np.minimum(labels[src], labels[dst])
+        previous = labels.copy()
+        np.minimum.at(labels, src, low)
+        np.minimum.at(labels, dst, low)
+        labels = labels[labels]
+        if np.array_equal(labels, previous):
+            return labels
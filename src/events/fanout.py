@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Mapping, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.events.correlate import (
+    ensure_timestamp_event,
+    match_runs_to_events,
+    run_day_numbers,
+    to_day_numbers,
+)
+
+MARKET_TAG = "MARKET"
+_SECTOR_PREFIX = "SECTOR:"
+
+
+def sector_tag(sector: str) -> str:
+    return f"{_SECTOR_PREFIX}{str(sector).strip().upper()}"
+
+
+def normalize_tag(tag: object) -> str:
+    """Tickers, 'market' and 'sector:<name>' tags compare case-insensitively."""
+    text = str(tag).strip().upper()
+    if text.startswith(_SECTOR_PREFIX):
+        return sector_tag(text[len(_SECTOR_PREFIX):])
+    return text
+
+
+def ticker_tags(ticker: str, sector_map: Optional[Mapping[str, str]] = None) -> List[str]:
+    """Tags whose events concern a ticker: the ticker itself, its sector (if known) and the market."""
+    upper = ticker.upper()
+    tags = [upper]
+    sector = (sector_map or {}).get(upper)
+    if sector:
+        tags.append(sector_tag(sector))
+    tags.append(MARKET_TAG)
+    return tags
+
+
+def event_tags(event: Mapping) -> List[str]:
+    """An event's tags: its `tags` list (or "|"/","-separated string) plus its `ticker`, if any."""
+    tags = event.get("tags")
+    if isinstance(tags, str):
+        tags = tags.replace(",", "|").split("|")
+    elif isinstance(tags, np.ndarray):
+        tags = tags.tolist()
+    tags = list(tags) if isinstance(tags, (list, tuple, set, frozenset)) else []
+    ticker = event.get("ticker")
+    if isinstance(ticker, str) and ticker.strip():
+        tags.append(ticker)
+    return list(dict.fromkeys(normalize_tag(t) for t in tags if t is not None and str(t).strip()))
+
+
+def load_sector_map(path: str | Path) -> Dict[str, str]:
+    """Read ticker -> sector from a JSON object or a CSV with ticker and sector columns."""
+    path = Path(path)
+    if path.suffix.lower() == ".json":
+        raw = json.loads(path.read_text())
+    else:
+        frame = pd.read_csv(path, dtype=str)
+        raw = dict(zip(frame["ticker"], frame["sector"]))
+    return {str(t).strip().upper(): str(s).strip() for t, s in raw.items() if str(s).strip()}
+
+
+class EventIndex:
+    """
+    Inverted index from tag to the events carrying it.
+
+    Each event is stored once, in global (date, headline) order; a tag's posting list
+    holds ascending event ids, so its day numbers are sorted and can be interval-joined
+    directly against run start days.
+    """
+
+    def __init__(self, events: Iterable[dict]) -> None:
+        dated = [ev for ev in map(ensure_timestamp_event, events) if isinstance(ev.get("date"), pd.Timestamp)]
+        dated.sort(key=lambda ev: (ev["date"], ev.get("headline") or ""))
+        self.events: List[dict] = dated
+        self.days = to_day_numbers([ev["date"] for ev in dated])
+
+        postings: Dict[str, List[int]] = {}
+        for event_id, ev in enumerate(dated):
+            for tag in event_tags(ev):
+                postings.setdefault(tag, []).append(event_id)
+        self.postings: Dict[str, np.ndarray] = {tag: np.asarray(ids, dtype=np.int64) for tag, ids in postings.items()}
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def tags(self) -> List[str]:
+        return sorted(self.postings)
+
+    def events_for(self, tags: Iterable[str]) -> List[dict]:
+        """Events carrying any of the tags, once each, in (date, headline) order."""
+        ids = [self.postings[t] for t in map(normalize_tag, tags) if t in self.postings]
+        if not ids:
+            return []
+        return [self.events[i] for i in np.unique(np.concatenate(ids)).tolist()]
+
+
+@dataclass(frozen=True)
+class UniverseMatches:
+    """
+    Flat (run, event, day offset) matches for a universe of runs.
+
+    Rows are grouped by run position and ordered within a run like
+    correlate_runs_with_events; events are referenced by id into index.events and
+    only copied when a ticker's correlations are materialized.
+    """
+
+    runs: pd.DataFrame
+    index: EventIndex
+    run_pos: np.ndarray
+    event_ids: np.ndarray
+    day_offsets: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.run_pos.shape[0])
+
+    def correlations_for_ticker(self, ticker: str, ticker_col: str = "ticker") -> Dict[int, List[dict]]:
+        """The correlate_runs_with_events result for one ticker's runs."""
+        positions = np.flatnonzero((self.runs[ticker_col].astype(str).str.upper() == ticker.upper()).to_numpy())
+        run_ids = self.runs["run_id"].to_numpy()
+        correlations: Dict[int, List[dict]] = {int(run_ids[p]): [] for p in positions}
+        lo = np.searchsorted(self.run_pos, positions, side="left")
+        hi = np.searchsorted(self.run_pos, positions, side="right")
+        for pos, a, b in zip(positions.tolist(), lo.tolist(), hi.tolist()):
+            matched = correlations[int(run_ids[pos])]
+            for event_id, offset in zip(self.event_ids[a:b].tolist(), self.day_offsets[a:b].tolist()):
+                enriched = dict(self.index.events[event_id])
+                enriched["days_from_run_start"] = offset
+                matched.append(enriched)
+        return correlations
+
+
+def match_universe(
+    runs_df: pd.DataFrame,
+    index: EventIndex,
+    sector_map: Optional[Mapping[str, str]] = None,
+    window_days: int = 2,
+    ticker_col: str = "ticker",
+) -> UniverseMatches:
+    """
+    Match a long runs table (one row per run, with a ticker column) against tagged events.
+
+    Every tag is resolved once: its posting list is interval-joined against the start
+    days of all runs whose ticker carries the tag, so a market-wide event is matched
+    for the whole universe without being copied into each ticker's event list.
+
+    Matches are plain window matches (as correlate_runs_with_events); the relevance ranking
+    of the single-ticker pipeline, which fits its TF-IDF vocabulary on one ticker's events,
+    is not applied, so the pipeline and run_spa_eval keep using fetch_events_for_ticker.
+    """
+    runs = runs_df.reset_index(drop=True)
+    empty = np.empty(0, dtype=np.int64)
+    if runs.empty or len(index) == 0:
+        return UniverseMatches(runs, index, empty, empty, empty)
+
+    start_days, valid = run_day_numbers(runs)
+    codes, tickers = pd.factorize(runs[ticker_col].astype(str).str.upper())
+    tag_to_codes: Dict[str, List[int]] = {}
+    for code, ticker in enumerate(tickers):
+        for tag in ticker_tags(ticker, sector_map):
+            tag_to_codes.setdefault(tag, []).append(code)
+
+    pos_parts, id_parts, offset_parts = [], [], []
+    for tag, tag_codes in tag_to_codes.items():
+        posting = index.postings.get(tag)
+        if posting is None:
+            continue
+        positions = np.flatnonzero(np.isin(codes, tag_codes) & valid)
+        run_idx, ev_idx, offsets = match_runs_to_events(start_days[positions], index.days[posting], window_days)
+        pos_parts.append(positions[run_idx])
+        id_parts.append(posting[ev_idx])
+        offset_parts.append(offsets)
+    if not pos_parts:
+        return UniverseMatches(runs, index, empty, empty, empty)
+
+    run_pos = np.concatenate(pos_parts)
+    event_ids = np.concatenate(id_parts)
+    offsets = np.concatenate(offset_parts)
+    order = np.lexsort((event_ids, np.abs(offsets), run_pos))
+    run_pos, event_ids, offsets = run_pos[order], event_ids[order], offsets[order]
+    # An event tagged with several of a ticker's tags matches its runs once.
+    keep = np.r_[True, (run_pos[1:] != run_pos[:-1]) | (event_ids[1:] != event_ids[:-1])]
+    return UniverseMatches(runs, index, run_pos[keep], event_ids[keep], offsets[keep])
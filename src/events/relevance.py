@@ -0,0 +1,245 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from itertools import chain
+from typing import Dict, List, Mapping, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.config_spa import SPA_MAX_EVENTS_PER_RUN_DEFAULT
+from src.events.correlate import ensure_timestamp_event, match_runs_to_events, run_day_numbers, to_day_numbers
+from src.events.dedupe import normalize_headlines
+from src.events.fanout import event_tags
+
+# Relative trust in an event by source; unknown sources get _UNKNOWN_SOURCE_WEIGHT.
+DEFAULT_SOURCE_WEIGHTS: Dict[str, float] = {
+    "press release": 1.0,
+    "newswire": 0.9,
+    "reuters": 0.9,
+    "bloomberg": 0.9,
+    "analyst": 0.7,
+    "blog": 0.4,
+}
+_UNKNOWN_SOURCE_WEIGHT = 0.5
+
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in inc is it its of on or the to with new after over says".split()
+)
+
+
+@dataclass(frozen=True)
+class RelevanceWeights:
+    """Weights of the three relevance components, each of which lies in [0, 1]."""
+
+    proximity: float = 0.5
+    source: float = 0.2
+    text: float = 0.3
+
+
+@dataclass(frozen=True)
+class SparseRows:
+    """Row-normalized TF-IDF vectors in CSR form (indptr, column indices, values)."""
+
+    indptr: np.ndarray
+    indices: np.ndarray
+    data: np.ndarray
+    n_cols: int
+
+    @property
+    def n_rows(self) -> int:
+        return int(self.indptr.shape[0] - 1)
+
+
+class TfidfVocabulary:
+    """Vocabulary and smoothed IDF fitted on a corpus of headlines in one vectorized pass."""
+
+    def __init__(self, texts: Sequence[str]) -> None:
+        rows, terms = _tokenize(texts)
+        codes, uniques = pd.factorize(terms)
+        self.terms: Dict[str, int] = {term: i for i, term in enumerate(uniques.tolist())}
+        doc_terms = np.unique(rows * max(len(uniques), 1) + codes) % max(len(uniques), 1)
+        df = np.bincount(doc_terms, minlength=len(uniques))
+        self.idf = np.log((1.0 + len(texts)) / (1.0 + df)) + 1.0
+
+    def transform(self, texts: Sequence[str]) -> SparseRows:
+        """L2-normalized TF-IDF rows; terms outside the vocabulary are ignored."""
+        rows, terms = _tokenize(texts)
+        n_cols = len(self.terms)
+        cols = pd.Series(terms, dtype=object).map(self.terms).to_numpy(dtype=float, na_value=np.nan)
+        known = ~np.isnan(cols)
+        keys, counts = np.unique(rows[known] * max(n_cols, 1) + cols[known].astype(np.int64), return_counts=True)
+        row_of = keys // max(n_cols, 1)
+        col_of = keys % max(n_cols, 1)
+        values = counts * self.idf[col_of]
+        norms = np.sqrt(np.bincount(row_of, weights=values * values, minlength=len(texts)))
+        values = values / np.where(norms[row_of] > 0, norms[row_of], 1.0)
+        indptr = np.r_[0, np.cumsum(np.bincount(row_of, minlength=len(texts)))]
+        return SparseRows(indptr, col_of, values, n_cols)
+
+
+def pair_cosine(left: SparseRows, left_rows: np.ndarray, right: SparseRows, right_rows: np.ndarray) -> np.ndarray:
+    """
+    Dot products of left[left_rows[p]] and right[right_rows[p]] for every pair p.
+
+    Only the left rows are expanded per pair; each of their non-zeros is looked up by
+    (right row, column) in right's sorted CSR keys with one searchsorted, so there is no
+    Python loop per pair.
+    """
+    n_pairs = int(left_rows.shape[0])
+    if n_pairs == 0:
+        return np.empty(0, dtype=np.float64)
+    n_cols = max(left.n_cols, right.n_cols, 1)
+    # CSR rows are built from sorted (row, column) keys, so these keys are already ascending.
+    right_keys = np.repeat(np.arange(right.n_rows, dtype=np.int64), np.diff(right.indptr)) * n_cols + right.indices
+    pair, idx = _expand(left, left_rows)
+    wanted = right_rows[pair] * n_cols + left.indices[idx]
+    hit = np.minimum(np.searchsorted(right_keys, wanted), max(right_keys.shape[0] - 1, 0))
+    found = right_keys[hit] == wanted if right_keys.shape[0] else np.zeros(wanted.shape[0], dtype=bool)
+    products = left.data[idx[found]] * right.data[hit[found]]
+    return np.bincount(pair[found], weights=products, minlength=n_pairs)
+
+
+def source_weights(events: Sequence[Mapping], weights: Optional[Mapping[str, float]] = None) -> np.ndarray:
+    """Per-event source weight: the best of its `sources` (collapsed duplicates) or its `source`."""
+    table = {k.lower(): v for k, v in (weights or DEFAULT_SOURCE_WEIGHTS).items()}
+    out = np.empty(len(events), dtype=np.float64)
+    for i, ev in enumerate(events):
+        names = ev.get("sources") or [ev.get("source")]
+        out[i] = max(table.get(str(name or "").strip().lower(), _UNKNOWN_SOURCE_WEIGHT) for name in names)
+    return out
+
+
+def company_profiles(
+    vocabulary: TfidfVocabulary,
+    tickers: Sequence[str],
+    events: Sequence[Mapping],
+    event_vectors: SparseRows,
+    company_texts: Optional[Mapping[str, str]] = None,
+) -> SparseRows:
+    """
+    One TF-IDF row per ticker: its company text (ticker symbol plus any description) and
+    the centroid of the headlines tagged with that ticker, L2-normalized.
+    """
+    texts = [f"{t} {(company_texts or {}).get(t, '')}" for t in tickers]
+    own = vocabulary.transform(texts)
+    position = {t: i for i, t in enumerate(tickers)}
+    owner_rows, event_rows = [], []
+    for event_id, ev in enumerate(events):
+        for tag in event_tags(ev):
+            if tag in position:
+                owner_rows.append(position[tag])
+                event_rows.append(event_id)
+    ev_pair, ev_idx = _expand(event_vectors, np.asarray(event_rows, dtype=np.int64))
+    own_pair = np.repeat(np.arange(len(tickers), dtype=np.int64), np.diff(own.indptr))
+    rows = np.r_[own_pair, np.asarray(owner_rows, dtype=np.int64)[ev_pair]]
+    cols = np.r_[own.indices, event_vectors.indices[ev_idx]]
+    values = np.r_[own.data, event_vectors.data[ev_idx]]
+
+    n_cols = max(vocabulary.idf.shape[0], 1)
+    keys, inverse = np.unique(rows * n_cols + cols, return_inverse=True)
+    summed = np.bincount(inverse, weights=values, minlength=keys.shape[0])
+    row_of, col_of = keys // n_cols, keys % n_cols
+    norms = np.sqrt(np.bincount(row_of, weights=summed * summed, minlength=len(tickers)))
+    summed = summed / np.where(norms[row_of] > 0, norms[row_of], 1.0)
+    indptr = np.r_[0, np.cumsum(np.bincount(row_of, minlength=len(tickers)))]
+    return SparseRows(indptr, col_of, summed, vocabulary.idf.shape[0])
+
+
+def score_matches(
+    day_offsets: np.ndarray,
+    window_days: int,
+    source_weight: np.ndarray,
+    text_similarity: np.ndarray,
+    weights: RelevanceWeights = RelevanceWeights(),
+) -> np.ndarray:
+    """Relevance of each (run, event) match from its day offset, source weight and text similarity."""
+    proximity = 1.0 - np.abs(day_offsets) / (window_days + 1.0)
+    return weights.proximity * proximity + weights.source * source_weight + weights.text * text_similarity
+
+
+def top_k_per_run(run_idx: np.ndarray, scores: np.ndarray, tie_break: np.ndarray, top_k: int) -> np.ndarray:
+    """Indices of matches ordered by run, then score descending; at most top_k per run (0 keeps all)."""
+    order = np.lexsort((tie_break, -scores, run_idx))
+    if top_k <= 0 or order.size == 0:
+        return order
+    grouped = run_idx[order]
+    group_start = np.r_[True, grouped[1:] != grouped[:-1]]
+    starts = np.maximum.accumulate(np.where(group_start, np.arange(order.size), 0))
+    return order[np.arange(order.size) - starts < top_k]
+
+
+def correlate_runs_by_relevance(
+    runs_df: pd.DataFrame,
+    events: List[dict],
+    ticker: str,
+    window_days: int = 2,
+    top_k: int = SPA_MAX_EVENTS_PER_RUN_DEFAULT,
+    company_text: Optional[str] = None,
+    weights: RelevanceWeights = RelevanceWeights(),
+    source_weight_map: Optional[Mapping[str, float]] = None,
+) -> Dict[int, List[dict]]:
+    """
+    Like correlate_runs_with_events, but each run keeps its top_k events by relevance.
+
+    The ticker's events are vectorized once (TF-IDF over their headlines) and all
+    (run, event) pairs in the window are scored in one batch. Matched events gain
+    `relevance` and `days_from_run_start` and are ordered by relevance.
+    """
+    if runs_df is None or runs_df.empty:
+        return {}
+
+    dated = [ev for ev in map(ensure_timestamp_event, events or []) if isinstance(ev.get("date"), pd.Timestamp)]
+    dated.sort(key=lambda ev: (ev["date"], ev.get("headline") or ""))
+    run_ids = [int(run_id) for run_id in runs_df["run_id"]]
+    correlations: Dict[int, List[dict]] = {run_id: [] for run_id in run_ids}
+    if not dated:
+        return correlations
+
+    start_days, valid = run_day_numbers(runs_df)
+    run_idx, event_idx, offsets = match_runs_to_events(
+        start_days[valid], to_day_numbers([ev["date"] for ev in dated]), window_days
+    )
+    if run_idx.size == 0:
+        return correlations
+
+    headlines = [str(ev.get("headline") or "") for ev in dated]
+    vocabulary = TfidfVocabulary(headlines)
+    vectors = vocabulary.transform(headlines)
+    profile = company_profiles(
+        vocabulary, [ticker.upper()], dated, vectors, {ticker.upper(): company_text or ""}
+    )
+    similarity = pair_cosine(vectors, np.arange(len(dated)), profile, np.zeros(len(dated), dtype=np.int64))
+    scores = score_matches(
+        offsets, window_days, source_weights(dated, source_weight_map)[event_idx], similarity[event_idx], weights
+    )
+    keep = top_k_per_run(run_idx, scores, np.abs(offsets) * len(dated) + event_idx, top_k)
+
+    run_positions = np.flatnonzero(valid)
+    for r, e, offset, score in zip(
+        run_idx[keep].tolist(), event_idx[keep].tolist(), offsets[keep].tolist(), scores[keep].tolist()
+    ):
+        enriched = dict(dated[e])
+        enriched["days_from_run_start"] = offset
+        enriched["relevance"] = round(score, 4)
+        correlations[run_ids[run_positions[r]]].append(enriched)
+    return correlations
+
+
+def _tokenize(texts: Sequence[str]) -> tuple:
+    """Flat (row, term) arrays of normalized, stopword-free tokens."""
+    tokens = [[w for w in text.split() if w not in _STOPWORDS] for text in normalize_headlines(texts)]
+    counts = np.fromiter((len(t) for t in tokens), dtype=np.int64, count=len(tokens))
+    rows = np.repeat(np.arange(len(tokens), dtype=np.int64), counts)
+    terms = np.fromiter(chain.from_iterable(tokens), dtype=object, count=int(counts.sum()))
+    return rows, terms
+
+
+def _expand(matrix: SparseRows, rows: np.ndarray) -> tuple:
+    """(pair index, non-zero position) for every stored entry of matrix[rows[p]]."""
+    starts = matrix.indptr[rows]
+    lengths = matrix.indptr[rows + 1] - starts
+    pair = np.repeat(np.arange(rows.shape[0], dtype=np.int64), lengths)
+    offsets = np.cumsum(lengths) - lengths
+    position = np.arange(int(lengths.sum()), dtype=np.int64) - np.repeat(offsets - starts, lengths)
+    return pair, position
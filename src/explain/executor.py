@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, List, Sequence, TypeVar
+
+from src.config_spa import SPA_LLM_MAX_CONCURRENCY_DEFAULT
+
+T = TypeVar("T")
+
+
+def run_in_order(
+    tasks: Sequence[Callable[[], T]],
+    max_workers: int = SPA_LLM_MAX_CONCURRENCY_DEFAULT,
+) -> List[T]:
+    """
+    Run blocking tasks (typically LLM calls) on a bounded thread pool.
+
+    Results come back in task order regardless of completion order. The first exception
+    cancels tasks that have not started yet and is re-raised to the caller.
+    """
+    if max_workers <= 1 or len(tasks) <= 1:
+        return [task() for task in tasks]
+
+    pool = ThreadPoolExecutor(max_workers=min(max_workers, len(tasks)), thread_name_prefix="spa-llm")
+    try:
+        futures = [pool.submit(task) for task in tasks]
+        return [future.result() for future in futures]
+    except BaseException:
+        pool.shutdown(wait=True, cancel_futures=True)
+        raise
+    finally:
+        pool.shutdown(wait=True)
+
+
+_STREAM_DONE = object()
+
+
+def stream_in_order(
+    streams: Sequence[Iterable[T]],
+    max_workers: int = SPA_LLM_MAX_CONCURRENCY_DEFAULT,
+) -> List[Iterator[T]]:
+    """
+    Start consuming streams (typically streamed LLM responses) on a bounded thread pool.
+
+    Returns one iterator per stream that replays its chunks as they arrive, so a caller
+    rendering the streams one after another is not waiting for later requests to start.
+    An exception raised by a stream is re-raised from its iterator.
+    """
+    if max_workers <= 1 or len(streams) <= 1:
+        return [iter(stream) for stream in streams]
+
+    buffers: List[queue.Queue] = [queue.Queue() for _ in streams]
+
+    def _consume(stream: Iterable[T], buffer: queue.Queue) -> None:
+        try:
+            for chunk in stream:
+                buffer.put(chunk)
+        except BaseException as exc:
+            buffer.put(exc)
+        buffer.put(_STREAM_DONE)
+
+    pool = ThreadPoolExecutor(max_workers=min(max_workers, len(streams)), thread_name_prefix="spa-llm-stream")
+    for stream, buffer in zip(streams, buffers):
+        pool.submit(_consume, stream, buffer)
+    pool.shutdown(wait=False)
+    return [_replay(buffer) for buffer in buffers]
+
+
+def _replay(buffer: queue.Queue) -> Iterator:
+    while True:
+        item = buffer.get()
+        if item is _STREAM_DONE:
+            return
+        if isinstance(item, BaseException):
+            raise item
+        yield item
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Union
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, List, Sequence, Tuple, Union
 
 import pandas as pd
 
@@ -9,8 +11,69 @@ from src.config_spa import (
     SPA_MAX_EXPLANATION_TOKENS_DEFAULT,
 )
 
-from .prompt_builder import build_run_explanation_prompt
-from .llm_client import generate_explanation_from_prompt
+from .prompt_builder import build_batch_explanation_prompt, build_run_explanation_prompt
+from .llm_client import (
+    ExplanationStream,
+    LLMQuotaExceededError,
+    TokenUsage,
+    estimate_prompt_tokens,
+    generate_explanation_from_prompt,
+    generate_explanation_with_usage,
+    stream_explanation_from_prompt,
+)
+from .prompt_budget import PromptBudget, estimate_tokens
+
+# Output tokens reserved per run for the JSON key and quoting around its summary.
+_JSON_OVERHEAD_TOKENS_PER_RUN = 12
+
+
+@dataclass
+class BatchExplanationStats:
+    """
+    Request and (estimated) input-token savings of batched explanations versus one request per run.
+
+    input_tokens/output_tokens total the usage actually reported for the requests made.
+    """
+
+    runs: int = 0
+    requests: int = 0
+    fallback_runs: int = 0
+    input_tokens_single: int = 0
+    input_tokens_sent: int = 0
+    input_tokens: int = 0
+    output_tokens: int = 0
+
+    @property
+    def requests_saved(self) -> int:
+        return self.runs - self.requests
+
+    @property
+    def input_tokens_saved(self) -> int:
+        return self.input_tokens_single - self.input_tokens_sent
+
+    def add(self, other: "BatchExplanationStats") -> None:
+        self.runs += other.runs
+        self.requests += other.requests
+        self.fallback_runs += other.fallback_runs
+        self.input_tokens_single += other.input_tokens_single
+        self.input_tokens_sent += other.input_tokens_sent
+        self.input_tokens += other.input_tokens
+        self.output_tokens += other.output_tokens
+
+    def add_usage(self, usage: TokenUsage) -> None:
+        self.input_tokens += usage.input_tokens
+        self.output_tokens += usage.output_tokens
+
+    def as_dict(self) -> Dict[str, int]:
+        return {
+            "runs": self.runs,
+            "requests": self.requests,
+            "requests_saved": self.requests_saved,
+            "fallback_runs": self.fallback_runs,
+            "input_tokens_saved": self.input_tokens_saved,
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+        }
 
 
 def explain_single_run(
@@ -37,18 +100,195 @@ def explain_run_with_events(
     This must never include predictions or investment advice; it should only describe
     past price behavior and contextual public events.
     """
+    text, _ = explain_run_with_usage(ticker, run_row, events, max_tokens)
+    return text
+
+
+def explain_run_with_usage(
+    ticker: str,
+    run_row: Union[Dict[str, Any], pd.Series],
+    events: List[Dict[str, Any]],
+    max_tokens: int = 400,
+) -> Tuple[str, TokenUsage]:
+    """Like explain_run_with_events, also returning the tokens the request consumed."""
     run_dict = run_row.to_dict() if isinstance(run_row, pd.Series) else dict(run_row)
     run_dict["ticker"] = ticker
 
     prompt = build_run_explanation_prompt(run_dict, events or [])
     try:
         effective_tokens = min(max_tokens, SPA_MAX_EXPLANATION_TOKENS_DEFAULT)
-        return generate_explanation_from_prompt(
+        return generate_explanation_with_usage(
             prompt,
             max_tokens=effective_tokens,
             temperature=0.0,
             model=SPA_LLM_MODEL_DEFAULT,
         )
+    except LLMQuotaExceededError:
+        # Quota exhaustion affects every remaining run, so let the caller stop the batch.
+        raise
     except Exception as exc:
         print(f"[SPA] Warning: explanation skipped for {ticker} run_id={run_dict.get('run_id')}: {exc}")
-        return ""
+        return "", TokenUsage()
+
+
+def stream_run_explanation(
+    ticker: str,
+    run_row: Union[Dict[str, Any], pd.Series],
+    events: List[Dict[str, Any]],
+    max_tokens: int = 400,
+) -> ExplanationStream:
+    """
+    Stream the explanation explain_run_with_events would return, chunk by chunk.
+
+    Uses the same prompt and request settings, so either path can serve the other's cache.
+    """
+    run_dict = run_row.to_dict() if isinstance(run_row, pd.Series) else dict(run_row)
+    run_dict["ticker"] = ticker
+
+    prompt = build_run_explanation_prompt(run_dict, events or [])
+    return stream_explanation_from_prompt(
+        prompt,
+        max_tokens=min(max_tokens, SPA_MAX_EXPLANATION_TOKENS_DEFAULT),
+        temperature=0.0,
+        model=SPA_LLM_MODEL_DEFAULT,
+    )
+
+
+def explain_runs_batched(
+    ticker: str,
+    run_rows: Sequence[Union[Dict[str, Any], pd.Series]],
+    events_by_run: Dict[int, List[Dict[str, Any]]],
+    max_tokens: int = 400,
+) -> Tuple[Dict[int, str], Dict[int, TokenUsage], BatchExplanationStats]:
+    """
+    Explain several runs of one ticker with a single request and split the JSON reply by run_id.
+
+    Runs missing from the reply, or whose entry is not a non-empty string, are explained
+    with individual requests. A batch whose prompt would exceed the prompt token budget even
+    after trimming events is split in half and each half requested on its own. Returns the
+    explanation and token usage per run_id (a batched request's usage is shared out by prompt
+    and answer size) and the request/token accounting against explaining every run separately.
+    """
+    runs = [row.to_dict() if isinstance(row, pd.Series) else dict(row) for row in run_rows]
+    for run in runs:
+        run["ticker"] = ticker
+    run_ids = [int(run.get("run_id")) for run in runs]
+    prompt = build_batch_explanation_prompt(ticker, runs, events_by_run) if len(runs) > 1 else ""
+    if len(runs) > 1 and estimate_tokens(prompt) > PromptBudget().max_input_tokens:
+        middle = len(runs) // 2
+        texts, usage, stats = explain_runs_batched(ticker, runs[:middle], events_by_run, max_tokens)
+        more_texts, more_usage, more_stats = explain_runs_batched(ticker, runs[middle:], events_by_run, max_tokens)
+        texts.update(more_texts)
+        usage.update(more_usage)
+        stats.add(more_stats)
+        return texts, usage, stats
+
+    single_prompts = {
+        run_id: build_run_explanation_prompt(run, events_by_run.get(run_id) or []) for run_id, run in zip(run_ids, runs)
+    }
+    stats = BatchExplanationStats(
+        runs=len(runs),
+        input_tokens_single=sum(estimate_prompt_tokens(p) for p in single_prompts.values()),
+    )
+
+    texts: Dict[int, str] = {}
+    usage: Dict[int, TokenUsage] = {run_id: TokenUsage() for run_id in run_ids}
+    if len(runs) > 1:
+        per_run_tokens = min(max_tokens, SPA_MAX_EXPLANATION_TOKENS_DEFAULT)
+        stats.requests += 1
+        stats.input_tokens_sent += estimate_prompt_tokens(prompt)
+        try:
+            raw, batch_usage = generate_explanation_with_usage(
+                prompt,
+                max_tokens=(per_run_tokens + _JSON_OVERHEAD_TOKENS_PER_RUN) * len(runs),
+                temperature=0.0,
+                model=SPA_LLM_MODEL_DEFAULT,
+                response_format="json_object",
+            )
+            texts = parse_batch_explanations(raw, run_ids)
+            stats.add_usage(batch_usage)
+            usage = _share_batch_usage(batch_usage, run_ids, single_prompts, texts)
+        except LLMQuotaExceededError:
+            raise
+        except Exception as exc:
+            print(f"[SPA] Warning: batched explanation failed for {ticker} runs {run_ids}: {exc}")
+
+    for run_id, run in zip(run_ids, runs):
+        if run_id in texts:
+            continue
+        if len(runs) > 1:
+            stats.fallback_runs += 1
+        stats.requests += 1
+        stats.input_tokens_sent += estimate_prompt_tokens(single_prompts[run_id])
+        texts[run_id], run_usage = explain_run_with_usage(
+            ticker, pd.Series(run), events_by_run.get(run_id) or [], max_tokens
+        )
+        stats.add_usage(run_usage)
+        usage[run_id] = usage[run_id] + run_usage
+    return texts, usage, stats
+
+
+def _share_batch_usage(
+    batch_usage: TokenUsage,
+    run_ids: Sequence[int],
+    single_prompts: Dict[int, str],
+    texts: Dict[int, str],
+) -> Dict[int, TokenUsage]:
+    """Split one batched request's usage across its runs: input by prompt size, output by answer size."""
+    if batch_usage.cached:
+        return {run_id: TokenUsage(cached=True, batch_size=len(run_ids)) for run_id in run_ids}
+    input_shares = _apportion(batch_usage.input_tokens, [estimate_tokens(single_prompts[r]) for r in run_ids])
+    output_shares = _apportion(batch_usage.output_tokens, [estimate_tokens(texts.get(r, "")) for r in run_ids])
+    return {
+        run_id: TokenUsage(
+            input_tokens=input_tokens,
+            output_tokens=output_tokens,
+            estimated=batch_usage.estimated,
+            batch_size=len(run_ids),
+        )
+        for run_id, input_tokens, output_tokens in zip(run_ids, input_shares, output_shares)
+    }
+
+
+def _apportion(total: int, weights: Sequence[int]) -> List[int]:
+    """Integer shares of total proportional to weights (equal when all weights are zero), summing to total."""
+    if not weights:
+        return []
+    weight_sum = sum(weights)
+    if weight_sum <= 0:
+        weights, weight_sum = [1] * len(weights), len(weights)
+    shares = [total * w // weight_sum for w in weights]
+    shares[weights.index(max(weights))] += total - sum(shares)
+    return shares
+
+
+def parse_batch_explanations(text: str, run_ids: Sequence[int]) -> Dict[int, str]:
+    """
+    Validate a batched reply and return the usable explanation per expected run_id.
+
+    Accepts {"explanations": {"<run_id>": "..."}} or a bare {"<run_id>": "..."} object,
+    optionally inside a Markdown code fence; entries may also be {"explanation": "..."}.
+    Unknown keys are ignored and invalid entries are simply absent from the result.
+    """
+    body = text.strip()
+    if body.startswith("```"):
+        body = body.strip("`")
+        body = body[body.find("{"):] if "{" in body else body
+    try:
+        payload = json.loads(body)
+    except json.JSONDecodeError:
+        return {}
+    if not isinstance(payload, dict):
+        return {}
+    entries = payload.get("explanations", payload)
+    if not isinstance(entries, dict):
+        return {}
+
+    parsed: Dict[int, str] = {}
+    for run_id in run_ids:
+        value = entries.get(str(run_id))
+        if isinstance(value, dict):
+            value = value.get("explanation") or value.get("summary")
+        if isinstance(value, str) and value.strip():
+            parsed[run_id] = value.strip()
+    return parsed
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from pathlib import Path
+from typing import Dict, Optional
+
+from src.config_spa import (
+    SPA_EXPLANATION_CACHE_MAX_ENTRIES_DEFAULT,
+    SPA_EXPLANATION_CACHE_PATH_DEFAULT,
+    SPA_EXPLANATION_CACHE_TTL_SECONDS_DEFAULT,
+)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS explanations (
+    key TEXT PRIMARY KEY,
+    model TEXT NOT NULL,
+    text TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    last_accessed REAL NOT NULL,
+    hit_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_explanations_last_accessed ON explanations (last_accessed);
+"""
+
+
+class ExplanationCacheMissError(RuntimeError):
+    """Raised in cache-only mode when no cached explanation exists for a prompt."""
+
+
+def explanation_cache_key(
+    system_message: str,
+    prompt: str,
+    model: str,
+    max_tokens: int,
+    temperature: float,
+    response_format: Optional[str] = None,
+) -> str:
+    """Content address for a chat request: SHA-256 over every input that shapes the response."""
+    fields = {
+        "system": system_message,
+        "prompt": prompt,
+        "model": model,
+        "max_tokens": int(max_tokens),
+        "temperature": float(temperature),
+    }
+    # Only structured requests carry a format, so plain-text keys stay unchanged.
+    if response_format is not None:
+        fields["response_format"] = response_format
+    payload = json.dumps(fields, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ExplanationCache:
+    """
+    SQLite-backed store of LLM explanations with TTL and LRU size eviction.
+
+    Safe to share between threads: every call opens its own connection and the in-process
+    hit/miss counters are updated under a lock.
+    """
+
+    def __init__(
+        self,
+        path: str | Path = SPA_EXPLANATION_CACHE_PATH_DEFAULT,
+        ttl_seconds: int = SPA_EXPLANATION_CACHE_TTL_SECONDS_DEFAULT,
+        max_entries: int = SPA_EXPLANATION_CACHE_MAX_ENTRIES_DEFAULT,
+    ) -> None:
+        self.path = Path(path)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(1, int(max_entries))
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.executescript(_SCHEMA)
+
+    def get(self, key: str) -> Optional[str]:
+        """Return the cached explanation for key, or None on a miss or expired entry."""
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            row = conn.execute("SELECT text, created_at FROM explanations WHERE key = ?", (key,)).fetchone()
+            if row is not None and self._expired(row[1], now):
+                conn.execute("DELETE FROM explanations WHERE key = ?", (key,))
+                row = None
+            if row is None:
+                with self._lock:
+                    self.misses += 1
+                return None
+            conn.execute(
+                "UPDATE explanations SET last_accessed = ?, hit_count = hit_count + 1 WHERE key = ?",
+                (now, key),
+            )
+        with self._lock:
+            self.hits += 1
+        return row[0]
+
+    def put(self, key: str, text: str, model: str) -> None:
+        """Store an explanation, then drop expired entries and trim to max_entries."""
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO explanations (key, model, text, created_at, last_accessed, hit_count) "
+                "VALUES (?, ?, ?, ?, ?, 0)",
+                (key, model, text, now, now),
+            )
+            if self.ttl_seconds > 0:
+                conn.execute("DELETE FROM explanations WHERE created_at < ?", (now - self.ttl_seconds,))
+            conn.execute(
+                "DELETE FROM explanations WHERE key IN ("
+                "SELECT key FROM explanations ORDER BY last_accessed DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+
+    def clear(self) -> None:
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM explanations")
+
+    def stats(self) -> Dict[str, int]:
+        """Return in-process hit/miss counters and the number of stored entries."""
+        with closing(self._connect()) as conn:
+            entries = conn.execute("SELECT COUNT(*) FROM explanations").fetchone()[0]
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        return {"hits": hits, "misses": misses, "entries": int(entries)}
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds > 0 and created_at < now - self.ttl_seconds
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30.0)
+        conn.execute("PRAGMA journal_mode=WAL")
+        return conn
+
+
+_cache: Optional[ExplanationCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_explanation_cache() -> ExplanationCache:
+    """Return a shared ExplanationCache built from SPA_EXPLANATION_CACHE_* settings."""
+    global _cache
+
+    with _cache_lock:
+        if _cache is None:
+            _cache = ExplanationCache()
+    return _cache
@@ -2,23 +2,96 @@ from __future__ import annotations
 
 import os
 import sys
-from typing import Optional
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from dotenv import load_dotenv
-from openai import OpenAI
+from openai import APIConnectionError, APITimeoutError, OpenAI
+
+from src.config_spa import (
+    SPA_EXPLANATION_CACHE_MODE_DEFAULT,
+    SPA_LLM_BACKOFF_BASE_MS_DEFAULT,
+    SPA_LLM_BACKOFF_MAX_MS_DEFAULT,
+    SPA_LLM_MAX_RETRIES_DEFAULT,
+    SPA_LLM_REQUESTS_PER_MINUTE_DEFAULT,
+    SPA_LLM_TOKENS_PER_MINUTE_DEFAULT,
+)
+
+from .explanation_cache import (
+    ExplanationCacheMissError,
+    explanation_cache_key,
+    get_explanation_cache,
+)
+from .prompt_budget import estimate_tokens
+from .rate_limit import RateLimiter, backoff_delay
 
 load_dotenv()
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4.1-mini")
+# Optional OpenAI-compatible endpoint, e.g. a local stand-in server for tests.
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL") or None
 
 _client: Optional[OpenAI] = None
+_rate_limiter: Optional[RateLimiter] = None
+_init_lock = threading.Lock()
+
+_SYSTEM_MESSAGE = (
+    "You are a neutral financial historian. Only describe historical price movements. "
+    "Never predict future performance, give outlook statements, or offer investment recommendations. "
+    "Avoid directives such as 'you should buy/sell/hold.'"
+)
+
+_CACHE_MODES = ("readwrite", "cache_only", "off")
+
+# Chat formatting tokens added per message on top of its content.
+_TOKENS_PER_MESSAGE = 4
+
+
+@dataclass(frozen=True)
+class TokenUsage:
+    """
+    Tokens billed for one explanation.
+
+    Cached answers cost nothing; estimated marks counts taken locally because the provider
+    reported no usage, and batch_size > 1 marks a share apportioned from a batched request.
+    """
+
+    input_tokens: int = 0
+    output_tokens: int = 0
+    cached: bool = False
+    estimated: bool = False
+    batch_size: int = 1
+
+    def __add__(self, other: "TokenUsage") -> "TokenUsage":
+        return TokenUsage(
+            input_tokens=self.input_tokens + other.input_tokens,
+            output_tokens=self.output_tokens + other.output_tokens,
+            cached=self.cached and other.cached,
+            estimated=self.estimated or other.estimated,
+            batch_size=max(self.batch_size, other.batch_size),
+        )
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "input_tokens": self.input_tokens,
+            "output_tokens": self.output_tokens,
+            "cached": self.cached,
+            "estimated": self.estimated,
+            "batch_size": self.batch_size,
+        }
 
 
 class LLMQuotaExceededError(RuntimeError):
     """Raised when the LLM provider reports insufficient quota (HTTP 429)."""
 
 
+class LLMTransientError(RuntimeError):
+    """Raised when a rate-limited (429) or server-error (5xx) request still fails after all retries."""
+
+
 def _get_client() -> OpenAI:
     """Return a shared OpenAI client instance, ensuring configuration is present."""
     global _client
@@ -28,51 +101,252 @@ def _get_client() -> OpenAI:
             "OPENAI_API_KEY is not set. Populate it in your .env file before requesting explanations."
         )
 
-    if _client is None:
-        _client = OpenAI(api_key=OPENAI_API_KEY)
+    with _init_lock:
+        if _client is None:
+            # Retries are handled here with a shared limiter, so the SDK's own retry loop is disabled.
+            _client = OpenAI(api_key=OPENAI_API_KEY, base_url=OPENAI_BASE_URL, max_retries=0)
 
     return _client
 
 
+def _get_rate_limiter() -> RateLimiter:
+    """Return the process-wide limiter shared by every thread issuing LLM requests."""
+    global _rate_limiter
+
+    with _init_lock:
+        if _rate_limiter is None:
+            _rate_limiter = RateLimiter(SPA_LLM_REQUESTS_PER_MINUTE_DEFAULT, SPA_LLM_TOKENS_PER_MINUTE_DEFAULT)
+
+    return _rate_limiter
+
+
 def generate_explanation_from_prompt(
     prompt: str,
     max_tokens: int = 400,
     temperature: float = 0.0,
     model: str | None = None,
+    cache_mode: str | None = None,
+    response_format: str | None = None,
 ) -> str:
-    """Send a prompt to the configured OpenAI model and return the assistant's text."""
-    client = _get_client()
+    """
+    Send a prompt to the configured OpenAI model and return the assistant's text.
+
+    See generate_explanation_with_usage for caching and response_format.
+    """
+    text, _ = generate_explanation_with_usage(prompt, max_tokens, temperature, model, cache_mode, response_format)
+    return text
+
+
+def generate_explanation_with_usage(
+    prompt: str,
+    max_tokens: int = 400,
+    temperature: float = 0.0,
+    model: str | None = None,
+    cache_mode: str | None = None,
+    response_format: str | None = None,
+) -> Tuple[str, TokenUsage]:
+    """
+    Send a prompt to the configured OpenAI model and return the assistant's text and token usage.
+
+    Responses are cached on disk by a hash of the full request. cache_mode (default from
+    SPA_EXPLANATION_CACHE_MODE) is "readwrite", "cache_only" (raise ExplanationCacheMissError
+    instead of calling the API), or "off". response_format="json_object" requests JSON mode.
+    """
+    request, cache, cache_key, cached_text = _prepare_request(
+        prompt, max_tokens, temperature, model, cache_mode, response_format
+    )
+    if cached_text is not None:
+        return cached_text, TokenUsage(cached=True)
+
+    response = _create_with_backoff(**request)
+
+    text = ""
+    if response.choices:
+        content = getattr(response.choices[0].message, "content", None)
+        text = content.strip() if content else ""
+    if cache is not None and text:
+        cache.put(cache_key, text, model=request["model"])
+    return text, _usage_or_estimate(getattr(response, "usage", None), prompt, text)
+
+
+class ExplanationStream:
+    """
+    Iterate over an explanation's text as the model streams it (chat-completions stream=True).
+
+    Shares the explanation cache with generate_explanation_with_usage: a cached answer is
+    yielded as one chunk, and a completed stream is cached for both paths. Once iteration
+    finishes, text holds the full answer and usage the tokens it consumed. Errors before the
+    first chunk are retried like blocking requests; errors mid-stream propagate.
+    """
 
+    def __init__(
+        self,
+        prompt: str,
+        max_tokens: int = 400,
+        temperature: float = 0.0,
+        model: str | None = None,
+        cache_mode: str | None = None,
+    ) -> None:
+        self.prompt = prompt
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+        self.model = model
+        self.cache_mode = cache_mode
+        self.text = ""
+        self.usage = TokenUsage()
+
+    def __iter__(self) -> Iterator[str]:
+        request, cache, cache_key, cached_text = _prepare_request(
+            self.prompt, self.max_tokens, self.temperature, self.model, self.cache_mode, None
+        )
+        if cached_text is not None:
+            self.text, self.usage = cached_text, TokenUsage(cached=True)
+            yield cached_text
+            return
+
+        stream = _create_with_backoff(**request, stream=True, stream_options={"include_usage": True})
+        parts: List[str] = []
+        usage = None
+        for chunk in stream:
+            if getattr(chunk, "usage", None) is not None:
+                usage = chunk.usage
+            for choice in getattr(chunk, "choices", None) or []:
+                delta = getattr(getattr(choice, "delta", None), "content", None)
+                if delta:
+                    parts.append(delta)
+                    yield delta
+
+        self.text = "".join(parts).strip()
+        if cache is not None and self.text:
+            cache.put(cache_key, self.text, model=request["model"])
+        self.usage = _usage_or_estimate(usage, self.prompt, self.text)
+
+
+def stream_explanation_from_prompt(
+    prompt: str,
+    max_tokens: int = 400,
+    temperature: float = 0.0,
+    model: str | None = None,
+    cache_mode: str | None = None,
+) -> ExplanationStream:
+    """Return an ExplanationStream; nothing is requested until it is iterated."""
+    return ExplanationStream(prompt, max_tokens, temperature, model, cache_mode)
+
+
+def _prepare_request(
+    prompt: str,
+    max_tokens: int,
+    temperature: float,
+    model: str | None,
+    cache_mode: str | None,
+    response_format: str | None,
+) -> Tuple[Dict[str, Any], Any, str, Optional[str]]:
+    """Build the chat request and look it up in the cache: (request, cache or None, cache key, cached text)."""
     model_name = model or OPENAI_MODEL
+    mode = (cache_mode or SPA_EXPLANATION_CACHE_MODE_DEFAULT).lower()
+    if mode not in _CACHE_MODES:
+        raise ValueError(f"Unknown explanation cache mode '{mode}'; expected one of {_CACHE_MODES}.")
+
+    cache = get_explanation_cache() if mode != "off" else None
+    cache_key = explanation_cache_key(_SYSTEM_MESSAGE, prompt, model_name, max_tokens, temperature, response_format)
+    cached_text = None
+    if cache is not None:
+        cached_text = cache.get(cache_key)
+        if cached_text is None and mode == "cache_only":
+            raise ExplanationCacheMissError("No cached explanation for this prompt (cache-only mode).")
+
+    request: Dict[str, Any] = {
+        "model": model_name,
+        "temperature": temperature,
+        "max_tokens": max_tokens,
+        "messages": [
+            {"role": "system", "content": _SYSTEM_MESSAGE},
+            {"role": "user", "content": prompt},
+        ],
+    }
+    if response_format is not None:
+        request["response_format"] = {"type": response_format}
+    return request, cache, cache_key, cached_text
+
 
+def _usage_or_estimate(usage: Any, prompt: str, text: str) -> TokenUsage:
+    """Provider-reported usage when present, otherwise the local estimate."""
+    input_tokens = getattr(usage, "prompt_tokens", None)
+    output_tokens = getattr(usage, "completion_tokens", None)
+    if isinstance(input_tokens, int) and isinstance(output_tokens, int):
+        return TokenUsage(input_tokens=input_tokens, output_tokens=output_tokens)
+    return TokenUsage(input_tokens=estimate_prompt_tokens(prompt), output_tokens=estimate_tokens(text), estimated=True)
+
+
+def _create_with_backoff(**request: Any) -> Any:
+    """Issue a chat completion through the rate limiter, retrying 429/5xx with jittered backoff."""
+    client = _get_client()
+    limiter = _get_rate_limiter()
+    estimated_tokens = _estimate_request_tokens(request)
+    base_seconds = SPA_LLM_BACKOFF_BASE_MS_DEFAULT / 1000.0
+    max_seconds = SPA_LLM_BACKOFF_MAX_MS_DEFAULT / 1000.0
+
+    attempt = 0
+    while True:
+        limiter.acquire(estimated_tokens)
+        try:
+            return client.chat.completions.create(**request)
+        except Exception as exc:
+            message = str(exc)
+            if "insufficient_quota" in message:
+                warn = "OpenAI quota exceeded (429 insufficient_quota). Skipping explanations for this run."
+                print(f"[SPA] Warning: {warn}", file=sys.stderr)
+                raise LLMQuotaExceededError(warn) from exc
+            if not _is_transient(exc):
+                raise
+            if attempt >= SPA_LLM_MAX_RETRIES_DEFAULT:
+                raise LLMTransientError(
+                    f"LLM request failed after {attempt + 1} attempts: {message}"
+                ) from exc
+            delay = backoff_delay(attempt, base_seconds, max_seconds, retry_after=_retry_after_seconds(exc))
+            print(
+                f"[SPA] Warning: transient LLM error ({_status_code(exc) or type(exc).__name__}); "
+                f"retrying in {delay:.2f}s",
+                file=sys.stderr,
+            )
+            time.sleep(delay)
+            attempt += 1
+
+
+def estimate_prompt_tokens(prompt: str) -> int:
+    """Rough input tokens of a request carrying prompt (system message included)."""
+    return _estimate_request_tokens(
+        {"messages": [{"role": "system", "content": _SYSTEM_MESSAGE}, {"role": "user", "content": prompt}]}
+    )
+
+
+def _estimate_request_tokens(request: Dict[str, Any]) -> int:
+    """Token reservation for the limiter: estimated input tokens of every message plus the output cap."""
+    messages = request.get("messages", [])
+    input_tokens = sum(estimate_tokens(str(m.get("content", ""))) + _TOKENS_PER_MESSAGE for m in messages)
+    return input_tokens + int(request.get("max_tokens") or 0)
+
+
+def _status_code(exc: Exception) -> Optional[int]:
+    status = getattr(exc, "status_code", None)
+    return int(status) if isinstance(status, int) else None
+
+
+def _is_transient(exc: Exception) -> bool:
+    """429 rate limits, 5xx server errors, timeouts and dropped connections are worth retrying."""
+    if isinstance(exc, (APIConnectionError, APITimeoutError)):
+        return True
+    status = _status_code(exc)
+    return status is not None and (status in (408, 409, 429) or status >= 500)
+
+
+def _retry_after_seconds(exc: Exception) -> Optional[float]:
+    """Read a Retry-After header (seconds) from an API error response, if present."""
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
     try:
-        response = client.chat.completions.create(
-            model=model_name,
-            temperature=temperature,
-            max_tokens=max_tokens,
-            messages=[
-                {
-                    "role": "system",
-                    "content": (
-                        "You are a neutral financial historian. Only describe historical price movements. "
-                        "Never predict future performance or offer investment recommendations. "
-                        "Avoid directives such as 'you should buy/sell/hold.'"
-                    ),
-                },
-                {"role": "user", "content": prompt},
-            ],
-        )
-    except Exception as exc:
-        message = str(exc)
-        if "insufficient_quota" in message or "429" in message:
-            warn = "OpenAI quota exceeded (429 insufficient_quota). Skipping explanations for this run."
-            print(f"[SPA] Warning: {warn}", file=sys.stderr)
-            raise LLMQuotaExceededError(warn) from exc
-        raise
-
-    if not response.choices:
-        return ""
-
-    message = response.choices[0].message
-    content = getattr(message, "content", None)
-    return content.strip() if content else ""
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import math
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Sequence, Tuple
+
+import pandas as pd
+
+from src.config_spa import SPA_MAX_PROMPT_TOKENS_DEFAULT
+
+# Letters, digit runs and single punctuation marks, roughly how BPE tokenizers split English text.
+_TOKEN_PIECES = re.compile(r"[A-Za-z]+|\d+|[^\sA-Za-z\d]")
+
+
+@dataclass(frozen=True)
+class PromptBudget:
+    """Input-side limits for one explanation prompt (the fixed system message is not counted)."""
+
+    max_input_tokens: int = SPA_MAX_PROMPT_TOKENS_DEFAULT
+    headline_chars: int = 160
+    decimals: int = 2
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the tokens a chat model sees for text without a tokenizer dependency.
+
+    Words count one token per 6 letters (rounded up), digit runs one per 3 digits and every
+    punctuation mark one, which slightly overestimates typical BPE counts for English prompts.
+    """
+    total = 0
+    for piece in _TOKEN_PIECES.findall(text):
+        if piece[0].isalpha():
+            total += (len(piece) + 5) // 6
+        elif piece[0].isdigit():
+            total += (len(piece) + 2) // 3
+        else:
+            total += 1
+    return total
+
+
+def format_number(value: Any, decimals: int = 2) -> str:
+    """Round floats for display; anything non-numeric is passed through as text."""
+    if isinstance(value, bool) or value is None:
+        return "unknown" if value is None else str(value)
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return str(value)
+    if not math.isfinite(number):
+        return "unknown"
+    if number.is_integer() and not isinstance(value, float):
+        return str(int(number))
+    return f"{number:.{decimals}f}"
+
+
+def format_date(value: Any) -> str:
+    """Render dates as YYYY-MM-DD, keeping the time only when it is not midnight."""
+    if value is None:
+        return "unknown"
+    try:
+        ts = pd.Timestamp(value)
+    except (TypeError, ValueError):
+        return str(value)
+    if pd.isna(ts):
+        return "unknown"
+    if ts.tz is not None:
+        ts = ts.tz_convert("UTC").tz_localize(None)
+    if ts == ts.normalize():
+        return ts.strftime("%Y-%m-%d")
+    return ts.strftime("%Y-%m-%d %H:%M")
+
+
+def rank_events(events: Sequence[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Order events by relevance, then corroborating reports, then distance from the run start,
+    then date (most useful first).
+
+    Events without a relevance score (e.g. from correlate_runs_with_events) are thus kept
+    nearest the run start first; events without days_from_run_start sort last among ties.
+    """
+
+    def _key(event: Dict[str, Any]) -> Tuple[float, int, float, str]:
+        return (
+            -_finite_or(event.get("relevance"), 0.0),
+            -int(event.get("duplicate_count") or 1),
+            abs(_finite_or(event.get("days_from_run_start"), math.inf)),
+            format_date(event.get("date")),
+        )
+
+    return sorted(events, key=_key)
+
+
+def event_line(event: Dict[str, Any], budget: PromptBudget) -> str:
+    """One compact prompt line for an event: date, trimmed headline and report count."""
+    headline = " ".join(str(event.get("headline") or "(headline missing)").split())
+    if len(headline) > budget.headline_chars:
+        cut = headline[: budget.headline_chars - 3]
+        headline = (cut.rsplit(" ", 1)[0] if " " in cut else cut).rstrip(" ,;:-") + "..."
+    reports = int(event.get("duplicate_count") or 1)
+    suffix = f" [{reports} reports]" if reports > 1 else ""
+    return f"- {format_date(event.get('date'))}: {headline}{suffix}"
+
+
+def fit_event_lines(events: Sequence[Dict[str, Any]], token_budget: int, budget: PromptBudget) -> List[str]:
+    """
+    Choose the highest-ranked events whose lines fit token_budget, listed chronologically.
+
+    Lower-ranked events that do not fit are summarized by a single trailing line so the
+    model knows the list is partial.
+    """
+    if not events:
+        return ["- No public events were linked to this run."]
+
+    kept: List[Tuple[str, str]] = []
+    used = 0
+    ranked = rank_events(events)
+    for position, event in enumerate(ranked):
+        line = event_line(event, budget)
+        cost = estimate_tokens(line) + 1
+        remaining = len(ranked) - position - 1
+        reserve = estimate_tokens(_omitted_line(remaining)) + 1 if remaining else 0
+        if used + cost + reserve > token_budget:
+            break
+        kept.append((format_date(event.get("date")), line))
+        used += cost
+
+    lines = [line for _, line in sorted(kept, key=lambda item: item[0])]
+    omitted = len(ranked) - len(kept)
+    if omitted:
+        lines.append(_omitted_line(omitted))
+    return lines
+
+
+def _omitted_line(count: int) -> str:
+    return f"- ({count} lower-ranked events omitted)"
+
+
+def _finite_or(value: Any, default: float) -> float:
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return default
+    return number if math.isfinite(number) else default
@@ -1,54 +1,102 @@
 ﻿from __future__ import annotations
 
-from typing import Dict, List
+from typing import Dict, List, Optional, Sequence
 
+from .prompt_budget import PromptBudget, estimate_tokens, fit_event_lines, format_date, format_number
 
-def build_run_explanation_prompt(run: Dict, events: List[Dict]) -> str:
-    """Build a historical-only prompt describing a price run and related events."""
-    direction = run.get("direction", "unknown")
-    start = run.get("start", "unknown")
-    end = run.get("end", "unknown")
-    duration = run.get("duration_bars", "unknown")
-    pct_change = run.get("pct_change", "unknown")
-    max_drawdown = run.get("max_drawdown_pct", "unknown")
-
-    run_section = (
-        f"Run direction: {direction}\n"
-        f"Start date: {start}\n"
-        f"End date: {end}\n"
-        f"Duration (bars): {duration}\n"
-        f"Percent change: {pct_change}%\n"
-        f"Max adverse move: {max_drawdown}%\n"
+# The system message already sets the neutral-historian role and rules out predictions and
+# advice, so the per-prompt instructions only carry what it does not.
+_INSTRUCTIONS = (
+    "Write 2-3 sentences. Mention public events only as possible context, not guaranteed causes.\n"
+    "Use phrases like 'during this period', 'historically', or 'the stock experienced...'."
+)
+
+
+def build_run_explanation_prompt(run: Dict, events: List[Dict], budget: Optional[PromptBudget] = None) -> str:
+    """
+    Build a historical-only prompt describing a price run and related events.
+
+    Numbers are rounded and event lines ranked and trimmed so the prompt stays within
+    budget.max_input_tokens (estimated); the run details themselves are never dropped.
+    """
+    budget = budget or PromptBudget()
+    event_budget = budget.max_input_tokens - estimate_tokens(_single_prompt(run, [], budget))
+    return _single_prompt(run, fit_event_lines(events or [], event_budget, budget), budget)
+
+
+def build_batch_explanation_prompt(
+    ticker: str,
+    runs: Sequence[Dict],
+    events_by_run: Dict[int, List[Dict]],
+    budget: Optional[PromptBudget] = None,
+) -> str:
+    """
+    Build one prompt covering several runs of a ticker, asking for a JSON object keyed by run_id.
+
+    The instruction block is stated once for the whole batch instead of once per run, and the
+    whole prompt stays within budget.max_input_tokens (estimated): the tokens left after the
+    run details are shared among the runs' event lists, and a run that needs less than its
+    share passes the rest on to the runs after it.
+    """
+    budget = budget or PromptBudget()
+    run_ids = [str(int(run.get("run_id"))) for run in runs]
+    lines_by_run: List[List[str]] = [[] for _ in runs]
+    remaining = budget.max_input_tokens - estimate_tokens(_batch_prompt(ticker, runs, run_ids, lines_by_run, budget))
+    for position, (run, run_id) in enumerate(zip(runs, run_ids)):
+        share = remaining // (len(runs) - position)
+        lines_by_run[position] = fit_event_lines(events_by_run.get(int(run_id)) or [], share, budget)
+        remaining -= sum(estimate_tokens(line) + 1 for line in lines_by_run[position])
+    return _batch_prompt(ticker, runs, run_ids, lines_by_run, budget)
+
+
+def _batch_prompt(
+    ticker: str,
+    runs: Sequence[Dict],
+    run_ids: Sequence[str],
+    lines_by_run: Sequence[List[str]],
+    budget: PromptBudget,
+) -> str:
+    sections = [
+        f"### Run {run_id}\n{_run_section(run, budget)}Events:\n" + "\n".join(event_lines) + "\n"
+        for run, run_id, event_lines in zip(runs, run_ids, lines_by_run)
+    ]
+    output_format = (
+        "Respond with only a JSON object of the form "
+        '{"explanations": {"<run_id>": "<summary>", ...}} '
+        f"containing exactly these run_id keys: {', '.join(run_ids)}. "
+        "Each summary covers only its own run."
     )
 
-    if events:
-        event_lines = []
-        for event in events:
-            date = event.get("date", "unknown date")
-            headline = event.get("headline", "(headline missing)")
-            url = event.get("url")
-            if url:
-                event_lines.append(f"- {date}: {headline} ({url})")
-            else:
-                event_lines.append(f"- {date}: {headline}")
-        events_section = "\n".join(event_lines)
-    else:
-        events_section = "- No public events were linked to this run."
-
-    instructions = (
-        "You are a neutral financial historian. Summarize the historical run in 2-3 sentences.\n"
-        "Mention public events only as possible context, not guaranteed causes.\n"
-        "Do not provide predictions, outlook statements, or buy/sell/hold language.\n"
-        "Use phrases like 'during this period', 'historically', or 'the stock experienced...'."
+    return (
+        f"Summarize each of the following {len(runs)} historical price runs for {ticker}.\n"
+        f"{_INSTRUCTIONS}\n"
+        f"{output_format}\n\n"
+        + "\n".join(sections)
     )
 
-    prompt = (
-        "Summarize the following historical price run:\n\n"
-        f"{instructions}\n\n"
-        "Run details:\n"
-        f"{run_section}\n"
-        "Relevant public events:\n"
-        f"{events_section}\n"
+
+def _single_prompt(run: Dict, event_lines: List[str], budget: PromptBudget) -> str:
+    ticker = run.get("ticker")
+    subject = f"historical price run of {ticker}" if ticker else "historical price run"
+    return (
+        f"Summarize the following {subject}.\n"
+        f"{_INSTRUCTIONS}\n\n"
+        f"{_run_section(run, budget)}"
+        "Events:\n"
+        + "\n".join(event_lines)
+        + "\n"
     )
 
-    return prompt
+
+def _run_section(run: Dict, budget: PromptBudget) -> str:
+    direction = run.get("direction", "unknown")
+    start = format_date(run.get("start"))
+    end = format_date(run.get("end"))
+    duration = format_number(run.get("duration_bars"), budget.decimals)
+    pct_change = format_number(run.get("pct_change"), budget.decimals)
+    max_drawdown = format_number(run.get("max_drawdown_pct"), budget.decimals)
+
+    return (
+        f"Run: {direction}, {start} to {end} ({duration} bars)\n"
+        f"Percent change: {pct_change}%; max adverse move: {max_drawdown}%\n"
+    )
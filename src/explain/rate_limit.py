@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+from typing import Callable, Optional
+
+
+class TokenBucket:
+    """Thread-safe token bucket refilled continuously at rate_per_minute; rate <= 0 means unlimited."""
+
+    def __init__(
+        self,
+        rate_per_minute: float,
+        capacity: Optional[float] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.rate_per_second = max(0.0, float(rate_per_minute)) / 60.0
+        self.capacity = float(capacity if capacity is not None else rate_per_minute)
+        self._tokens = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self, amount: float = 1.0) -> float:
+        """Block until `amount` tokens are available, take them, and return the seconds waited."""
+        if self.rate_per_second <= 0:
+            return 0.0
+        # A request larger than the bucket could never fit; let it through once the bucket is full.
+        amount = min(float(amount), self.capacity)
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate_per_second)
+                self._updated = now
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return waited
+                wait = (amount - self._tokens) / self.rate_per_second
+            self._sleep(wait)
+            waited += wait
+
+
+class RateLimiter:
+    """Combined requests-per-minute and tokens-per-minute limiter shared by all LLM calls."""
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float) -> None:
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+
+    def acquire(self, estimated_tokens: int) -> float:
+        """Reserve one request and estimated_tokens tokens; returns the seconds spent waiting."""
+        return self.requests.acquire(1.0) + self.tokens.acquire(float(estimated_tokens))
+
+
+def backoff_delay(
+    attempt: int,
+    base_seconds: float,
+    max_seconds: float,
+    retry_after: Optional[float] = None,
+    rng: Callable[[], float] = random.random,
+) -> float:
+    """Full-jitter exponential backoff for a 0-based retry attempt, never shorter than Retry-After."""
+    ceiling = min(max_seconds, base_seconds * (2 ** attempt))
+    delay = ceiling * rng()
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import sys
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from src.patterns.runs import DIRECTION_CATEGORIES, PriceRun, day_offsets
+
+# Fixed-width record for one run (25 bytes, packed); day offsets count days since 1970-01-01.
+RUN_RECORD_DTYPE = np.dtype(
+    [
+        ("run_id", "<i4"),
+        ("direction_flag", "i1"),
+        ("start_day", "<i4"),
+        ("end_day", "<i4"),
+        ("duration_bars", "<i4"),
+        ("pct_change", "<f4"),
+        ("max_drawdown_pct", "<f4"),
+    ]
+)
+
+_PRICE_FLOAT_COLUMNS = ("open", "high", "low", "close", "adj_close")
+
+
+class CompactPriceRun:
+    """Slotted counterpart of ``PriceRun`` holding fixed-width fields instead of Timestamps."""
+
+    __slots__ = RUN_RECORD_DTYPE.names
+
+    def __init__(
+        self,
+        run_id: int,
+        direction_flag: int,
+        start_day: int,
+        end_day: int,
+        duration_bars: int,
+        pct_change: float,
+        max_drawdown_pct: float,
+    ) -> None:
+        self.run_id = run_id
+        self.direction_flag = direction_flag
+        self.start_day = start_day
+        self.end_day = end_day
+        self.duration_bars = duration_bars
+        self.pct_change = pct_change
+        self.max_drawdown_pct = max_drawdown_pct
+
+    @property
+    def direction(self) -> str:
+        return "up" if self.direction_flag > 0 else "down"
+
+    @classmethod
+    def from_record(cls, record: np.void) -> "CompactPriceRun":
+        return cls(*(value.item() for value in record))
+
+    def to_price_run(self) -> PriceRun:
+        epoch = pd.Timestamp("1970-01-01")
+        return PriceRun(
+            run_id=self.run_id,
+            direction=self.direction,
+            start=epoch + pd.Timedelta(days=self.start_day),
+            end=epoch + pd.Timedelta(days=self.end_day),
+            duration_bars=self.duration_bars,
+            pct_change=self.pct_change,
+            max_drawdown_pct=self.max_drawdown_pct,
+        )
+
+
+def compact_price_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Return prices as float32 and volume as the smallest unsigned integer that holds it."""
+    compact = df.copy()
+    for col in _PRICE_FLOAT_COLUMNS:
+        if col in compact.columns:
+            compact[col] = compact[col].astype(np.float32)
+    if "volume" in compact.columns:
+        volume = np.clip(np.nan_to_num(compact["volume"].to_numpy(dtype=float)), 0, None).round()
+        dtype = np.uint32 if volume.size == 0 or volume.max() <= np.iinfo(np.uint32).max else np.uint64
+        compact["volume"] = volume.astype(dtype)
+    return compact
+
+
+def compact_runs_frame(runs: pd.DataFrame) -> pd.DataFrame:
+    """
+    Convert a runs table (single ticker or panel) to the compact layout.
+
+    ``start``/``end`` become int32 ``start_day``/``end_day``, ``direction`` and ``ticker``
+    become categoricals, ids and lengths int32, and every float column float32.
+    """
+    compact = pd.DataFrame(index=pd.RangeIndex(len(runs)))
+    for col in runs.columns:
+        values = runs[col]
+        if col == "ticker":
+            compact[col] = pd.Categorical(values)
+        elif col == "direction":
+            compact[col] = pd.Categorical(values, categories=list(DIRECTION_CATEGORIES))
+        elif col in ("start", "end"):
+            compact[f"{col}_day"] = day_offsets(pd.DatetimeIndex(values))
+        elif col in ("run_id", "duration_bars"):
+            compact[col] = values.to_numpy(dtype=np.int32)
+        elif pd.api.types.is_float_dtype(values):
+            compact[col] = values.to_numpy(dtype=np.float32)
+        else:
+            compact[col] = values.to_numpy()
+    return compact
+
+
+def expand_runs_frame(compact: pd.DataFrame) -> pd.DataFrame:
+    """Inverse of ``compact_runs_frame``: restore Timestamps, string directions and wide dtypes."""
+    runs = pd.DataFrame(index=pd.RangeIndex(len(compact)))
+    epoch = np.datetime64("1970-01-01", "D")
+    for col in compact.columns:
+        values = compact[col]
+        if col in ("start_day", "end_day"):
+            days = values.to_numpy(dtype=np.int64).astype("timedelta64[D]")
+            runs[col[: -len("_day")]] = pd.DatetimeIndex((epoch + days).astype("datetime64[ns]"))
+        elif col in ("ticker", "direction"):
+            runs[col] = values.astype(str).to_numpy(dtype=object)
+        elif col in ("run_id", "duration_bars"):
+            runs[col] = values.to_numpy(dtype=np.int64)
+        elif pd.api.types.is_float_dtype(values):
+            runs[col] = values.to_numpy(dtype=float)
+        else:
+            runs[col] = values.to_numpy()
+    return runs
+
+
+def runs_to_records(runs: pd.DataFrame) -> np.ndarray:
+    """Pack one ticker's runs (standard or compact frame) into a ``RUN_RECORD_DTYPE`` array."""
+    compact = runs if "start_day" in runs.columns else compact_runs_frame(runs)
+    records = np.empty(len(compact), dtype=RUN_RECORD_DTYPE)
+    records["run_id"] = compact["run_id"]
+    records["direction_flag"] = np.where(compact["direction"].to_numpy() == "up", 1, -1)
+    for name in ("start_day", "end_day", "duration_bars", "pct_change", "max_drawdown_pct"):
+        records[name] = compact[name]
+    return records
+
+
+def records_to_runs(records: np.ndarray) -> List[CompactPriceRun]:
+    """Materialize records as slotted run objects."""
+    return [CompactPriceRun.from_record(record) for record in records]
+
+
+def memory_report(runs: pd.DataFrame) -> Dict[str, int]:
+    """
+    Bytes used by the same runs in each representation: the standard DataFrame, the
+    compact DataFrame and, for single-ticker tables, structured records plus lists of
+    ``PriceRun`` dataclasses and ``CompactPriceRun`` objects.
+    """
+    compact = compact_runs_frame(runs)
+    report = {
+        "standard_frame": int(runs.memory_usage(deep=True).sum()),
+        "compact_frame": int(compact.memory_usage(deep=True).sum()),
+    }
+    if "ticker" not in runs.columns:
+        records = runs_to_records(compact)
+        dataclass_runs = [PriceRun(**row) for row in runs.to_dict("records")]
+        report["records"] = int(records.nbytes)
+        report["price_run_objects"] = _deep_list_size(dataclass_runs)
+        report["compact_run_objects"] = _deep_list_size(records_to_runs(records))
+    return report
+
+
+def _deep_list_size(items: list) -> int:
+    """Approximate bytes of a list of flat objects: the list, each object and its field values."""
+    total = sys.getsizeof(items)
+    for item in items:
+        total += sys.getsizeof(item)
+        fields = getattr(item, "__dict__", None)
+        if fields is not None:
+            total += sys.getsizeof(fields)
+            values = fields.values()
+        else:
+            values = (getattr(item, name) for name in item.__slots__)
+        total += sum(sys.getsizeof(value) for value in values)
+    return total
@@ -1,12 +1,28 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import List
-
-import streamlit as st
+from typing import Dict, Tuple
 
+import numpy as np
 import pandas as pd
 
+from src.cache import cached
+from src.config_spa import SPA_VOLUME_BASELINE_BARS_DEFAULT
+
+# Category order for compact direction columns (code 0 = down, 1 = up).
+DIRECTION_CATEGORIES: Tuple[str, ...] = ("down", "up")
+
+# Extra per-run columns produced when OHLCV metrics are switched on.
+OHLCV_METRIC_COLUMNS: Tuple[str, ...] = (
+    "intrabar_adverse_pct",
+    "vwap",
+    "total_volume",
+    "avg_volume",
+    "volume_zscore",
+    "avg_true_range",
+    "max_true_range",
+)
+
 
 @dataclass(frozen=True)
 class PriceRun:
@@ -21,9 +37,304 @@ class PriceRun:
     max_drawdown_pct: float
 
 
-@st.cache_data(show_spinner=False)
-def detect_price_runs(df: pd.DataFrame, price_col: str = "close") -> pd.DataFrame:
-    """Detect consecutive up or down runs within a price series."""
+@dataclass(frozen=True)
+class RunSegments:
+    """Columnar description of every run in a price array, one array element per run."""
+
+    run_id: np.ndarray
+    direction_flag: np.ndarray
+    start_idx: np.ndarray
+    end_idx: np.ndarray
+    duration_bars: np.ndarray
+    pct_change: np.ndarray
+    max_drawdown_pct: np.ndarray
+    series_idx: np.ndarray
+
+    def __len__(self) -> int:
+        return int(self.run_id.shape[0])
+
+
+@cached("runs")
+def detect_price_runs(df: pd.DataFrame, price_col: str = "close", ohlcv_metrics: bool = False) -> pd.DataFrame:
+    """
+    Detect consecutive up or down runs within a price series.
+
+    With ``ohlcv_metrics`` the ``high``, ``low`` and ``volume`` columns are also reduced
+    per run in the same vectorized pass, adding ``OHLCV_METRIC_COLUMNS`` to the result.
+    """
+    _validate_price_frame(df, price_col)
+
+    prices = df[price_col].astype(float).to_numpy()
+    ohlcv = _ohlcv_arrays(df, np.arange(len(df))) if ohlcv_metrics else None
+    runs = _runs_from_flat_series(prices, df.index, np.zeros(1, dtype=np.int64), tickers=None, ohlcv=ohlcv)
+    if runs.empty:
+        return pd.DataFrame(columns=_runs_columns(ohlcv_metrics))
+    return runs
+
+
+def detect_price_runs_panel(
+    prices: pd.DataFrame,
+    price_col: str = "close",
+    ticker_col: str = "ticker",
+    date_col: str = "date",
+    ohlcv_metrics: bool = False,
+    compact: bool = False,
+) -> pd.DataFrame:
+    """
+    Detect runs for every ticker of a price panel in one vectorized pass.
+
+    Accepts either a wide frame (DatetimeIndex x one close column per ticker) or a long
+    frame with ``ticker_col`` and ``price_col`` columns and dates in ``date_col`` (column,
+    index, or index level). In both layouts a NaN price means "no bar" (not yet listed,
+    delisted, or halted), so those cells or rows are dropped and returns are taken between
+    a ticker's own consecutive bars; a run continues through a halt.
+    Not memoized: fingerprinting and copying a universe-wide panel and its result would
+    cost more than the vectorized pass itself.
+    Returns one long table: ``ticker`` followed by the ``PriceRun`` columns.
+    ``ohlcv_metrics`` needs a long frame with ``high``, ``low`` and ``volume`` columns.
+    ``compact`` builds the small-dtype layout of ``src.patterns.compact`` directly
+    (categorical ticker/direction, int32 day offsets, float32 measures).
+    """
+    ohlcv = None
+    if ohlcv_metrics and ticker_col not in prices.columns:
+        raise ValueError("OHLCV metrics need a long panel with high/low/volume columns.")
+    flat_prices, dates, series_starts, tickers, order = flatten_price_panel(prices, price_col, ticker_col, date_col)
+    if ohlcv_metrics:
+        ohlcv = _ohlcv_arrays(prices, order)
+
+    runs = _runs_from_flat_series(flat_prices, dates, series_starts, tickers=tickers, ohlcv=ohlcv, compact=compact)
+    if runs.empty and not compact:
+        return pd.DataFrame(columns=["ticker", *_runs_columns(ohlcv_metrics)])
+    return runs
+
+
+def flatten_price_panel(
+    prices: pd.DataFrame,
+    price_col: str = "close",
+    ticker_col: str = "ticker",
+    date_col: str = "date",
+):
+    """
+    Concatenate every ticker's bars of a wide or long price panel into one flat series.
+
+    Layouts and NaN handling are those of ``detect_price_runs_panel``. Returns
+    ``(flat_prices, dates, series_starts, tickers, order)``: the bars ticker by ticker in
+    date order, their dates, where each ticker's bars begin, the tickers that have bars,
+    and for long frames the row of ``prices`` behind each bar (None for wide frames).
+    """
+    if ticker_col in prices.columns:
+        return _flatten_long_panel(prices, price_col, ticker_col, date_col)
+    return (*_flatten_wide_panel(prices), None)
+
+
+def compute_run_segments(prices: np.ndarray, series_starts: np.ndarray | None = None) -> RunSegments:
+    """
+    Segment a price array into up/down runs in a single vectorized pass.
+
+    Bars are flagged by the sign of their close-to-close return; each maximal block of
+    equal non-zero flags is one run. Run ids count every flag change (including flat
+    stretches), matching the labels produced by ``detect_price_runs``.
+
+    ``series_starts`` lists the positions where independent series begin when several
+    tickers are concatenated (default: one series starting at 0). Returns never cross a
+    series boundary and run ids restart at each series.
+    """
+    prices = np.asarray(prices, dtype=float)
+    n_bars = prices.shape[0]
+    if series_starts is None:
+        series_starts = np.zeros(min(n_bars, 1), dtype=np.int64)
+    series_starts = np.asarray(series_starts, dtype=np.int64)
+
+    flags = direction_flags(prices)
+    # The first bar of every series has no previous close of its own.
+    flags[series_starts] = 0
+
+    changes = np.empty(n_bars, dtype=bool)
+    changes[:1] = True
+    changes[1:] = flags[1:] != flags[:-1]
+    changes[series_starts] = True
+    labels = np.cumsum(changes)
+
+    boundaries = np.flatnonzero(changes)
+    block_ends = np.append(boundaries[1:], n_bars) - 1
+    in_run = flags[boundaries] != 0
+
+    starts = boundaries[in_run]
+    ends = block_ends[in_run]
+    run_flags = flags[starts]
+
+    series_of_run = np.searchsorted(series_starts, starts, side="right") - 1
+    label_offsets = labels[series_starts] - 1
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pct_change = ((prices[ends] / prices[starts]) - 1.0) * 100.0
+
+    return RunSegments(
+        run_id=(labels[starts] - label_offsets[series_of_run]).astype(np.int64),
+        direction_flag=run_flags,
+        start_idx=starts,
+        end_idx=ends,
+        duration_bars=(ends - starts + 1).astype(np.int64),
+        pct_change=pct_change,
+        max_drawdown_pct=_segment_max_adverse_moves(prices, starts, ends, run_flags),
+        series_idx=series_of_run.astype(np.int64),
+    )
+
+
+def compute_run_ohlcv_metrics(
+    segments: RunSegments,
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    volume: np.ndarray,
+    series_starts: np.ndarray | None = None,
+    baseline_bars: int = SPA_VOLUME_BASELINE_BARS_DEFAULT,
+) -> Dict[str, np.ndarray]:
+    """
+    Reduce high/low/volume over every run with the same segmented layout as the closes.
+
+    - ``intrabar_adverse_pct``: worst low below the running high (up runs) or high above
+      the running low (down runs), in percent, using intrabar extremes.
+    - ``vwap``: volume-weighted typical price (high + low + close) / 3.
+    - ``total_volume`` / ``avg_volume``: volume summed and averaged over the run's bars.
+    - ``volume_zscore``: average run volume against the mean and standard deviation of up
+      to ``baseline_bars`` bars before the run (same series only); NaN without a baseline.
+    - ``avg_true_range`` / ``max_true_range``: true range uses the previous close within
+      the series and falls back to high - low on a series' first bar.
+
+    Missing volume counts as zero.
+    """
+    high = np.asarray(high, dtype=float)
+    low = np.asarray(low, dtype=float)
+    close = np.asarray(close, dtype=float)
+    volume = np.nan_to_num(np.asarray(volume, dtype=float))
+    if series_starts is None:
+        series_starts = np.zeros(min(close.shape[0], 1), dtype=np.int64)
+    series_starts = np.asarray(series_starts, dtype=np.int64)
+
+    starts, ends = segments.start_idx, segments.end_idx
+    if starts.shape[0] == 0:
+        return {name: np.empty(0, dtype=float) for name in OHLCV_METRIC_COLUMNS}
+    lengths, offsets, positions, segment_ids = _segment_layout(starts, ends)
+    bar_flags = np.repeat(segments.direction_flag, lengths)
+
+    running_high = _segmented_running_extreme(high[positions], segment_ids, use_max=True)
+    running_low = _segmented_running_extreme(low[positions], segment_ids, use_max=False)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        adverse = np.where(bar_flags > 0, low[positions] / running_high, high[positions] / running_low) - 1.0
+    intrabar_adverse = np.where(
+        segments.direction_flag > 0, np.fmin.reduceat(adverse, offsets), np.fmax.reduceat(adverse, offsets)
+    )
+
+    prev_close = np.empty_like(close)
+    prev_close[1:] = close[:-1]
+    prev_close[series_starts] = np.nan
+    true_range = np.fmax(high, prev_close) - np.fmin(low, prev_close)
+
+    def run_sums(values: np.ndarray) -> np.ndarray:
+        totals = np.concatenate([[0.0], np.cumsum(values)])
+        return totals[ends + 1] - totals[starts]
+
+    volume_totals = np.concatenate([[0.0], np.cumsum(volume)])
+    total_volume = volume_totals[ends + 1] - volume_totals[starts]
+    avg_volume = total_volume / lengths
+    typical = (high + low + close) / 3.0
+
+    squared_totals = np.concatenate([[0.0], np.cumsum(volume * volume)])
+    base_lo = np.maximum(starts - baseline_bars, series_starts[segments.series_idx])
+    base_n = starts - base_lo
+    with np.errstate(divide="ignore", invalid="ignore"):
+        vwap = run_sums(np.nan_to_num(typical * volume)) / total_volume
+        base_mean = (volume_totals[starts] - volume_totals[base_lo]) / base_n
+        base_var = (squared_totals[starts] - squared_totals[base_lo]) / base_n - base_mean * base_mean
+        base_std = np.sqrt(np.maximum(base_var, 0.0))
+        volume_zscore = np.where((base_n > 1) & (base_std > 0), (avg_volume - base_mean) / base_std, np.nan)
+        avg_true_range = run_sums(np.nan_to_num(true_range)) / lengths
+
+    return {
+        "intrabar_adverse_pct": intrabar_adverse * 100.0,
+        "vwap": vwap,
+        "total_volume": total_volume,
+        "avg_volume": avg_volume,
+        "volume_zscore": volume_zscore,
+        "avg_true_range": avg_true_range,
+        "max_true_range": np.fmax.reduceat(true_range[positions], offsets),
+    }
+
+
+def direction_flags(prices: np.ndarray) -> np.ndarray:
+    """Per-bar sign of the close-to-close return as int8 (+1 up, -1 down, 0 flat/first/NaN)."""
+    prices = np.asarray(prices, dtype=float)
+    flags = np.zeros(prices.shape[0], dtype=np.int8)
+    if prices.shape[0] > 1:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            returns = prices[1:] / prices[:-1] - 1.0
+        flags[1:] = (returns > 0).astype(np.int8) - (returns < 0).astype(np.int8)
+    return flags
+
+
+def runs_frame_from_segments(segments: RunSegments, index: pd.Index) -> pd.DataFrame:
+    """Materialize run segments as the public runs DataFrame using the bar index for dates."""
+    directions = np.where(segments.direction_flag > 0, "up", "down").astype(object)
+    return pd.DataFrame(
+        {
+            "run_id": segments.run_id,
+            "direction": directions,
+            "start": index[segments.start_idx],
+            "end": index[segments.end_idx],
+            "duration_bars": segments.duration_bars,
+            "pct_change": segments.pct_change,
+            "max_drawdown_pct": segments.max_drawdown_pct,
+        }
+    )
+
+
+def compact_runs_frame_from_segments(segments: RunSegments, index: pd.Index) -> pd.DataFrame:
+    """
+    Materialize run segments with small dtypes: int32 ids/lengths, categorical direction,
+    int32 day offsets since 1970-01-01 (``start_day``/``end_day``) and float32 measures.
+    """
+    dates = pd.DatetimeIndex(index)
+    start_dates = dates[segments.start_idx]
+    end_dates = dates[segments.end_idx]
+    return pd.DataFrame(
+        {
+            "run_id": segments.run_id.astype(np.int32),
+            "direction": pd.Categorical.from_codes((segments.direction_flag > 0).astype(np.int8), DIRECTION_CATEGORIES),
+            "start_day": day_offsets(start_dates),
+            "end_day": day_offsets(end_dates),
+            "duration_bars": segments.duration_bars.astype(np.int32),
+            "pct_change": segments.pct_change.astype(np.float32),
+            "max_drawdown_pct": segments.max_drawdown_pct.astype(np.float32),
+        }
+    )
+
+
+def day_offsets(dates: pd.DatetimeIndex) -> np.ndarray:
+    """Whole days since 1970-01-01 as int32; raises for intraday timestamps."""
+    dates = pd.DatetimeIndex(dates)
+    if dates.tz is not None:
+        dates = dates.tz_localize(None)
+    days = dates.to_numpy(dtype="datetime64[ns]").astype("datetime64[D]")
+    if np.any(days != dates.to_numpy(dtype="datetime64[ns]")):
+        raise ValueError("Compact day offsets need daily (midnight) timestamps.")
+    return days.astype(np.int64).astype(np.int32)
+
+
+def _runs_columns(ohlcv_metrics: bool) -> list:
+    columns = list(PriceRun.__dataclass_fields__)
+    return columns + list(OHLCV_METRIC_COLUMNS) if ohlcv_metrics else columns
+
+
+def _ohlcv_arrays(df: pd.DataFrame, order: np.ndarray) -> Dict[str, np.ndarray]:
+    """Pull high/low/volume as float arrays in the engine's bar order."""
+    missing = [col for col in ("high", "low", "volume") if col not in df.columns]
+    if missing:
+        raise ValueError(f"OHLCV metrics need columns {missing} in the DataFrame.")
+    return {col: df[col].to_numpy(dtype=float)[order] for col in ("high", "low", "volume")}
+
+
+def _validate_price_frame(df: pd.DataFrame, price_col: str) -> None:
+    """Raise ValueError unless df is a date-sorted price frame with at least two bars."""
     if price_col not in df.columns:
         raise ValueError(f"DataFrame must contain '{price_col}' column.")
     if len(df) < 2:
@@ -33,58 +344,151 @@ def detect_price_runs(df: pd.DataFrame, price_col: str = "close") -> pd.DataFram
     if not pd.api.types.is_datetime64_any_dtype(df.index):
         raise ValueError("DataFrame index must be a DatetimeIndex.")
 
-    price_series = df[price_col].astype(float)
-    returns = price_series.pct_change()
-    direction = returns.fillna(0.0)
-    direction_flags = direction.gt(0).astype(int) - direction.lt(0).astype(int)
-
-    nonzero_mask = direction_flags != 0
-    if not nonzero_mask.any():
-        return pd.DataFrame(columns=[field for field in PriceRun.__dataclass_fields__])
-
-    label_source = direction_flags.where(nonzero_mask, 0)
-    run_labels = label_source.ne(label_source.shift()).cumsum()
-
-    run_rows = df.loc[nonzero_mask].copy()
-    run_rows["direction_flag"] = direction_flags[nonzero_mask].astype(int)
-    run_rows["run_id"] = run_labels[nonzero_mask].astype(int)
-
-    runs: List[PriceRun] = []
-    for run_id, slice_df in run_rows.groupby("run_id"):
-        dir_flag = int(slice_df["direction_flag"].iat[0])
-        run_direction = "up" if dir_flag > 0 else "down"
-        segment_index = slice_df.index
-        start_ts = segment_index[0]
-        end_ts = segment_index[-1]
-        duration = len(slice_df)
-        start_price = price_series.loc[start_ts]
-        end_price = price_series.loc[end_ts]
-        pct_change = ((end_price / start_price) - 1.0) * 100.0
-        segment_prices = price_series.loc[segment_index]
-        max_drawdown_pct = _max_adverse_move(segment_prices, dir_flag)
-
-        runs.append(
-            PriceRun(
-                run_id=int(run_id),
-                direction=run_direction,
-                start=start_ts,
-                end=end_ts,
-                duration_bars=duration,
-                pct_change=pct_change,
-                max_drawdown_pct=max_drawdown_pct,
-            )
+
+def _runs_from_flat_series(
+    prices: np.ndarray,
+    dates: pd.Index,
+    series_starts: np.ndarray,
+    tickers: np.ndarray | None,
+    ohlcv: Dict[str, np.ndarray] | None = None,
+    compact: bool = False,
+) -> pd.DataFrame:
+    """Shared core of the single-ticker and panel APIs over concatenated series."""
+    segments = compute_run_segments(prices, series_starts)
+    if compact:
+        runs = compact_runs_frame_from_segments(segments, dates)
+    else:
+        runs = runs_frame_from_segments(segments, dates)
+    if ohlcv is not None:
+        metrics = compute_run_ohlcv_metrics(
+            segments, ohlcv["high"], ohlcv["low"], prices, ohlcv["volume"], series_starts=series_starts
         )
+        for name in OHLCV_METRIC_COLUMNS:
+            runs[name] = metrics[name].astype(np.float32) if compact else metrics[name]
+    if tickers is not None:
+        if compact:
+            ticker_values = pd.Categorical.from_codes(segments.series_idx, categories=pd.Index(tickers))
+        else:
+            ticker_values = np.asarray(tickers, dtype=object)[segments.series_idx]
+        runs.insert(0, "ticker", ticker_values)
+    return runs
+
+
+def _flatten_wide_panel(prices: pd.DataFrame):
+    """Stack a dates x tickers frame ticker by ticker, dropping NaN (no-bar) cells."""
+    if not prices.index.is_monotonic_increasing:
+        raise ValueError("DataFrame index must be sorted ascending by date.")
+    if not pd.api.types.is_datetime64_any_dtype(prices.index):
+        raise ValueError("DataFrame index must be a DatetimeIndex.")
+
+    values = prices.to_numpy(dtype=float).T
+    present = ~np.isnan(values)
+    counts = present.sum(axis=1)
+    listed = counts > 0
+
+    flat_prices = values[present]
+    date_positions = np.broadcast_to(np.arange(values.shape[1]), values.shape)[present]
+    dates = prices.index[date_positions]
+    series_starts = (np.cumsum(counts) - counts)[listed]
+    tickers = np.asarray(prices.columns, dtype=object)[listed]
+    return flat_prices, dates, series_starts, tickers
+
+
+def _flatten_long_panel(prices: pd.DataFrame, price_col: str, ticker_col: str, date_col: str):
+    """
+    Sort a long (ticker, date) frame by ticker then date and locate each ticker's first row.
+
+    Rows with a NaN price are dropped, as NaN cells are in wide frames; tickers left
+    without any bar are dropped too. ``order`` maps the flat bars back to rows of prices.
+    """
+    if price_col not in prices.columns:
+        raise ValueError(f"DataFrame must contain '{price_col}' column.")
+    if date_col in prices.columns:
+        dates = pd.DatetimeIndex(prices[date_col])
+    elif date_col in (prices.index.names or []):
+        dates = pd.DatetimeIndex(prices.index.get_level_values(date_col))
+    elif pd.api.types.is_datetime64_any_dtype(prices.index):
+        dates = pd.DatetimeIndex(prices.index)
+    else:
+        raise ValueError(f"Long panel needs dates in a '{date_col}' column or a DatetimeIndex.")
+
+    ticker_values = prices[ticker_col].to_numpy(dtype=object)
+    codes, tickers = pd.factorize(ticker_values, sort=True)
+    if np.any(codes < 0):
+        raise ValueError(f"Long panel has missing values in '{ticker_col}'.")
+    order = np.lexsort((dates.asi8, codes))
+    codes = codes[order]
+    dates = dates[order]
+    if len(order) > 1 and np.any((codes[1:] == codes[:-1]) & (dates.asi8[1:] == dates.asi8[:-1])):
+        raise ValueError("Long panel contains duplicate (ticker, date) rows.")
+
+    flat_prices = prices[price_col].to_numpy(dtype=float)[order]
+    present = ~np.isnan(flat_prices)
+    if not present.all():
+        flat_prices, dates, codes, order = flat_prices[present], dates[present], codes[present], order[present]
+    counts = np.bincount(codes, minlength=len(tickers))
+    listed = counts > 0
+    series_starts = (np.cumsum(counts) - counts)[listed]
+    return flat_prices, dates, series_starts, np.asarray(tickers, dtype=object)[listed], order
+
+
+def _segment_max_adverse_moves(
+    prices: np.ndarray,
+    starts: np.ndarray,
+    ends: np.ndarray,
+    run_flags: np.ndarray,
+) -> np.ndarray:
+    """Compute the worst move against each run, in percent, with segmented reductions."""
+    if starts.shape[0] == 0:
+        return np.empty(0, dtype=float)
+
+    lengths, offsets, positions, segment_ids = _segment_layout(starts, ends)
+    values = prices[positions]
+    bar_flags = np.repeat(run_flags, lengths)
+
+    same_segment = segment_ids[1:] == segment_ids[:-1]
+    with_run = np.where(bar_flags[1:] > 0, values[1:] >= values[:-1], values[1:] <= values[:-1])
+    if np.all(with_run | ~same_segment):
+        # With positive prices every run is monotone, so its running extreme is the price itself.
+        running_high = running_low = values
+    else:
+        running_high = _segmented_running_extreme(values, segment_ids, use_max=True)
+        running_low = _segmented_running_extreme(values, segment_ids, use_max=False)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        adverse = np.where(bar_flags > 0, values / running_high, values / running_low) - 1.0
+
+    # Up runs report their deepest pullback, down runs their largest bounce.
+    worst_pullback = np.fmin.reduceat(adverse, offsets)
+    worst_bounce = np.fmax.reduceat(adverse, offsets)
+    return np.where(run_flags > 0, worst_pullback, worst_bounce) * 100.0
+
+
+def _segment_layout(starts: np.ndarray, ends: np.ndarray):
+    """Concatenate the bar positions of every run: (lengths, offsets, positions, segment_ids)."""
+    lengths = ends - starts + 1
+    segment_ids = np.repeat(np.arange(starts.shape[0]), lengths)
+    offsets = np.cumsum(lengths) - lengths
+    positions = np.arange(segment_ids.shape[0]) - np.repeat(offsets, lengths) + np.repeat(starts, lengths)
+    return lengths, offsets, positions, segment_ids
 
-    return pd.DataFrame([run.__dict__ for run in runs])
 
+def _segmented_running_extreme(values: np.ndarray, segment_ids: np.ndarray, use_max: bool) -> np.ndarray:
+    """
+    Running max (or min) of ``values`` that restarts at every segment.
 
-def _max_adverse_move(prices: pd.Series, direction_flag: int) -> float:
-    """Compute the worst move against a run in percentage terms."""
-    if direction_flag > 0:
-        cumulative_high = prices.cummax()
-        drawdowns = (prices / cumulative_high) - 1.0
-        return float(drawdowns.min() * 100.0)
+    Values are replaced by their rank and offset by segment so a single
+    ``np.maximum.accumulate`` cannot leak across segments. Ties rank so the later bar
+    wins, as in ``np.maximum.accumulate``, and ranks map back to the exact element.
+    """
+    positions = np.arange(values.shape[0])
+    if use_max:
+        order = np.argsort(values, kind="stable")
+    else:
+        order = np.lexsort((-positions, values))[::-1]
+    n_ranks = max(int(values.shape[0]), 1)
+    ranks = np.empty(values.shape[0], dtype=np.int64)
+    ranks[order] = positions
 
-    cumulative_low = prices.cummin()
-    runups = (prices / cumulative_low) - 1.0
-    return float(runups.max() * 100.0)
+    segment_offsets = segment_ids.astype(np.int64) * n_ranks
+    running = np.maximum.accumulate(segment_offsets + ranks) - segment_offsets
+    return values[order[running]]
@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Sequence
+
+import numpy as np
+import pandas as pd
+
+from src.cache import cached
+from src.patterns.runs import PriceRun, _segment_max_adverse_moves, _validate_price_frame
+
+
+@dataclass(frozen=True)
+class SegmentationParams:
+    """
+    Noise-tolerance settings for run segmentation.
+
+    The defaults reproduce ``detect_price_runs`` exactly: every non-zero move counts,
+    any counter move ends the run, and no volume confirmation is required.
+    """
+
+    min_move_bps: float = 0.0
+    min_bars: int = 1
+    max_counter_bars: int = 0
+    min_volume_ratio: float = 0.0
+    volume_window: int = 20
+
+
+@cached("runs")
+def detect_price_runs_with_params(
+    df: pd.DataFrame,
+    params: SegmentationParams = SegmentationParams(),
+    price_col: str = "close",
+    volume_col: str = "volume",
+) -> pd.DataFrame:
+    """Detect runs for a single parameter set; returns the ``PriceRun`` columns."""
+    runs = sweep_segmentation(df, [params], price_col=price_col, volume_col=volume_col)
+    return runs.drop(columns="param_set").reset_index(drop=True)
+
+
+def sweep_segmentation(
+    df: pd.DataFrame,
+    param_grid: Sequence[SegmentationParams],
+    price_col: str = "close",
+    volume_col: str = "volume",
+) -> pd.DataFrame:
+    """
+    Segment one price series under many parameter sets in a single pass over the bars.
+
+    Returns are computed once. Bars whose absolute return is below ``min_move_bps`` count
+    as flat. A run keeps going through up to ``max_counter_bars`` consecutive flat or
+    opposite bars as long as it resumes in its own direction; when the allowance is
+    exceeded the run ends at its last bar in its direction and a new run starts at the
+    beginning of the current streak. Runs shorter than ``min_bars`` are dropped, and with
+    ``min_volume_ratio`` > 0 a run is kept only if its average volume is at least that
+    multiple of the average over the ``volume_window`` bars before it starts (NaN volumes
+    are skipped; a run with no earlier volume, such as one starting at bar 0, is kept).
+
+    Returns a long table: ``param_set`` (position in ``param_grid``) followed by the
+    ``PriceRun`` columns, ordered by parameter set then start.
+    """
+    _validate_price_frame(df, price_col)
+    params = list(param_grid)
+    columns = ["param_set", *PriceRun.__dataclass_fields__]
+    if not params:
+        return pd.DataFrame(columns=columns)
+
+    prices = df[price_col].astype(float).to_numpy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        returns = np.concatenate([[np.nan], prices[1:] / prices[:-1] - 1.0])
+
+    thresholds = np.array([p.min_move_bps for p in params], dtype=float) / 10_000.0
+    flags = _threshold_flags(returns, thresholds)
+    set_idx, starts, ends, run_flags = _segment_kernel(flags, np.array([p.max_counter_bars for p in params]))
+
+    keep = (ends - starts + 1) >= np.array([p.min_bars for p in params])[set_idx]
+    if any(p.min_volume_ratio > 0 for p in params):
+        if volume_col not in df.columns:
+            raise ValueError(f"Volume confirmation needs a '{volume_col}' column.")
+        keep &= _volume_confirmed(df[volume_col].astype(float).to_numpy(), params, set_idx, starts, ends)
+    set_idx, starts, ends, run_flags = set_idx[keep], starts[keep], ends[keep], run_flags[keep]
+
+    order = np.lexsort((starts, set_idx))
+    set_idx, starts, ends, run_flags = set_idx[order], starts[order], ends[order], run_flags[order]
+
+    # Run ids follow detect_price_runs: the count of flag changes up to the run's first bar.
+    changes = np.ones_like(flags, dtype=np.int64)
+    changes[1:] = flags[1:] != flags[:-1]
+    labels = np.cumsum(changes, axis=0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pct_change = ((prices[ends] / prices[starts]) - 1.0) * 100.0
+    runs = pd.DataFrame(
+        {
+            "param_set": set_idx,
+            "run_id": labels[starts, set_idx],
+            "direction": np.where(run_flags > 0, "up", "down").astype(object),
+            "start": df.index[starts],
+            "end": df.index[ends],
+            "duration_bars": ends - starts + 1,
+            "pct_change": pct_change,
+            "max_drawdown_pct": _segment_max_adverse_moves(prices, starts, ends, run_flags),
+        }
+    )
+    return runs if not runs.empty else pd.DataFrame(columns=columns)
+
+
+def _threshold_flags(returns: np.ndarray, thresholds: np.ndarray) -> np.ndarray:
+    """Bars x parameter sets int8 flags: the sign of each return, or 0 below that set's threshold."""
+    big_enough = np.abs(returns)[:, None] >= thresholds[None, :]
+    up = (returns > 0)[:, None] & big_enough
+    down = (returns < 0)[:, None] & big_enough
+    return up.astype(np.int8) - down.astype(np.int8)
+
+
+def _segment_kernel(flags: np.ndarray, max_counter_bars: np.ndarray):
+    """
+    Walk the bars once, advancing one run state per parameter set with vector operations.
+
+    Returns flat arrays (param_set, start, end, direction_flag) for every closed run.
+    """
+    n_bars, n_sets = flags.shape
+    max_counter_bars = max_counter_bars.astype(np.int64)
+    # Start of the streak of equal flags that each bar belongs to, per parameter set.
+    streak_start = np.where(
+        np.vstack([np.ones((1, n_sets), dtype=bool), flags[1:] != flags[:-1]]),
+        np.arange(n_bars)[:, None],
+        0,
+    )
+    np.maximum.accumulate(streak_start, axis=0, out=streak_start)
+
+    direction = np.zeros(n_sets, dtype=np.int8)
+    start = np.zeros(n_sets, dtype=np.int64)
+    last_end = np.zeros(n_sets, dtype=np.int64)
+    pending = np.zeros(n_sets, dtype=np.int64)
+    closed: List[tuple] = []
+
+    for i in range(n_bars):
+        flag = flags[i]
+        active = direction != 0
+        moving = flag != 0
+        with_run = active & (flag == direction)
+        against = active & ~with_run
+
+        last_end[with_run] = i
+        pending[with_run] = 0
+        pending[against] += 1
+        overflow = against & (pending > max_counter_bars)
+        if overflow.any():
+            done = np.flatnonzero(overflow)
+            closed.append((done, start[done], last_end[done], direction[done]))
+            direction[overflow] = 0
+
+        opening = (overflow | ~active) & moving
+        if opening.any():
+            direction[opening] = flag[opening]
+            start[opening] = np.where(overflow, streak_start[i], i)[opening]
+            last_end[opening] = i
+            pending[opening] = 0
+
+    still_open = np.flatnonzero(direction != 0)
+    closed.append((still_open, start[still_open], last_end[still_open], direction[still_open]))
+    set_idx, starts, ends, run_flags = (np.concatenate(parts) for parts in zip(*closed))
+    return set_idx.astype(np.int64), starts, ends, run_flags.astype(np.int8)
+
+
+def _volume_confirmed(
+    volume: np.ndarray,
+    params: Sequence[SegmentationParams],
+    set_idx: np.ndarray,
+    starts: np.ndarray,
+    ends: np.ndarray,
+) -> np.ndarray:
+    """
+    True where a run's mean volume reaches its set's ratio times the trailing baseline.
+
+    NaN volumes are left out of both means. A run with no volume to judge, or no trailing
+    bars with volume (e.g. one starting at bar 0), counts as confirmed.
+    """
+    ratios = np.array([p.min_volume_ratio for p in params], dtype=float)[set_idx]
+    windows = np.array([max(p.volume_window, 1) for p in params], dtype=np.int64)[set_idx]
+    known = ~np.isnan(volume)
+    csum = np.concatenate([[0.0], np.cumsum(np.where(known, volume, 0.0))])
+    ccount = np.concatenate([[0], np.cumsum(known)])
+
+    base_lo = np.maximum(starts - windows, 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        run_mean = (csum[ends + 1] - csum[starts]) / (ccount[ends + 1] - ccount[starts])
+        baseline = (csum[starts] - csum[base_lo]) / (ccount[starts] - ccount[base_lo])
+    unjudged = np.isnan(run_mean) | np.isnan(baseline)
+    return (ratios <= 0) | unjudged | (run_mean >= ratios * baseline)
@@ -0,0 +1,215 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.config_spa import SPA_SHAPE_POINTS_DEFAULT
+from src.patterns.runs import compute_run_segments, flatten_price_panel
+
+_META_FILENAME = "meta.json"
+_ARRAY_FILES = ("vectors", "sq_norms", "ticker_codes", "run_ids", "starts")
+
+# Runs resampled per chunk while building, and index rows scanned per distance block.
+_RESAMPLE_CHUNK = 1 << 18
+_QUERY_BLOCK = 1 << 19
+
+
+def resample_run_paths(
+    prices: np.ndarray,
+    start_idx: np.ndarray,
+    end_idx: np.ndarray,
+    n_points: int = SPA_SHAPE_POINTS_DEFAULT,
+) -> np.ndarray:
+    """
+    Resample each run's price path to ``n_points`` evenly spaced points.
+
+    Paths are expressed as percent change from the run's start price and linearly
+    interpolated between bars, so runs of any length become comparable float32 vectors.
+    """
+    prices = np.asarray(prices, dtype=float)
+    start_idx = np.asarray(start_idx, dtype=np.int64)
+    end_idx = np.asarray(end_idx, dtype=np.int64)
+    grid = np.linspace(0.0, 1.0, n_points)
+    vectors = np.empty((start_idx.shape[0], n_points), dtype=np.float32)
+
+    for lo_run in range(0, start_idx.shape[0], _RESAMPLE_CHUNK):
+        starts = start_idx[lo_run : lo_run + _RESAMPLE_CHUNK, None]
+        ends = end_idx[lo_run : lo_run + _RESAMPLE_CHUNK, None]
+        positions = starts + (ends - starts) * grid
+        left = np.floor(positions).astype(np.int64)
+        right = np.minimum(left + 1, ends)
+        frac = positions - left
+        path = prices[left] * (1.0 - frac) + prices[right] * frac
+        with np.errstate(divide="ignore", invalid="ignore"):
+            path = (path / prices[starts] - 1.0) * 100.0
+        vectors[lo_run : lo_run + _RESAMPLE_CHUNK] = np.nan_to_num(path, nan=0.0, posinf=0.0, neginf=0.0)
+    return vectors
+
+
+class RunShapeIndex:
+    """
+    k-nearest-neighbour index over resampled run shapes.
+
+    Vectors live in one float32 matrix with precomputed squared norms; queries scan it in
+    blocks with a matrix product, keeping a running top-k, so memory stays bounded and a
+    memory-mapped index never has to be read into RAM at once.
+    """
+
+    def __init__(
+        self,
+        vectors: np.ndarray,
+        tickers: np.ndarray,
+        run_ids: np.ndarray,
+        starts: np.ndarray,
+        ticker_names: Optional[np.ndarray] = None,
+        sq_norms: Optional[np.ndarray] = None,
+    ) -> None:
+        if ticker_names is None:
+            codes, names = pd.factorize(np.asarray(tickers, dtype=object))
+            self.ticker_codes = codes.astype(np.int32)
+            self.ticker_names = np.asarray(names, dtype=object)
+        else:
+            self.ticker_codes = np.asarray(tickers)
+            self.ticker_names = np.asarray(ticker_names, dtype=object)
+        self.vectors = vectors
+        self.run_ids = np.asarray(run_ids)
+        self.starts = np.asarray(starts)
+        if sq_norms is None:
+            sq_norms = np.einsum("ij,ij->i", vectors, vectors, dtype=np.float32)
+        self.sq_norms = sq_norms
+
+    def __len__(self) -> int:
+        return int(self.vectors.shape[0])
+
+    @property
+    def n_points(self) -> int:
+        return int(self.vectors.shape[1])
+
+    @classmethod
+    def from_runs(
+        cls,
+        df: pd.DataFrame,
+        runs_df: pd.DataFrame,
+        ticker: str,
+        price_col: str = "close",
+        n_points: int = SPA_SHAPE_POINTS_DEFAULT,
+    ) -> "RunShapeIndex":
+        """Index the runs of one ticker, as returned by ``detect_price_runs`` for ``df``."""
+        start_idx = df.index.get_indexer(pd.DatetimeIndex(runs_df["start"]))
+        end_idx = df.index.get_indexer(pd.DatetimeIndex(runs_df["end"]))
+        if np.any(start_idx < 0) or np.any(end_idx < 0):
+            raise ValueError("Run start/end dates must be present in the price index.")
+        vectors = resample_run_paths(df[price_col].to_numpy(dtype=float), start_idx, end_idx, n_points)
+        return cls(
+            vectors,
+            tickers=np.full(len(runs_df), ticker, dtype=object),
+            run_ids=runs_df["run_id"].to_numpy(dtype=np.int64),
+            starts=pd.DatetimeIndex(runs_df["start"]).to_numpy(dtype="datetime64[ns]"),
+        )
+
+    @classmethod
+    def from_panel(
+        cls,
+        prices: pd.DataFrame,
+        price_col: str = "close",
+        ticker_col: str = "ticker",
+        date_col: str = "date",
+        n_points: int = SPA_SHAPE_POINTS_DEFAULT,
+    ) -> "RunShapeIndex":
+        """Detect and index every run of a price panel (same layouts as ``detect_price_runs_panel``)."""
+        flat_prices, dates, series_starts, names, _ = flatten_price_panel(prices, price_col, ticker_col, date_col)
+        segments = compute_run_segments(flat_prices, series_starts)
+        vectors = resample_run_paths(flat_prices, segments.start_idx, segments.end_idx, n_points)
+        return cls(
+            vectors,
+            tickers=segments.series_idx.astype(np.int32),
+            run_ids=segments.run_id,
+            starts=pd.DatetimeIndex(dates).to_numpy(dtype="datetime64[ns]")[segments.start_idx],
+            ticker_names=names,
+        )
+
+    def query(self, vector: np.ndarray, k: int = 10) -> pd.DataFrame:
+        """Return the ``k`` indexed runs closest to ``vector`` (Euclidean), nearest first."""
+        positions, distances = self._knn(np.asarray(vector, dtype=np.float32)[None, :], k, exclude=None)
+        return self._results_frame(positions[0], distances[0])
+
+    def query_run(self, ticker: str, run_id: int, k: int = 10) -> pd.DataFrame:
+        """Return the ``k`` runs that look most like an indexed run, excluding the run itself."""
+        matches = np.flatnonzero(self.ticker_names == ticker)
+        if matches.shape[0] == 0:
+            raise KeyError(f"Ticker {ticker!r} is not in the index.")
+        row = np.flatnonzero((self.ticker_codes == matches[0]) & (self.run_ids == run_id))
+        if row.shape[0] == 0:
+            raise KeyError(f"Run {run_id} of {ticker!r} is not in the index.")
+        query = np.asarray(self.vectors[row[0]], dtype=np.float32)[None, :]
+        positions, distances = self._knn(query, k, exclude=int(row[0]))
+        return self._results_frame(positions[0], distances[0])
+
+    def save(self, directory: str | Path) -> None:
+        """Write the index as .npy arrays plus a small JSON header."""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        for name in _ARRAY_FILES:
+            np.save(directory / f"{name}.npy", np.ascontiguousarray(getattr(self, name)))
+        meta = {"n_points": self.n_points, "tickers": [str(t) for t in self.ticker_names]}
+        (directory / _META_FILENAME).write_text(json.dumps(meta))
+
+    @classmethod
+    def load(cls, directory: str | Path, mmap: bool = True) -> "RunShapeIndex":
+        """Open a saved index; with ``mmap`` the arrays are memory-mapped rather than read."""
+        directory = Path(directory)
+        meta = json.loads((directory / _META_FILENAME).read_text())
+        mode = "r" if mmap else None
+        arrays = {name: np.load(directory / f"{name}.npy", mmap_mode=mode) for name in _ARRAY_FILES}
+        return cls(
+            arrays["vectors"],
+            tickers=arrays["ticker_codes"],
+            run_ids=arrays["run_ids"],
+            starts=arrays["starts"],
+            ticker_names=np.asarray(meta["tickers"], dtype=object),
+            sq_norms=arrays["sq_norms"],
+        )
+
+    def _knn(self, queries: np.ndarray, k: int, exclude: Optional[int]) -> Tuple[np.ndarray, np.ndarray]:
+        """Blocked exact search; returns (positions, distances) of shape (n_queries, k)."""
+        k = min(k, len(self) - (exclude is not None))
+        n_queries = queries.shape[0]
+        best_pos = np.empty((n_queries, 0), dtype=np.int64)
+        best_d2 = np.empty((n_queries, 0), dtype=np.float32)
+        if k <= 0:
+            return best_pos, best_d2
+        query_sq = np.einsum("ij,ij->i", queries, queries)
+
+        for lo in range(0, len(self), _QUERY_BLOCK):
+            block = np.asarray(self.vectors[lo : lo + _QUERY_BLOCK])
+            d2 = np.asarray(self.sq_norms[lo : lo + _QUERY_BLOCK])[None, :] - 2.0 * (queries @ block.T)
+            d2 += query_sq[:, None]
+            if exclude is not None and lo <= exclude < lo + block.shape[0]:
+                d2[:, exclude - lo] = np.inf
+            take = min(k, block.shape[0])
+            top = np.argpartition(d2, take - 1, axis=1)[:, :take]
+            best_pos = np.concatenate([best_pos, top + lo], axis=1)
+            best_d2 = np.concatenate([best_d2, np.take_along_axis(d2, top, axis=1)], axis=1)
+            if best_pos.shape[1] > k:
+                keep = np.argpartition(best_d2, k - 1, axis=1)[:, :k]
+                best_pos = np.take_along_axis(best_pos, keep, axis=1)
+                best_d2 = np.take_along_axis(best_d2, keep, axis=1)
+
+        order = np.lexsort((best_pos, best_d2), axis=1)
+        best_pos = np.take_along_axis(best_pos, order, axis=1)
+        best_d2 = np.take_along_axis(best_d2, order, axis=1)
+        return best_pos, np.sqrt(np.maximum(best_d2, 0.0))
+
+    def _results_frame(self, positions: np.ndarray, distances: np.ndarray) -> pd.DataFrame:
+        return pd.DataFrame(
+            {
+                "ticker": self.ticker_names[np.asarray(self.ticker_codes)[positions]],
+                "run_id": np.asarray(self.run_ids)[positions],
+                "start": pd.DatetimeIndex(np.asarray(self.starts)[positions]),
+                "distance": distances,
+            }
+        )
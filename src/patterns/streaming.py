@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from src.patterns.runs import PriceRun, _segment_max_adverse_moves
+
+
+@dataclass
+class _OpenRunState:
+    """Running aggregates of the run still open at the end of the last chunk."""
+
+    run_id: int
+    flag: int
+    start: np.datetime64
+    start_price: float
+    end: np.datetime64
+    end_price: float
+    duration_bars: int
+    running_extreme: float
+    worst_adverse: float
+
+    def extend(self, values: np.ndarray, end: np.datetime64) -> None:
+        """Fold more bars of this run into the aggregates, with the engine's arithmetic."""
+        if self.flag > 0:
+            running = np.maximum(np.maximum.accumulate(values), self.running_extreme)
+        else:
+            running = np.minimum(np.minimum.accumulate(values), self.running_extreme)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            adverse = values / running - 1.0
+        reduce = np.fmin if self.flag > 0 else np.fmax
+        self.worst_adverse = float(reduce(self.worst_adverse, reduce.reduce(adverse)))
+        self.running_extreme = float(running[-1])
+        self.end = end
+        self.end_price = float(values[-1])
+        self.duration_bars += int(values.shape[0])
+
+
+class StreamingRunDetector:
+    """
+    Detect runs over bars delivered chunk by chunk, with memory bounded by the chunk size.
+
+    Between chunks only the last close, its flag and run label, and the aggregates of
+    the open run are kept, so a run spanning any number of chunks is stitched without
+    holding its bars. Feeding every chunk and then calling ``finish`` yields exactly the
+    rows ``detect_price_runs`` returns for the concatenated bars.
+    """
+
+    def __init__(self, price_col: str = "close") -> None:
+        self.price_col = price_col
+        self._prev_price: Optional[float] = None
+        self._prev_flag = 0
+        self._prev_ts: Optional[pd.Timestamp] = None
+        self._label = 0
+        self._open: Optional[_OpenRunState] = None
+        self.bars_seen = 0
+
+    def feed(self, chunk: pd.DataFrame) -> pd.DataFrame:
+        """Consume the next bars and return the runs that closed within them."""
+        if chunk.empty:
+            return _empty_runs()
+        self._validate_chunk(chunk)
+        prices = chunk[self.price_col].to_numpy(dtype=float)
+        stamps = chunk.index.to_numpy()
+        n_bars = prices.shape[0]
+
+        previous = np.empty(n_bars, dtype=float)
+        previous[0] = np.nan if self._prev_price is None else self._prev_price
+        previous[1:] = prices[:-1]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            returns = prices / previous - 1.0
+        flags = (returns > 0).astype(np.int8) - (returns < 0).astype(np.int8)
+
+        changes = np.empty(n_bars, dtype=bool)
+        changes[0] = self._prev_price is None or flags[0] != self._prev_flag
+        changes[1:] = flags[1:] != flags[:-1]
+        labels = self._label + np.cumsum(changes)
+
+        block_starts = np.flatnonzero(changes)
+        if not changes[0]:
+            block_starts = np.concatenate([[0], block_starts])
+        block_ends = np.append(block_starts[1:], n_bars) - 1
+        n_blocks = block_starts.shape[0]
+
+        closed: List[pd.DataFrame] = []
+        first_new_block = 0
+        if self._open is not None and changes[0]:
+            # The open run ended on the previous chunk's last bar.
+            closed.append(_state_frame(self._open))
+            self._open = None
+        elif self._open is not None:
+            self._open.extend(prices[: block_ends[0] + 1], stamps[block_ends[0]])
+            first_new_block = 1
+            if n_blocks > 1:
+                closed.append(_state_frame(self._open))
+                self._open = None
+
+        # Blocks strictly between the continued head and the tail are complete runs.
+        middle = np.arange(first_new_block, n_blocks - 1)
+        middle = middle[flags[block_starts[middle]] != 0]
+        if middle.shape[0]:
+            starts, ends = block_starts[middle], block_ends[middle]
+            run_flags = flags[starts]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                pct_change = ((prices[ends] / prices[starts]) - 1.0) * 100.0
+            closed.append(
+                _runs_frame(
+                    labels[starts],
+                    run_flags,
+                    stamps[starts],
+                    stamps[ends],
+                    ends - starts + 1,
+                    pct_change,
+                    _segment_max_adverse_moves(prices, starts, ends, run_flags),
+                )
+            )
+
+        tail = n_blocks - 1
+        if tail >= first_new_block and flags[block_starts[tail]] != 0:
+            start = block_starts[tail]
+            flag = int(flags[start])
+            self._open = _OpenRunState(
+                run_id=int(labels[start]),
+                flag=flag,
+                start=stamps[start],
+                start_price=float(prices[start]),
+                end=stamps[start],
+                end_price=float(prices[start]),
+                duration_bars=0,
+                running_extreme=float(prices[start]),
+                worst_adverse=np.nan,
+            )
+            self._open.extend(prices[start:], stamps[-1])
+
+        self._prev_price = float(prices[-1])
+        self._prev_flag = int(flags[-1])
+        self._label = int(labels[-1])
+        self._prev_ts = chunk.index[-1]
+        self.bars_seen += n_bars
+        return pd.concat(closed, ignore_index=True) if closed else _empty_runs()
+
+    def finish(self) -> pd.DataFrame:
+        """Close the run still open after the last chunk, if any."""
+        if self._open is None:
+            return _empty_runs()
+        frame = _state_frame(self._open)
+        self._open = None
+        return frame
+
+    def _validate_chunk(self, chunk: pd.DataFrame) -> None:
+        if self.price_col not in chunk.columns:
+            raise ValueError(f"DataFrame must contain '{self.price_col}' column.")
+        if not pd.api.types.is_datetime64_any_dtype(chunk.index):
+            raise ValueError("DataFrame index must be a DatetimeIndex.")
+        if not chunk.index.is_monotonic_increasing:
+            raise ValueError("DataFrame index must be sorted ascending by date.")
+        if self._prev_ts is not None and chunk.index[0] < self._prev_ts:
+            raise ValueError("Chunks must arrive in ascending date order.")
+
+
+def iter_price_runs(chunks: Iterable[pd.DataFrame], price_col: str = "close") -> Iterator[pd.DataFrame]:
+    """Yield finished runs chunk by chunk; nothing but the current chunk is held in memory."""
+    detector = StreamingRunDetector(price_col=price_col)
+    for chunk in chunks:
+        runs = detector.feed(chunk)
+        if not runs.empty:
+            yield runs
+    tail = detector.finish()
+    if not tail.empty:
+        yield tail
+
+
+def detect_price_runs_chunked(chunks: Iterable[pd.DataFrame], price_col: str = "close") -> pd.DataFrame:
+    """Collect ``iter_price_runs`` into one runs frame (memory grows with runs, not bars)."""
+    frames = list(iter_price_runs(chunks, price_col=price_col))
+    return pd.concat(frames, ignore_index=True) if frames else _empty_runs()
+
+
+def iter_parquet_bars(
+    path: str | Path,
+    columns: Sequence[str] = ("close",),
+    batch_size: Optional[int] = None,
+    date_col: str = "date",
+) -> Iterator[pd.DataFrame]:
+    """
+    Stream bars from a Parquet file as date-indexed frames.
+
+    Reads one row group at a time, or ``batch_size`` rows at a time when given, and
+    only the requested columns.
+    """
+    parquet_file = pq.ParquetFile(path)
+    if date_col not in parquet_file.schema_arrow.names:
+        raise ValueError(f"Parquet file {path} has no '{date_col}' column.")
+    wanted = [date_col, *[col for col in columns if col != date_col]]
+    if batch_size is not None:
+        batches = parquet_file.iter_batches(batch_size=batch_size, columns=wanted)
+    else:
+        batches = (parquet_file.read_row_group(i, columns=wanted) for i in range(parquet_file.num_row_groups))
+    for batch in batches:
+        frame = batch.to_pandas()
+        if date_col in frame.columns:
+            frame = frame.set_index(date_col)
+        yield frame
+
+
+def _state_frame(state: _OpenRunState) -> pd.DataFrame:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pct_change = ((np.float64(state.end_price) / np.float64(state.start_price)) - 1.0) * 100.0
+    return _runs_frame(
+        np.array([state.run_id], dtype=np.int64),
+        np.array([state.flag], dtype=np.int8),
+        np.array([state.start]),
+        np.array([state.end]),
+        np.array([state.duration_bars], dtype=np.int64),
+        np.array([pct_change], dtype=float),
+        np.array([state.worst_adverse * 100.0], dtype=float),
+    )
+
+
+def _runs_frame(run_ids, run_flags, starts, ends, durations, pct_change, max_drawdown_pct) -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "run_id": np.asarray(run_ids, dtype=np.int64),
+            "direction": np.where(np.asarray(run_flags) > 0, "up", "down").astype(object),
+            "start": pd.DatetimeIndex(starts),
+            "end": pd.DatetimeIndex(ends),
+            "duration_bars": np.asarray(durations, dtype=np.int64),
+            "pct_change": pct_change,
+            "max_drawdown_pct": max_drawdown_pct,
+        }
+    )
+
+
+def _empty_runs() -> pd.DataFrame:
+    return pd.DataFrame(columns=list(PriceRun.__dataclass_fields__))
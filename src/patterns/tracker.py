@@ -0,0 +1,200 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .runs import PriceRun, compute_run_segments, direction_flags, runs_frame_from_segments
+
+RUN_OPENED = "opened"
+RUN_EXTENDED = "extended"
+RUN_CLOSED = "closed"
+
+
+@dataclass(frozen=True)
+class RunDelta:
+    """Change to the run table caused by appended bars: a run opened, extended, or closed."""
+
+    kind: str
+    run: PriceRun
+
+
+class RunTracker:
+    """
+    Incremental run detector seeded from history.
+
+    Only the last run can change when a bar is appended, so the tracker keeps finished runs
+    as-is and carries just enough state for the open tail run (start/end price, running
+    high/low and worst adverse move). `runs_frame()` always equals `detect_price_runs` over
+    the full history, and `append`/`update` report what changed as RunDelta items.
+    """
+
+    def __init__(self, price_col: str = "close") -> None:
+        self.price_col = price_col
+        self._closed: List[PriceRun] = []
+        self._seed_frame: Optional[pd.DataFrame] = None
+        self._index_unit: Optional[str] = None
+        self._last_ts: Optional[pd.Timestamp] = None
+        self._last_price = np.float64(np.nan)
+        self._last_flag = 0
+        self._label = 0
+        self._open: Optional[_OpenRun] = None
+
+    @classmethod
+    def from_history(cls, df: pd.DataFrame, price_col: str = "close") -> "RunTracker":
+        """Seed a tracker from an ascending, DatetimeIndex-ed price history."""
+        if price_col not in df.columns:
+            raise ValueError(f"DataFrame must contain '{price_col}' column.")
+        if not df.index.is_monotonic_increasing:
+            raise ValueError("DataFrame index must be sorted ascending by date.")
+        if not pd.api.types.is_datetime64_any_dtype(df.index):
+            raise ValueError("DataFrame index must be a DatetimeIndex.")
+
+        tracker = cls(price_col=price_col)
+        if df.empty:
+            return tracker
+        tracker._index_unit = getattr(df.index, "unit", None)
+
+        prices = df[price_col].astype(float).to_numpy()
+        flags = direction_flags(prices)
+        segments = compute_run_segments(prices)
+        tail_is_open = len(segments) > 0 and flags[-1] != 0
+        n_closed = len(segments) - 1 if tail_is_open else len(segments)
+
+        if n_closed:
+            tracker._seed_frame = runs_frame_from_segments(segments, df.index).iloc[:n_closed]
+        tracker._label = 1 + int(np.count_nonzero(flags[1:] != flags[:-1]))
+        tracker._last_flag = int(flags[-1])
+        tracker._last_price = np.float64(prices[-1])
+        tracker._last_ts = df.index[-1]
+
+        if tail_is_open:
+            start, end = int(segments.start_idx[-1]), int(segments.end_idx[-1])
+            open_run = _OpenRun(int(segments.run_id[-1]), int(flags[-1]), df.index[start], prices[start])
+            for pos in range(start + 1, end + 1):
+                open_run.extend(df.index[pos], prices[pos])
+            tracker._open = open_run
+        return tracker
+
+    def append(self, ts: pd.Timestamp, price: float) -> List[RunDelta]:
+        """Append one bar and return the resulting deltas."""
+        deltas: List[RunDelta] = []
+        self._apply(pd.Timestamp(ts), np.float64(price), deltas)
+        return deltas
+
+    def update(self, bars: pd.DataFrame) -> List[RunDelta]:
+        """Append one or many bars (ascending DatetimeIndex, price_col column) and return deltas."""
+        if self.price_col not in bars.columns:
+            raise ValueError(f"DataFrame must contain '{self.price_col}' column.")
+        if not bars.index.is_monotonic_increasing:
+            raise ValueError("DataFrame index must be sorted ascending by date.")
+
+        deltas: List[RunDelta] = []
+        prices = bars[self.price_col].to_numpy(dtype=float)
+        for ts, price in zip(bars.index, prices):
+            self._apply(ts, np.float64(price), deltas)
+        return deltas
+
+    @property
+    def open_run(self) -> Optional[PriceRun]:
+        """The still-open tail run, if the latest bar moved."""
+        return self._open.snapshot() if self._open is not None else None
+
+    def runs_frame(self) -> pd.DataFrame:
+        """Return all runs (closed plus the open tail) in the `detect_price_runs` schema."""
+        runs = list(self._closed)
+        if self._open is not None:
+            runs.append(self._open.snapshot())
+        if self._seed_frame is None and not runs:
+            return pd.DataFrame(columns=[field for field in PriceRun.__dataclass_fields__])
+
+        frames = [] if self._seed_frame is None else [self._seed_frame]
+        if runs:
+            appended = pd.DataFrame([run.__dict__ for run in runs])
+            if self._index_unit is not None:
+                for col in ("start", "end"):
+                    appended[col] = appended[col].dt.as_unit(self._index_unit)
+            frames.append(appended)
+        return pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0].reset_index(drop=True)
+
+    def _apply(self, ts: pd.Timestamp, price: np.float64, deltas: List[RunDelta]) -> None:
+        if self._last_ts is not None and ts <= self._last_ts:
+            raise ValueError(f"Bar at {ts} is not after the last tracked bar ({self._last_ts}).")
+        if self._index_unit is None:
+            self._index_unit = getattr(ts, "unit", None)
+
+        if self._last_ts is None:
+            flag = 0
+        else:
+            with np.errstate(divide="ignore", invalid="ignore"):
+                ret = price / self._last_price - 1.0
+            flag = int(ret > 0) - int(ret < 0)
+
+        if self._last_ts is None or flag != self._last_flag:
+            self._label += 1
+            if self._open is not None:
+                closed = self._open.snapshot()
+                self._closed.append(closed)
+                self._open = None
+                deltas.append(RunDelta(RUN_CLOSED, closed))
+            if flag != 0:
+                self._open = _OpenRun(self._label, flag, ts, price)
+                deltas.append(RunDelta(RUN_OPENED, self._open.snapshot()))
+        elif flag != 0 and self._open is not None:
+            self._open.extend(ts, price)
+            snapshot = self._open.snapshot()
+            last = deltas[-1] if deltas else None
+            # Collapse consecutive changes to the same run within one update into its latest state.
+            if last is not None and last.kind in (RUN_OPENED, RUN_EXTENDED) and last.run.run_id == snapshot.run_id:
+                deltas[-1] = RunDelta(last.kind, snapshot)
+            else:
+                deltas.append(RunDelta(RUN_EXTENDED, snapshot))
+
+        self._last_ts = ts
+        self._last_price = price
+        self._last_flag = flag
+
+
+class _OpenRun:
+    """Mutable state of the tail run, mirroring the vectorized engine's arithmetic exactly."""
+
+    def __init__(self, run_id: int, flag: int, start: pd.Timestamp, price: np.float64) -> None:
+        self.run_id = run_id
+        self.flag = flag
+        self.start = start
+        self.end = start
+        self.start_price = np.float64(price)
+        self.end_price = np.float64(price)
+        self.duration = 1
+        self.extreme = np.float64(price)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.worst = np.float64(price) / self.extreme - 1.0
+
+    def extend(self, ts: pd.Timestamp, price: np.float64) -> None:
+        price = np.float64(price)
+        self.end = ts
+        self.end_price = price
+        self.duration += 1
+        # Ties take the newer value, as np.maximum/np.minimum.accumulate do.
+        if self.flag > 0:
+            self.extreme = price if price >= self.extreme else self.extreme
+        else:
+            self.extreme = price if price <= self.extreme else self.extreme
+        with np.errstate(divide="ignore", invalid="ignore"):
+            adverse = price / self.extreme - 1.0
+        self.worst = np.fmin(self.worst, adverse) if self.flag > 0 else np.fmax(self.worst, adverse)
+
+    def snapshot(self) -> PriceRun:
+        with np.errstate(divide="ignore", invalid="ignore"):
+            pct_change = ((self.end_price / self.start_price) - 1.0) * 100.0
+        return PriceRun(
+            run_id=self.run_id,
+            direction="up" if self.flag > 0 else "down",
+            start=self.start,
+            end=self.end,
+            duration_bars=self.duration,
+            pct_change=float(pct_change),
+            max_drawdown_pct=float(self.worst * 100.0),
+        )
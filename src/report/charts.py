@@ -2,8 +2,17 @@ from __future__ import annotations
 
 from pathlib import Path
 
+import matplotlib.dates as mdates
 import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
+from matplotlib.collections import PolyCollection
+from matplotlib.colors import to_rgba
+
+_UP_COLOR = "#2ca02c"
+_DOWN_COLOR = "#d62728"
+_EVENT_COLOR = "#1f77b4"
+_DPI = 200
 
 
 def plot_price_with_runs(
@@ -11,6 +20,7 @@ def plot_price_with_runs(
     runs_df: pd.DataFrame,
     output_path: str,
     price_col: str = "close",
+    downsample: bool = False,
 ) -> None:
     """Plot closing prices with transparent overlays for up/down runs."""
     if price_col not in df.columns:
@@ -21,29 +31,13 @@ def plot_price_with_runs(
     price_series = df[price_col]
 
     fig, ax = plt.subplots(figsize=(10, 5))
-    ax.plot(price_series.index, price_series, label=price_col.capitalize(), color="black")
+    _plot_price_line(ax, price_series, price_col, downsample)
 
     if not runs_df.empty:
-        for _, run in runs_df.iterrows():
-            start = pd.Timestamp(run["start"])
-            end = pd.Timestamp(run["end"])
-            direction = str(run["direction"]).lower()
-            color = "#2ca02c" if direction == "up" else "#d62728"
-            ax.axvspan(start, end, color=color, alpha=0.15)
+        _draw_run_spans(ax, runs_df, alpha=0.15)
 
     ax.set_title("Price with Detected Runs")
-    ax.set_xlabel("Date")
-    ax.set_ylabel("Price")
-    ax.legend(loc="upper left")
-    ax.grid(True, linestyle="--", alpha=0.15, linewidth=0.5)
-    plt.setp(ax.get_xticklabels(), rotation=25, ha="right")
-    fig.subplots_adjust(left=0.08, right=0.98)
-
-    output_path = Path(output_path)
-    output_path.parent.mkdir(parents=True, exist_ok=True)
-    fig.tight_layout()
-    fig.savefig(output_path, dpi=200)
-    plt.close(fig)
+    _finish_and_save(fig, ax, output_path)
 
 
 def plot_price_with_runs_and_events(
@@ -52,6 +46,7 @@ def plot_price_with_runs_and_events(
     events_by_run: dict[int, list[dict]],
     output_path: str,
     price_col: str = "close",
+    downsample: bool = False,
 ) -> None:
     """Plot prices with run overlays and event markers."""
     if price_col not in df.columns:
@@ -62,15 +57,10 @@ def plot_price_with_runs_and_events(
     price_series = df[price_col]
 
     fig, ax = plt.subplots(figsize=(10, 5))
-    ax.plot(price_series.index, price_series, label=price_col.capitalize(), color="black")
+    _plot_price_line(ax, price_series, price_col, downsample)
 
     if runs_df is not None and not runs_df.empty:
-        for _, run in runs_df.iterrows():
-            start = pd.Timestamp(run["start"])
-            end = pd.Timestamp(run["end"])
-            direction = str(run["direction"]).lower()
-            color = "#2ca02c" if direction == "up" else "#d62728"
-            ax.axvspan(start, end, color=color, alpha=0.08)
+        _draw_run_spans(ax, runs_df, alpha=0.08)
 
     # Collect unique event dates for markers.
     event_dates = []
@@ -82,14 +72,103 @@ def plot_price_with_runs_and_events(
                     event_dates.append(date_val.normalize())
 
     if event_dates:
-        unique_dates = sorted({d for d in event_dates})
-        for d in unique_dates:
-            ax.axvline(d, color="#1f77b4", linestyle="--", alpha=0.15, linewidth=0.75)
-        for d in unique_dates:
-            if d in price_series.index:
-                ax.scatter(d, price_series.loc[d], color="#1f77b4", s=18, zorder=3, label="_nolegend_")
+        unique_dates = pd.DatetimeIndex(sorted(set(event_dates)))
+        ax.vlines(
+            unique_dates,
+            0,
+            1,
+            transform=ax.get_xaxis_transform(),
+            colors=_EVENT_COLOR,
+            linestyles="--",
+            alpha=0.15,
+            linewidth=0.75,
+        )
+        on_chart = unique_dates[unique_dates.isin(price_series.index)]
+        if len(on_chart):
+            ax.scatter(
+                on_chart,
+                price_series.loc[on_chart],
+                color=_EVENT_COLOR,
+                s=18,
+                zorder=3,
+                label="_nolegend_",
+            )
 
     ax.set_title("Price with Runs and Events")
+    _finish_and_save(fig, ax, output_path)
+
+
+def lttb_indices(y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets downsampling over evenly spaced x.
+
+    Returns sorted indices of at most n_out points (always keeping the first and last)
+    that preserve the visual shape of the series.
+    """
+    n_points = y.shape[0]
+    if n_out >= n_points or n_out < 3:
+        return np.arange(n_points)
+
+    x = np.arange(n_points, dtype=float)
+    # Interior points split into n_out - 2 buckets; bucket i is [bounds[i], bounds[i + 1]).
+    every = (n_points - 2) / (n_out - 2)
+    bounds = (np.floor(np.arange(n_out - 1) * every) + 1).astype(np.int64)
+    bounds[-1] = n_points - 1
+
+    selected = np.empty(n_out, dtype=np.int64)
+    selected[0] = 0
+    selected[-1] = n_points - 1
+    anchor = 0
+    for bucket in range(n_out - 2):
+        lo, hi = bounds[bucket], bounds[bucket + 1]
+        next_hi = bounds[bucket + 2] if bucket + 2 < n_out - 1 else n_points
+        avg_x = x[hi:next_hi].mean()
+        avg_y = y[hi:next_hi].mean()
+        areas = np.abs(
+            (x[anchor] - avg_x) * (y[lo:hi] - y[anchor]) - (x[anchor] - x[lo:hi]) * (avg_y - y[anchor])
+        )
+        anchor = lo + int(np.argmax(areas))
+        selected[bucket + 1] = anchor
+    return selected
+
+
+def _plot_price_line(ax, price_series: pd.Series, price_col: str, downsample: bool) -> None:
+    """Draw the price line, optionally LTTB-downsampled to the rendered pixel width."""
+    if downsample:
+        fig = ax.get_figure()
+        pixel_width = int(fig.get_figwidth() * _DPI)
+        values = price_series.to_numpy(dtype=float)
+        if np.isfinite(values).all():
+            price_series = price_series.iloc[lttb_indices(values, pixel_width)]
+    ax.plot(price_series.index, price_series, label=price_col.capitalize(), color="black")
+
+
+def _draw_run_spans(ax, runs_df: pd.DataFrame, alpha: float) -> None:
+    """Draw every run as a full-height band in a single PolyCollection artist."""
+    starts = mdates.date2num(pd.DatetimeIndex(pd.to_datetime(runs_df["start"])))
+    ends = mdates.date2num(pd.DatetimeIndex(pd.to_datetime(runs_df["end"])))
+    is_up = runs_df["direction"].astype(str).str.lower().eq("up").to_numpy()
+
+    verts = np.empty((len(runs_df), 4, 2), dtype=float)
+    verts[:, 0, 0] = starts
+    verts[:, 1, 0] = starts
+    verts[:, 2, 0] = ends
+    verts[:, 3, 0] = ends
+    verts[:, :, 1] = (0.0, 1.0, 1.0, 0.0)
+
+    colors = np.where(is_up[:, None], to_rgba(_UP_COLOR, alpha), to_rgba(_DOWN_COLOR, alpha))
+    spans = PolyCollection(
+        verts,
+        facecolors=colors,
+        edgecolors=colors,
+        linewidths=plt.rcParams["patch.linewidth"],
+        transform=ax.get_xaxis_transform(),
+    )
+    ax.add_collection(spans, autolim=False)
+
+
+def _finish_and_save(fig, ax, output_path: str) -> None:
+    """Apply shared axis styling, save the figure, and close it."""
     ax.set_xlabel("Date")
     ax.set_ylabel("Price")
     ax.legend(loc="upper left")
@@ -100,5 +179,5 @@ def plot_price_with_runs_and_events(
     output_path = Path(output_path)
     output_path.parent.mkdir(parents=True, exist_ok=True)
     fig.tight_layout()
-    fig.savefig(output_path, dpi=200)
+    fig.savefig(output_path, dpi=_DPI)
     plt.close(fig)
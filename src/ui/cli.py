@@ -1,11 +1,15 @@
 from __future__ import annotations
 
 import argparse
+import sys
+import time
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, List, Optional
 
 import pandas as pd
 
+from src.catalog.run_catalog import RunCatalog
+from src.config_spa import SPA_RUN_CATALOG_PATH_DEFAULT
 from src.data.fetch_prices import fetch_daily_prices
 from src.patterns.runs import detect_price_runs
 from src.report.charts import plot_price_with_runs
@@ -64,9 +68,93 @@ def _build_parser() -> argparse.ArgumentParser:
     return parser
 
 
-def main() -> None:
+def ingest_catalog(eval_root: str, catalog_path: str) -> None:
+    """Bulk-load every ``<TICKER>/runs.parquet`` (or runs.csv) under an eval output root."""
+    runs_by_ticker = {}
+    for ticker_dir in sorted(p for p in Path(eval_root).iterdir() if p.is_dir()):
+        parquet_path = ticker_dir / "runs.parquet"
+        csv_path = ticker_dir / "runs.csv"
+        if parquet_path.exists():
+            runs_by_ticker[ticker_dir.name] = pd.read_parquet(parquet_path)
+        elif csv_path.exists():
+            runs_by_ticker[ticker_dir.name] = pd.read_csv(csv_path)
+
+    t0 = time.perf_counter()
+    written = RunCatalog(catalog_path).ingest_many(runs_by_ticker)
+    elapsed_ms = (time.perf_counter() - t0) * 1000.0
+    print(f"Ingested {sum(written.values())} runs for {len(written)} tickers into {catalog_path} in {elapsed_ms:.1f} ms")
+
+
+def query_catalog(args: argparse.Namespace) -> None:
+    """Run a catalog query from parsed CLI arguments and print the matching runs."""
+    t0 = time.perf_counter()
+    runs = RunCatalog(args.catalog).query(
+        tickers=args.tickers,
+        direction=args.direction,
+        min_pct_change=args.min_pct,
+        max_pct_change=args.max_pct,
+        min_duration=args.min_bars,
+        max_duration=args.max_bars,
+        start_from=args.start_from,
+        end_to=args.end_to,
+        order_by=args.order_by,
+        descending=not args.ascending,
+        limit=args.limit,
+    )
+    elapsed_ms = (time.perf_counter() - t0) * 1000.0
+
+    if runs.empty:
+        print(f"No runs matched ({elapsed_ms:.1f} ms).")
+        return
+    pd.set_option("display.width", 120)
+    pd.set_option("display.max_rows", None)
+    print(
+        runs.to_string(
+            index=False,
+            formatters={
+                "pct_change": "{:.2f}".format,
+                "max_drawdown_pct": "{:.2f}".format,
+            },
+        )
+    )
+    print(f"{len(runs)} runs in {elapsed_ms:.1f} ms")
+
+
+def _build_catalog_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="cli catalog", description="Query or load the indexed run catalog.")
+    parser.add_argument("--catalog", default=SPA_RUN_CATALOG_PATH_DEFAULT, help="Path to the SQLite run catalog")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    ingest = commands.add_parser("ingest", help="Load runs written by scripts/run_spa_eval.py")
+    ingest.add_argument("eval_root", help="Evaluation output root, e.g., artifacts/eval")
+
+    query = commands.add_parser("query", help="Filter runs across every ingested ticker")
+    query.add_argument("--tickers", nargs="+", default=None)
+    query.add_argument("--direction", choices=("up", "down"), default=None)
+    query.add_argument("--min-pct", type=float, default=None, dest="min_pct", help="Minimum pct_change")
+    query.add_argument("--max-pct", type=float, default=None, dest="max_pct", help="Maximum pct_change")
+    query.add_argument("--min-bars", type=int, default=None, dest="min_bars", help="Minimum duration in bars")
+    query.add_argument("--max-bars", type=int, default=None, dest="max_bars", help="Maximum duration in bars")
+    query.add_argument("--start-from", default=None, dest="start_from", help="Runs starting on/after (YYYY-MM-DD)")
+    query.add_argument("--end-to", default=None, dest="end_to", help="Runs ending on/before (YYYY-MM-DD)")
+    query.add_argument("--order-by", default="pct_change", dest="order_by")
+    query.add_argument("--ascending", action="store_true", help="Sort ascending instead of descending")
+    query.add_argument("--limit", type=int, default=None)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if argv[:1] == ["catalog"]:
+        args = _build_catalog_parser().parse_args(argv[1:])
+        if args.command == "ingest":
+            ingest_catalog(args.eval_root, args.catalog)
+        else:
+            query_catalog(args)
+        return
+
     parser = _build_parser()
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
     analyze_ticker(ticker=args.ticker, start=args.start, end=args.end, top_n=args.top_n)
 
 
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Sequence
+
+from src.cache import CacheBackend, fingerprint, get_cache_backend, track_cached_calls
+
+
+@dataclass(frozen=True)
+class StageRecord:
+    """How one pipeline stage was served: from the stage cache or recomputed, and how long it took."""
+
+    cache_hit: bool
+    seconds: float
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {"cache_hit": self.cache_hit, "seconds": round(self.seconds, 4)}
+
+
+class StagedPipeline:
+    """
+    Run named stages in order, memoizing each on its own parameters and its upstream stages.
+
+    A stage's cache key combines the function, the parameters it declares and the keys of
+    the stages it depends on, never the upstream data itself. Changing a parameter therefore
+    changes the key of the stage that reads it and of every stage downstream of it, while
+    upstream stages keep hitting the cache. Results live in the active src.cache backend.
+
+    A stage run with content_key=True passes a fingerprint of its value downstream instead,
+    so a recomputation that yields the same (small) result does not invalidate later stages.
+    A stage run with memoize=False still gets a key for its dependents but is always called,
+    for functions that already memoize themselves (e.g. through src.cache.cached) and would
+    otherwise be stored twice; it counts as a cache hit when every cached call it made hit.
+    """
+
+    def __init__(self, backend: Optional[CacheBackend] = None) -> None:
+        self._backend = backend
+        self.keys: Dict[str, str] = {}
+        self.values: Dict[str, Any] = {}
+        self.records: Dict[str, StageRecord] = {}
+
+    def run(
+        self,
+        name: str,
+        func: Callable[..., Any],
+        params: Dict[str, Any],
+        deps: Sequence[str] = (),
+        content_key: bool = False,
+        memoize: bool = True,
+    ) -> Any:
+        """
+        Return func(**deps, **params), called with each dependency's value under its stage name.
+
+        Exceptions propagate and are not cached; the stage is still recorded as a timed miss.
+        A stage run with memoize=False is recorded as a hit only if its own cached calls all hit.
+        """
+        qualified = f"{func.__module__}.{func.__qualname__}"
+        key = fingerprint("stage", name, qualified, params, [self.keys[d] for d in deps])
+        backend = self._backend or get_cache_backend()
+
+        started = time.perf_counter()
+        hit = False
+        try:
+            if not memoize:
+                with track_cached_calls() as calls:
+                    value = func(**{d: self.values[d] for d in deps}, **params)
+                hit = calls.all_hits
+            else:
+                hit, value = backend.get(key)
+                if not hit:
+                    value = func(**{d: self.values[d] for d in deps}, **params)
+                    backend.set(key, value)
+        finally:
+            self.records[name] = StageRecord(cache_hit=hit, seconds=time.perf_counter() - started)
+
+        self.keys[name] = fingerprint("stage-value", name, value) if content_key else key
+        self.values[name] = value
+        return value
+
+    def records_as_dict(self) -> Dict[str, Dict[str, Any]]:
+        return {name: record.as_dict() for name, record in self.records.items()}
@@ -1,16 +1,28 @@
 from __future__ import annotations
 
-from typing import Dict, List, Optional
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
 
 import pandas as pd
 
-from src.data.fetch_news import fetch_news_for_ticker
+from src.data.fetch_news import fetch_events_for_ticker
 from src.data.fetch_prices import fetch_daily_prices
 from src.events.correlate import correlate_runs_with_events
-from src.explain.explain_run import explain_run_with_events
-from src.explain.llm_client import LLMQuotaExceededError
+from src.events.dedupe import collapse_near_duplicate_events
+from src.events.relevance import correlate_runs_by_relevance
+from src.explain.executor import run_in_order
+from src.explain.explain_run import BatchExplanationStats, explain_run_with_usage, explain_runs_batched
+from src.explain.llm_client import LLMQuotaExceededError, TokenUsage
 from src.patterns.runs import detect_price_runs
-from src.config_spa import SPA_MAX_EXPLAINED_RUNS_DEFAULT
+from src.report.charts import plot_price_with_runs_and_events
+from src.ui.pipeline import StagedPipeline
+from src.config_spa import (
+    SPA_EXPLANATION_BATCH_SIZE_DEFAULT,
+    SPA_MAX_EVENTS_PER_RUN_DEFAULT,
+    SPA_MAX_EXPLAINED_RUNS_DEFAULT,
+)
 
 
 def run_spa_for_single_ticker(
@@ -22,11 +34,78 @@ def run_spa_for_single_ticker(
     fetch_events: bool = True,
     generate_explanations: bool = False,
     max_explained_runs: int = 3,
+    dedupe_events: bool = True,
+    max_events_per_run: int = SPA_MAX_EVENTS_PER_RUN_DEFAULT,
+    explanation_batch_size: int = SPA_EXPLANATION_BATCH_SIZE_DEFAULT,
+    render_chart: bool = False,
 ) -> Dict[str, Optional[object]]:
     """
     Run the SPA pipeline for a single ticker: fetch prices, detect runs, fetch/correlate events,
     and optionally generate historical-only explanations.
+
+    Events include the ticker's market-wide and sector events. With dedupe_events,
+    near-duplicate headlines are collapsed to one canonical event (with duplicate_count
+    and sources) before correlation, and max_news_items then caps each tag's collapsed
+    events rather than its raw headlines. By default each run keeps every event in its
+    window, nearest first (correlate_runs_with_events); with max_events_per_run > 0 it keeps
+    only that many, ranked by relevance (proximity, source weight and headline similarity
+    to the company).
+    Explanations are requested explanation_batch_size runs at a time; explanation_stats
+    records the requests and estimated input tokens saved by batching plus total token
+    usage, and each explanation carries its own token_usage.
+    Stages are memoized individually; result["stages"] records each one's cache_hit and
+    seconds (see iter_spa_for_single_ticker).
+    """
+    result: Dict[str, Optional[object]] = {}
+    for _, result in iter_spa_for_single_ticker(
+        ticker,
+        start,
+        end,
+        window_days=window_days,
+        max_news_items=max_news_items,
+        fetch_events=fetch_events,
+        generate_explanations=generate_explanations,
+        max_explained_runs=max_explained_runs,
+        dedupe_events=dedupe_events,
+        max_events_per_run=max_events_per_run,
+        explanation_batch_size=explanation_batch_size,
+        render_chart=render_chart,
+    ):
+        pass
+    return result
+
+
+def iter_spa_for_single_ticker(
+    ticker: str,
+    start: str,
+    end: str,
+    window_days: int = 2,
+    max_news_items: int = 50,
+    fetch_events: bool = True,
+    generate_explanations: bool = False,
+    max_explained_runs: int = 3,
+    dedupe_events: bool = True,
+    max_events_per_run: int = SPA_MAX_EVENTS_PER_RUN_DEFAULT,
+    explanation_batch_size: int = SPA_EXPLANATION_BATCH_SIZE_DEFAULT,
+    render_chart: bool = False,
+    pipeline: Optional[StagedPipeline] = None,
+) -> Iterator[Tuple[str, Dict[str, Optional[object]]]]:
     """
+    Run the same pipeline as run_spa_for_single_ticker, yielding (stage, result) as each stage finishes.
+
+    Stages are "prices", "runs", "events" (empty unless fetch_events), "correlations",
+    "explanations" (when generate_explanations and runs were found) and "chart" (when
+    render_chart and runs were found; PNG bytes in result["chart_png"]). Each stage is
+    memoized on its own parameters and upstream stages, so changing e.g. window_days only
+    recomputes correlations, and explanations/chart only if the correlations changed
+    (they are keyed by content, being small). Prices and runs are cached by
+    fetch_daily_prices/detect_price_runs themselves rather than by the stage, and report
+    that cache's hit; later stages are keyed on the price data itself, so new bars for the
+    same window invalidate them. result["stages"] records every stage's cache_hit and
+    seconds. A stage that fails sets result["error"] (or
+    result["explanation_error"]), is yielded, and is not cached.
+    """
+    pipeline = pipeline or StagedPipeline()
     result: Dict[str, Optional[object]] = {
         "prices": None,
         "runs": pd.DataFrame(),
@@ -35,86 +114,235 @@ def run_spa_for_single_ticker(
         "explanations": [],
         "error": None,
         "explanation_error": None,
+        "explanation_stats": None,
+        "chart_png": None,
+        "stages": {},
     }
 
+    def _stage(
+        name: str, func, params: Dict, deps: Tuple[str, ...] = (), content_key: bool = False, memoize: bool = True
+    ):
+        try:
+            return pipeline.run(name, func, params, deps, content_key=content_key, memoize=memoize)
+        finally:
+            result["stages"] = pipeline.records_as_dict()
+
     try:
-        prices = fetch_daily_prices(ticker, start, end)
-        result["prices"] = prices
+        # Prices and runs are memoized by their own @cached functions, so the stages do not store them again.
+        # Prices are keyed by content: fresh bars for a window ending today re-key every later stage.
+        result["prices"] = _stage(
+            "prices", _prices_stage, {"ticker": ticker, "start": start, "end": end}, content_key=True, memoize=False
+        )
     except Exception as exc:  # pragma: no cover - runtime path
         result["error"] = f"Failed to fetch prices for {ticker}: {exc}"
-        return result
+    yield "prices", result
+    if result["error"]:
+        return
 
     try:
-        runs_df = detect_price_runs(result["prices"])
-        result["runs"] = runs_df
+        result["runs"] = _stage("runs", _runs_stage, {}, ("prices",), memoize=False)
     except Exception as exc:  # pragma: no cover - runtime path
         result["error"] = f"Failed to detect runs for {ticker}: {exc}"
-        return result
+    yield "runs", result
+    if result["error"]:
+        return
 
-    if fetch_events:
-        try:
-            events = fetch_news_for_ticker(ticker, start, end, max_items=max_news_items)
-            result["events"] = events
-        except Exception as exc:  # pragma: no cover - runtime path
-            result["error"] = f"Failed to fetch events for {ticker}: {exc}"
-            return result
-    else:
-        events = []
+    try:
+        result["events"] = _stage(
+            "events",
+            _events_stage,
+            {
+                "ticker": ticker,
+                "start": start,
+                "end": end,
+                "fetch_events": fetch_events,
+                "max_news_items": max_news_items,
+                "dedupe_events": dedupe_events,
+            },
+        )
+    except Exception as exc:  # pragma: no cover - runtime path
+        result["error"] = f"Failed to fetch events for {ticker}: {exc}"
+    yield "events", result
+    if result["error"]:
+        return
 
-    correlations = correlate_runs_with_events(result["runs"], events, window_days=window_days)
-    result["correlations"] = correlations
+    try:
+        result["correlations"] = _stage(
+            "correlations",
+            _correlations_stage,
+            {"ticker": ticker, "window_days": window_days, "max_events_per_run": max_events_per_run},
+            ("runs", "events"),
+            content_key=True,
+        )
+    except Exception as exc:  # pragma: no cover - runtime path
+        result["error"] = f"Failed to correlate events for {ticker}: {exc}"
+    yield "correlations", result
+    if result["error"]:
+        return
 
-    if generate_explanations and not result["runs"].empty:
+    has_runs = not result["runs"].empty
+    if generate_explanations and has_runs:
         try:
-            explanations = _generate_explanations_for_runs(
-                ticker=ticker,
-                runs_df=result["runs"],
-                correlations=result["correlations"],
-                max_explained_runs=max_explained_runs,
+            explanations, stats = _stage(
+                "explanations",
+                _generate_explanations_for_runs,
+                {"ticker": ticker, "max_explained_runs": max_explained_runs, "batch_size": explanation_batch_size},
+                ("runs", "correlations"),
             )
             result["explanations"] = explanations
+            result["explanation_stats"] = stats.as_dict()
         except LLMQuotaExceededError as exc:  # pragma: no cover - runtime path
             result["explanation_error"] = str(exc)
         except Exception as exc:  # pragma: no cover - runtime path
             result["explanation_error"] = f"Explanation generation failed: {exc}"
+        yield "explanations", result
 
-    return result
+    if render_chart and has_runs:
+        try:
+            result["chart_png"] = _stage(
+                "chart", _chart_stage, {"fetch_events": fetch_events}, ("prices", "runs", "correlations")
+            )
+        except Exception as exc:  # pragma: no cover - runtime path
+            print(f"[SPA] Warning: chart rendering failed for {ticker}: {exc}")
+        yield "chart", result
 
 
-def _generate_explanations_for_runs(
+def _prices_stage(ticker: str, start: str, end: str) -> pd.DataFrame:
+    return fetch_daily_prices(ticker, start, end)
+
+
+def _runs_stage(prices: pd.DataFrame) -> pd.DataFrame:
+    return detect_price_runs(prices)
+
+
+def _events_stage(
     ticker: str,
-    runs_df: pd.DataFrame,
-    correlations: Dict[int, List[Dict]],
-    max_explained_runs: int,
+    start: str,
+    end: str,
+    fetch_events: bool,
+    max_news_items: int,
+    dedupe_events: bool,
 ) -> List[Dict]:
-    """Select runs and generate LLM explanations with correlated events."""
+    if not fetch_events:
+        return []
+    if not dedupe_events:
+        return fetch_events_for_ticker(ticker, start, end, max_items=max_news_items)
+    # Cap after collapsing, so copies of one story do not use up a tag's max_news_items.
+    events = collapse_near_duplicate_events(fetch_events_for_ticker(ticker, start, end, max_items=sys.maxsize))
+    return _first_per_tag(events, max_news_items)
+
+
+def _first_per_tag(events: List[Dict], max_items: int) -> List[Dict]:
+    """Keep the first max_items events of each tag (the event's ticker field), preserving order."""
+    kept: List[Dict] = []
+    counts: Dict[str, int] = {}
+    for event in events:
+        tag = str(event.get("ticker") or "")
+        if counts.get(tag, 0) < max_items:
+            counts[tag] = counts.get(tag, 0) + 1
+            kept.append(event)
+    return kept
+
+
+def _correlations_stage(
+    runs: pd.DataFrame,
+    events: List[Dict],
+    ticker: str,
+    window_days: int,
+    max_events_per_run: int,
+) -> Dict[int, List[Dict]]:
+    if max_events_per_run <= 0:
+        return correlate_runs_with_events(runs, events, window_days=window_days)
+    return correlate_runs_by_relevance(runs, events, ticker, window_days=window_days, top_k=max_events_per_run)
+
+
+def _chart_stage(
+    prices: pd.DataFrame,
+    runs: pd.DataFrame,
+    correlations: Dict[int, List[Dict]],
+    fetch_events: bool,
+) -> bytes:
+    """Render the price/runs/events chart and return the PNG bytes."""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "chart.png"
+        plot_price_with_runs_and_events(
+            df=prices,
+            runs_df=runs,
+            events_by_run=correlations if fetch_events else {},
+            output_path=str(path),
+        )
+        return path.read_bytes()
+
+
+def select_runs_to_explain(runs_df: pd.DataFrame, max_explained_runs: int) -> List[pd.Series]:
+    """The runs worth explaining: largest absolute moves first, capped by SPA_MAX_EXPLAINED_RUNS."""
     runs = runs_df.copy()
     runs["abs_pct_change"] = runs["pct_change"].abs()
     effective_max = min(max_explained_runs, SPA_MAX_EXPLAINED_RUNS_DEFAULT)
     selected = runs.sort_values("abs_pct_change", ascending=False).head(effective_max)
+    return [run_row for _, run_row in selected.iterrows()]
 
-    explanations: List[Dict] = []
-    for _, run_row in selected.iterrows():
-        run_id = int(run_row.get("run_id"))
-        events = correlations.get(run_id, [])
-        try:
-            text = explain_run_with_events(ticker, run_row, events)
-        except Exception as exc:  # pragma: no cover - runtime path
-            print(f"[SPA] Warning: explanation skipped for {ticker} run_id={run_id}: {exc}")
-            text = ""
-        explanations.append(
-            {
-                "run_id": run_id,
-                "start": _ts_to_iso(run_row.get("start")),
-                "end": _ts_to_iso(run_row.get("end")),
-                "direction": run_row.get("direction"),
-                "duration_bars": run_row.get("duration_bars"),
-                "pct_change": run_row.get("pct_change"),
-                "max_drawdown_pct": run_row.get("max_drawdown_pct"),
-                "explanation": text,
-            }
-        )
-    return explanations
+
+def explanation_entry(run_row: pd.Series, text: str, usage: TokenUsage) -> Dict:
+    """The result["explanations"] record for one run."""
+    return {
+        "run_id": int(run_row.get("run_id")),
+        "start": _ts_to_iso(run_row.get("start")),
+        "end": _ts_to_iso(run_row.get("end")),
+        "direction": run_row.get("direction"),
+        "duration_bars": run_row.get("duration_bars"),
+        "pct_change": run_row.get("pct_change"),
+        "max_drawdown_pct": run_row.get("max_drawdown_pct"),
+        "explanation": text,
+        "token_usage": usage.as_dict(),
+    }
+
+
+def _generate_explanations_for_runs(
+    runs: pd.DataFrame,
+    correlations: Dict[int, List[Dict]],
+    ticker: str,
+    max_explained_runs: int,
+    batch_size: int = SPA_EXPLANATION_BATCH_SIZE_DEFAULT,
+) -> Tuple[List[Dict], BatchExplanationStats]:
+    """Select runs and generate LLM explanations with correlated events, batch_size runs per request."""
+    selected_rows = select_runs_to_explain(runs, max_explained_runs)
+    stats = BatchExplanationStats()
+
+    if batch_size > 1:
+        groups = [selected_rows[i : i + batch_size] for i in range(0, len(selected_rows), batch_size)]
+
+        def _batch_task(group: List[pd.Series]):
+            return lambda: explain_runs_batched(ticker, group, correlations)
+
+        by_run: Dict[int, Tuple[str, TokenUsage]] = {}
+        for group_texts, group_usage, group_stats in run_in_order([_batch_task(group) for group in groups]):
+            by_run.update({run_id: (text, group_usage[run_id]) for run_id, text in group_texts.items()})
+            stats.add(group_stats)
+        results = [by_run.get(int(run_row.get("run_id")), ("", TokenUsage())) for run_row in selected_rows]
+    else:
+
+        def _explain_task(run_row: pd.Series):
+            def _task() -> Tuple[str, TokenUsage]:
+                run_id = int(run_row.get("run_id"))
+                try:
+                    return explain_run_with_usage(ticker, run_row, correlations.get(run_id, []))
+                except LLMQuotaExceededError:
+                    raise
+                except Exception as exc:  # pragma: no cover - runtime path
+                    print(f"[SPA] Warning: explanation skipped for {ticker} run_id={run_id}: {exc}")
+                    return "", TokenUsage()
+
+            return _task
+
+        # Requests run concurrently (bounded, rate-limited) but results keep the selection order.
+        results = run_in_order([_explain_task(run_row) for run_row in selected_rows])
+        stats.runs = stats.requests = len(selected_rows)
+        for _, usage in results:
+            stats.add_usage(usage)
+
+    explanations = [explanation_entry(run_row, text, usage) for run_row, (text, usage) in zip(selected_rows, results)]
+    return explanations, stats
 
 
 def _ts_to_iso(value) -> str | None: